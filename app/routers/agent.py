@@ -1,37 +1,44 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Response
 from app.models.schemas import AgentPersona
-from app.services.agent import build_agent_persona
-from app.services.parsers import parse_jd, parse_resume
-import shutil
-import os
+from app.services.onboarding import build_persona_from_uploads, ONBOARDING_MODES
+from app.services.interview_engine import prefetch_opening_question
+from app.services.scheduler import SchedulerOverloaded
+from app.services.upload_store import receive_upload, discard, MAX_PDF_BYTES, IN_MEMORY_PDF_BYTES
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-UPLOAD_DIR = "data/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+router = APIRouter()
 
 @router.post("/build", response_model=AgentPersona)
-async def build_agent(jd: UploadFile = File(...), resume: UploadFile = File(...)):
+async def build_agent(response: Response, jd: UploadFile = File(...), resume: UploadFile = File(...), mode: str = None):
+    """Parses both documents and builds the persona; ?mode=single_call overrides ONBOARDING_MODE.
+
+    Stage timings are returned in the Server-Timing header.
+    """
+    if mode is not None and mode not in ONBOARDING_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(ONBOARDING_MODES)}")
+
+    jd_upload = await receive_upload(jd, "jd", MAX_PDF_BYTES, IN_MEMORY_PDF_BYTES)
     try:
-        # Save JD
-        jd_path = os.path.join(UPLOAD_DIR, f"jd_{jd.filename}")
-        with open(jd_path, "wb") as buffer:
-            shutil.copyfileobj(jd.file, buffer)
-            
-        # Save Resume
-        resume_path = os.path.join(UPLOAD_DIR, f"resume_{resume.filename}")
-        with open(resume_path, "wb") as buffer:
-            shutil.copyfileobj(resume.file, buffer)
-            
-        # Parse documents
-        jd_obj = parse_jd(jd_path)
-        resume_obj = parse_resume(resume_path)
-        
-        # Build Persona
-        persona = build_agent_persona(jd_obj, resume_obj)
+        resume_upload = await receive_upload(resume, "resume", MAX_PDF_BYTES, IN_MEMORY_PDF_BYTES)
+    except BaseException:
+        await discard(jd_upload)
+        raise
+
+    try:
+        # Parse documents and build persona
+        persona, timings, used_mode = await build_persona_from_uploads(jd_upload, resume_upload, mode)
+        prefetch_opening_question(persona)
+        response.headers["Server-Timing"] = timings.header()
+        response.headers["X-Onboarding-Mode"] = used_mode
         return persona
         
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to build persona")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await discard(jd_upload)
+        await discard(resume_upload)
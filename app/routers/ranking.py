@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException
+from app.services.skill_index import rank_candidates
+from app.services.executor import run_cpu
+from pydantic import BaseModel
+from typing import List
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_RANK_CANDIDATES = 50000
+
+class RankCandidate(BaseModel):
+    candidate_id: str
+    skills: List[str]
+
+class RankRequest(BaseModel):
+    required_skills: List[str]
+    candidates: List[RankCandidate]
+    top_k: int = 50
+
+@router.post("/rank")
+async def rank(request: RankRequest):
+    """Ranks parsed resumes against a JD's required skills locally, without any Gemini calls."""
+    if len(request.candidates) > MAX_RANK_CANDIDATES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_RANK_CANDIDATES} candidates per request")
+    try:
+        results = await run_cpu(
+            rank_candidates,
+            request.required_skills,
+            [candidate.skills for candidate in request.candidates],
+            max(0, request.top_k),
+        )
+        return {
+            "total": len(request.candidates),
+            "results": [
+                {"candidate_id": request.candidates[r.pop("index")].candidate_id, **r}
+                for r in results
+            ],
+        }
+    except Exception as e:
+        logger.exception("Failed to rank candidates")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,13 +1,25 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect, Request, Response
+from fastapi.responses import FileResponse
+from fastapi.encoders import jsonable_encoder
 from app.models.schemas import AgentPersona
-from app.services.interview_engine import start_session, process_answer, get_session
+from app.services.interview_engine import start_session, process_answer, process_transcript, get_session, end_session
+from app.services.streaming_transcriber import StreamingTranscriber
+from app.services.report_jobs import report_jobs, REPORT_FORMATS
+from app.services.upload_store import receive_upload, discard, MAX_AUDIO_BYTES, IN_MEMORY_AUDIO_BYTES
+from app.services.tracing import new_trace_id, trace_id_var
+from app.services.scheduler import SchedulerOverloaded
+from app.services.session_store import SessionStoreFull
+from app.services.proctoring import get_timeline, start_timeline, ingest
 from pydantic import BaseModel
-import shutil
-import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-UPLOAD_DIR = "data/uploads"
+# A batch is a few seconds of runs, normally well under 1 KB.
+MAX_PRESENCE_BODY_BYTES = 16 * 1024
 
 class StartSessionRequest(BaseModel):
     agent_persona: AgentPersona
@@ -16,14 +28,16 @@ class StartSessionRequest(BaseModel):
 @router.post("/start")
 async def start_interview_session(request: StartSessionRequest):
     try:
-        session_id = start_session(request.agent_persona, request.duration_minutes)
-        session = get_session(session_id)
+        session_id = await start_session(request.agent_persona, request.duration_minutes)
+        session = await get_session(session_id)
         return {
             "session_id": session_id,
             "first_question": session.current_question
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except SessionStoreFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "60"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -32,39 +46,137 @@ class EndSessionRequest(BaseModel):
 
 @router.post("/{session_id}/end")
 async def end_interview_session(session_id: str, request: EndSessionRequest):
-    session = get_session(session_id)
+    session = await end_session(session_id, request.face_missing_seconds)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session.face_missing_seconds = request.face_missing_seconds
+    # Start rendering now so the report is usually ready when /final is requested
+    await report_jobs.start(session_id)
     return {"status": "ok"}
+
+@router.post("/{session_id}/presence", status_code=204)
+async def ingest_presence(session_id: str, request: Request):
+    """Appends a run-length-encoded face-presence batch: {"c": page_id, "o": offset_ms, "p": 0|1, "r": [run_ms, ...]}.
+
+    Parsed without a pydantic model to keep per-request cost low; thousands of open
+    interviews post one of these every few seconds.
+    """
+    body = await request.body()
+    if len(body) > MAX_PRESENCE_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"Presence batch exceeds {MAX_PRESENCE_BODY_BYTES} bytes")
+    timeline = get_timeline(session_id)
+    if timeline is None:
+        # Started by another worker or before a restart; the timeline begins here.
+        session = await get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        timeline = start_timeline(session_id, session.start_time, session.duration_seconds)
+    try:
+        ingest(timeline, json.loads(body))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(status_code=204)
+
+@router.get("/{session_id}/presence")
+async def get_presence(session_id: str):
+    timeline = get_timeline(session_id)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="No presence timeline for this session")
+    return timeline.summary()
+
 @router.post("/{session_id}/audio")
 async def submit_audio_answer(session_id: str, file: UploadFile = File(...)):
-    file_path = os.path.join(UPLOAD_DIR, f"audio_{session_id}_{file.filename}")
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    upload = await receive_upload(file, "audio", MAX_AUDIO_BYTES, IN_MEMORY_AUDIO_BYTES)
     
     try:
-        result = process_answer(session_id, file_path)
+        result = await process_answer(session_id, upload.source)
         return result
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to process answer for session %s", session_id)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await discard(upload)
 
-from app.services.pdf_generator import generate_final_report
-from fastapi.responses import FileResponse
+@router.websocket("/{session_id}/stream")
+async def stream_audio_answer(websocket: WebSocket, session_id: str):
+    """Receives 16 kHz mono int16 PCM frames while the candidate speaks.
+
+    Binary messages carry audio; a text message {"type": "end"} closes the current
+    answer. The server sends {"type": "partial", "text": ...} as segments are
+    transcribed, {"type": "question", "text": ...} as the next question's text is
+    generated, and {"type": "result", ...} with the process_answer payload.
+    """
+    # HTTP middleware does not see WebSockets, so the socket gets its own trace id.
+    trace_id_var.set(websocket.headers.get("x-trace-id") or new_trace_id())
+    await websocket.accept()
+    if not await get_session(session_id):
+        await websocket.close(code=4404, reason="Session not found")
+        return
+
+    async def send_partial(text: str):
+        await websocket.send_json({"type": "partial", "text": text})
+
+    async def send_question_text(text: str):
+        await websocket.send_json({"type": "question", "text": text})
+
+    transcriber = StreamingTranscriber(on_text=send_partial)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                transcriber.feed(message["bytes"])
+            elif message.get("text") and json.loads(message["text"]).get("type") == "end":
+                transcript = await transcriber.finish()
+                result = await process_transcript(session_id, transcript, on_question_text=send_question_text)
+                await websocket.send_json({"type": "result", **jsonable_encoder(result)})
+                transcriber = StreamingTranscriber(on_text=send_partial)
+    except WebSocketDisconnect:
+        return
+    except Exception as e:
+        logger.exception("Answer stream failed for session %s", session_id)
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1011)
+    finally:
+        await transcriber.close()
 
 @router.get("/{session_id}/final")
-async def get_final_report(session_id: str):
-    session = get_session(session_id)
-    if not session:
+async def get_final_report(session_id: str, request: Request, format: str = "pdf"):
+    """Final report as a PDF download, or with ?format=html as a page that skips PDF rendering."""
+    if format not in REPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(REPORT_FORMATS)}")
+    version = await report_jobs.current_version(session_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    etag = f'"{session_id}-{version}-{format}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
     try:
-        pdf_path = generate_final_report(session)
-        return FileResponse(pdf_path, media_type="application/pdf", filename=f"report_{session_id}.pdf")
+        path, version = await report_jobs.get(session_id, format)
+        headers = {"ETag": f'"{session_id}-{version}-{format}"', "Cache-Control": "private, no-cache"}
+        if format == "html":
+            return FileResponse(path, media_type="text/html; charset=utf-8", headers=headers)
+        return FileResponse(
+            path,
+            media_type="application/pdf",
+            filename=f"report_{session_id}.pdf",
+            headers=headers,
+        )
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{session_id}/report/status")
+async def get_report_status(session_id: str):
+    status = await report_jobs.status(session_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return status
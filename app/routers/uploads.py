@@ -1,38 +1,42 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.services.parsers import parse_jd, parse_resume
+from app.services.upload_store import receive_upload, discard, MAX_PDF_BYTES, IN_MEMORY_PDF_BYTES
+from app.services.scheduler import scheduler, Priority, SchedulerOverloaded
 from app.models.schemas import JobDescription, Resume
-import shutil
-import os
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-UPLOAD_DIR = "data/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+router = APIRouter()
 
 @router.post("/jd", response_model=JobDescription)
 async def upload_jd(file: UploadFile = File(...)):
-    file_path = os.path.join(UPLOAD_DIR, f"jd_{file.filename}")
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    upload = await receive_upload(file, "jd", MAX_PDF_BYTES, IN_MEMORY_PDF_BYTES)
     
     try:
-        jd = parse_jd(file_path)
+        async with scheduler.slot(Priority.ONBOARDING):
+            jd = await parse_jd(upload.source, upload.digest)
         return jd
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to parse JD upload")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await discard(upload)
 
 @router.post("/resume", response_model=Resume)
 async def upload_resume(file: UploadFile = File(...)):
-    file_path = os.path.join(UPLOAD_DIR, f"resume_{file.filename}")
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    upload = await receive_upload(file, "resume", MAX_PDF_BYTES, IN_MEMORY_PDF_BYTES)
     
     try:
-        resume = parse_resume(file_path)
+        async with scheduler.slot(Priority.ONBOARDING):
+            resume = await parse_resume(upload.source, upload.digest)
         return resume
+    except SchedulerOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to parse resume upload")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await discard(upload)
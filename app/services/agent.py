@@ -1,13 +1,43 @@
 from app.models.schemas import JobDescription, Resume, AgentPersona
-from app.services.llm_client import generate_json
+from app.services.llm_client import agenerate_json
+from app.services.cache import LRUCache
+from app.services.skill_index import match_skills
+import hashlib
+import os
 import uuid
 
-def build_agent_persona(jd: JobDescription, resume: Resume) -> AgentPersona:
+PERSONA_CACHE_SIZE = int(os.getenv("PERSONA_CACHE_SIZE", "256"))
+PERSONA_CACHE_TTL_SECONDS = float(os.getenv("PERSONA_CACHE_TTL_SECONDS", str(24 * 3600)))
+
+CANDIDATE_PLACEHOLDER = "{candidate_name}"
+# Required skills missing from the resume that are added as interview topics.
+PERSONA_GAP_TOPICS = 3
+
+# JD-level persona bases, shared by every candidate interviewing for the same JD.
+_persona_bases = LRUCache(PERSONA_CACHE_SIZE, ttl=PERSONA_CACHE_TTL_SECONDS)
+persona_stats = {"base_hits": 0, "base_misses": 0}
+
+def jd_fingerprint(jd: JobDescription) -> str:
+    return hashlib.sha256(jd.model_dump_json().encode("utf-8")).hexdigest()
+
+async def build_agent_persona(jd: JobDescription, resume: Resume) -> AgentPersona:
     """Builds an interviewer persona based on JD and Resume."""
-    
+    base = await build_persona_base(jd)
+    return specialize_persona(base, resume, jd)
+
+async def build_persona_base(jd: JobDescription) -> dict:
+    """Builds the JD-level part of the persona (tone, focus areas, topics), memoized by JD hash."""
+    key = jd_fingerprint(jd)
+    base = _persona_bases.get(key)
+    if base is not None:
+        persona_stats["base_hits"] += 1
+        return base
+    persona_stats["base_misses"] += 1
+
     prompt = f"""
     You are an expert technical recruiter and hiring manager.
-    Create an interviewer persona for the following role and candidate.
+    Create an interviewer persona for the following role. The same persona will be
+    used for every candidate, so do not assume anything about a specific candidate.
 
     Job Description:
     Role: {jd.role_title}
@@ -16,15 +46,9 @@ def build_agent_persona(jd: JobDescription, resume: Resume) -> AgentPersona:
     Responsibilities: {', '.join(jd.responsibilities)}
     Summary: {jd.summary_markdown}
 
-    Candidate Resume:
-    Name: {resume.candidate_name}
-    Skills: {', '.join(resume.skills)}
-    Experience: {resume.experience_summary}
-    Summary: {resume.summary_markdown}
-
     Generate a JSON object with:
     - system_prompt: A detailed system prompt for the AI interviewer. It should define the tone, style (e.g., friendly but rigorous), and specific focus areas.
-    - initial_greeting: The first thing the interviewer says to start the session.
+    - initial_greeting: The first thing the interviewer says to start the session. Use the literal placeholder {CANDIDATE_PLACEHOLDER} where the candidate's name goes.
     - topics_to_evaluate: A list of 5-7 specific technical and behavioral topics to cover.
 
     Output JSON matching this schema:
@@ -34,12 +58,63 @@ def build_agent_persona(jd: JobDescription, resume: Resume) -> AgentPersona:
         "topics_to_evaluate": ["..."]
     }}
     """
-    
-    data = generate_json(prompt)
-    
+
+    data = await agenerate_json(prompt, caller="persona")
+    if isinstance(data, list):
+        data = data[0] if data else {}
+
+    base = persona_base_from_data(data)
+    if isinstance(data, dict) and data.get("system_prompt"):
+        # A failed or empty reply gets the generic fallback for this request only.
+        _persona_bases.set(key, base)
+    return base
+
+def persona_base_from_data(data: dict) -> dict:
+    return {
+        "system_prompt": data.get("system_prompt", "You are a helpful interviewer."),
+        "initial_greeting": data.get("initial_greeting", f"Hello {CANDIDATE_PLACEHOLDER}, let's start the interview."),
+        "topics_to_evaluate": data.get("topics_to_evaluate", []),
+    }
+
+def remember_persona_base(jd: JobDescription, base: dict):
+    """Stores a persona base produced elsewhere (e.g. the single-call onboarding mode)."""
+    _persona_bases.set(jd_fingerprint(jd), base)
+
+def specialize_persona(base: dict, resume: Resume, jd: JobDescription = None) -> AgentPersona:
+    """Tailors a JD-level persona base to one candidate without another Gemini call.
+
+    With the JD, the local skill match adds matched/missing skills to the prompt and
+    puts required skills missing from the resume first among the topics.
+    """
+    name = resume.candidate_name if resume.candidate_name and resume.candidate_name != "Unknown Candidate" else "there"
+    topics = list(base["topics_to_evaluate"])
+    skill_lines = ""
+    if jd is not None and jd.required_skills:
+        match = match_skills(jd.required_skills, resume.skills)
+        skill_lines = f"""
+    Required skills on the resume: {', '.join(match['matched']) or 'none'}
+    Required skills not on the resume: {', '.join(match['missing']) or 'none'}"""
+        known = {topic.lower() for topic in topics}
+        gaps = [skill for skill in match["missing"] if skill not in known][:PERSONA_GAP_TOPICS]
+        topics = [f"{skill} (required, not on resume)" for skill in gaps] + topics
+
+    system_prompt = f"""{base['system_prompt']}
+
+    Candidate Background:
+    Name: {resume.candidate_name}
+    Skills: {', '.join(resume.skills)}
+    Experience: {resume.experience_summary}
+    Summary: {resume.summary_markdown}{skill_lines}
+
+    Tailor your questions to this candidate's background, and probe gaps between their experience and the role's requirements.
+    """
+
     return AgentPersona(
         agent_id=str(uuid.uuid4()),
-        system_prompt=data.get("system_prompt", "You are a helpful interviewer."),
-        initial_greeting=data.get("initial_greeting", "Hello, let's start the interview."),
-        topics_to_evaluate=data.get("topics_to_evaluate", [])
+        system_prompt=system_prompt,
+        initial_greeting=base["initial_greeting"].replace(CANDIDATE_PLACEHOLDER, name),
+        topics_to_evaluate=topics,
     )
+
+def persona_cache_stats() -> dict:
+    return {**persona_stats, "cached_bases": len(_persona_bases)}
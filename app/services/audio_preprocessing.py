@@ -0,0 +1,82 @@
+from typing import Optional, Union
+import os
+import subprocess
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+AUDIO_SILENCE_RMS = float(os.getenv("AUDIO_SILENCE_RMS", "0.01"))
+# Clips with less voiced audio than this are not sent to Whisper at all.
+AUDIO_MIN_SPEECH_MS = int(os.getenv("AUDIO_MIN_SPEECH_MS", "300"))
+# Silence kept around speech, and the longest pause kept inside it.
+AUDIO_PAD_MS = int(os.getenv("AUDIO_PAD_MS", "200"))
+AUDIO_MAX_PAUSE_MS = int(os.getenv("AUDIO_MAX_PAUSE_MS", "1000"))
+AUDIO_MAX_SECONDS = float(os.getenv("AUDIO_MAX_SECONDS", "180"))
+
+stats = {"clips": 0, "skipped_silent": 0, "capped": 0, "input_seconds": 0.0, "output_seconds": 0.0}
+
+def decode_audio(source: Union[str, bytes]) -> np.ndarray:
+    """Decodes a file path or encoded bytes (webm/ogg/wav/...) to 16 kHz mono float32 in one ffmpeg pass.
+
+    Bytes are piped through stdin, so nothing is written to disk.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", "pipe:0" if isinstance(source, bytes) else source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-",
+    ]
+    try:
+        out = subprocess.run(cmd, input=source if isinstance(source, bytes) else None,
+                             capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='replace')[-500:]}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def preprocess(audio: np.ndarray, min_speech_ms: int = AUDIO_MIN_SPEECH_MS) -> Optional[np.ndarray]:
+    """Trims leading/trailing silence, shortens long pauses and caps the length.
+
+    Returns None when the clip holds less than ``min_speech_ms`` of speech. Streamed
+    segments pass 0: the stream's VAD already found speech in them, and a short
+    segment can be the last word of an answer.
+    """
+    stats["clips"] += 1
+    stats["input_seconds"] += audio.size / SAMPLE_RATE
+    max_samples = int(AUDIO_MAX_SECONDS * SAMPLE_RATE)
+    usable = audio.size - audio.size % FRAME_SAMPLES
+    frames = audio[:usable].reshape(-1, FRAME_SAMPLES)
+    voiced = np.sqrt(np.mean(frames ** 2, axis=1)) > AUDIO_SILENCE_RMS
+    if voiced.sum() * FRAME_MS < min_speech_ms:
+        stats["skipped_silent"] += 1
+        return None
+    if not voiced.any():
+        # Nothing to trim around; pass the segment through unchanged.
+        stats["output_seconds"] += min(audio.size, max_samples) / SAMPLE_RATE
+        return np.ascontiguousarray(audio[:max_samples])
+
+    # Keep voiced frames plus padding, and at most AUDIO_MAX_PAUSE_MS of every pause.
+    pad = AUDIO_PAD_MS // FRAME_MS
+    max_pause = AUDIO_MAX_PAUSE_MS // FRAME_MS
+    voiced_idx = np.flatnonzero(voiced)
+    first, last = max(0, voiced_idx[0] - pad), min(len(voiced), voiced_idx[-1] + pad + 1)
+    keep = np.zeros(len(voiced), dtype=bool)
+    keep[first:last] = True
+    gaps = np.diff(voiced_idx) - 1
+    for start, gap in zip(voiced_idx[:-1][gaps > max_pause], gaps[gaps > max_pause]):
+        # Drop the middle of the pause, keeping half of max_pause on each side.
+        keep[start + 1 + max_pause // 2:start + 1 + gap - (max_pause - max_pause // 2)] = False
+
+    trimmed = frames[keep].reshape(-1)
+    if trimmed.size > max_samples:
+        stats["capped"] += 1
+        trimmed = trimmed[:max_samples]
+    stats["output_seconds"] += trimmed.size / SAMPLE_RATE
+    return np.ascontiguousarray(trimmed)
+
+def preprocessing_stats() -> dict:
+    return {
+        **stats,
+        "input_seconds": round(stats["input_seconds"], 1),
+        "output_seconds": round(stats["output_seconds"], 1),
+    }
@@ -0,0 +1,262 @@
+"""Offline re-scoring of stored interview answers.
+
+Streams answered turns from the session tables, packs several Q/A pairs into one
+Gemini request that returns a JSON array of evaluations, validates them back into
+``Evaluation`` objects and appends the results to a JSONL file. Progress is
+checkpointed so an interrupted run resumes where it stopped. A pack whose Gemini
+call fails after retries is written as ``{"error": ...}`` lines for its answers and
+counted under ``failed_answers``; the run carries on.
+
+    python -m app.services.batch_evaluator --output data/batch_eval.jsonl --pack-size 10 --concurrency 8
+"""
+from sqlalchemy import select, update
+from pydantic import ValidationError
+from app.models.schemas import Question, Evaluation
+from app.services.db import engine, create_tables
+from app.services.session_store import session_turns
+from app.services.llm_client import agenerate_json
+from app.services.interview_engine import evaluate_answer
+from app.services.conversation_memory import estimate_tokens
+from app.services.executor import run_io
+from app.services.tracing import configure_logging
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+# Bump when the batch prompt changes; recorded with every result.
+BATCH_PROMPT_VERSION = "1"
+FETCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+def build_batch_prompt(items: list) -> str:
+    pairs = "\n\n".join(
+        f"[{i}]\nQuestion: {item['question'].question_text}\nAnswer: {item['answer']}"
+        for i, item in enumerate(items)
+    )
+    return f"""
+    Evaluate each of the following interview answers based on the question asked.
+
+    {pairs}
+
+    Score each answer from 1-5 on:
+    - Confidence
+    - Clarity
+    - Correctness
+
+    Output a JSON array with exactly one object per answer, in the same order, matching this schema:
+    [
+        {{
+            "id": 0,
+            "confidence_score": 1-5,
+            "clarity_score": 1-5,
+            "correctness_score": 1-5,
+            "feedback": "Short constructive feedback",
+            "follow_up_needed": true/false
+        }}
+    ]
+    """
+
+def parse_batch_response(data, count: int) -> list:
+    """Maps the model's array back onto the pack; entries that fail validation are None."""
+    if isinstance(data, dict):
+        data = data.get("evaluations") or data.get("results") or [data]
+    evaluations = [None] * count
+    for position, entry in enumerate(data if isinstance(data, list) else []):
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("id", position)
+        if not isinstance(index, int) or not 0 <= index < count:
+            continue
+        try:
+            evaluations[index] = Evaluation.model_validate(entry)
+        except ValidationError:
+            pass
+    return evaluations
+
+class Checkpoint:
+    """Tracks the highest session_turns.id below which every pack has been written."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.last_id = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                self.last_id = json.load(f).get("last_id", 0)
+        self._open = {}  # pack sequence -> last row id in the pack
+        self._done = set()
+        self._next_seq = 0
+        self._watermark_seq = 0
+
+    def register(self, last_row_id: int) -> int:
+        seq = self._next_seq
+        self._open[seq] = last_row_id
+        self._next_seq += 1
+        return seq
+
+    def complete(self, seq: int):
+        self._done.add(seq)
+        advanced = False
+        while self._watermark_seq in self._done:
+            self._done.discard(self._watermark_seq)
+            self.last_id = self._open.pop(self._watermark_seq)
+            self._watermark_seq += 1
+            advanced = True
+        if advanced:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"last_id": self.last_id, "prompt_version": BATCH_PROMPT_VERSION}, f)
+            os.replace(tmp, self.path)
+
+def iter_turn_chunks(after_id: int, limit: int = None):
+    """Yields lists of stored turns in id order without loading the whole table."""
+    query = select(session_turns).where(session_turns.c.id > after_id).order_by(session_turns.c.id)
+    if limit:
+        query = query.limit(limit)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query).mappings()
+        while rows := result.fetchmany(FETCH_SIZE):
+            yield [
+                {
+                    "id": row["id"],
+                    "session_id": row["session_id"],
+                    "turn_index": row["turn_index"],
+                    "question": Question.model_validate_json(row["question"]),
+                    "answer": row["answer"],
+                }
+                for row in rows
+            ]
+
+def write_back(items: list, evaluations: list):
+    with engine.begin() as conn:
+        for item, evaluation in zip(items, evaluations):
+            conn.execute(
+                update(session_turns)
+                .where(session_turns.c.id == item["id"])
+                .values(evaluation=evaluation.model_dump_json())
+            )
+
+class BatchEvaluator:
+    def __init__(self, output: str, checkpoint: str, pack_size: int = 10, concurrency: int = 8,
+                 persist: bool = False, limit: int = None):
+        self.output = output
+        self.checkpoint = Checkpoint(checkpoint)
+        self.pack_size = pack_size
+        self.concurrency = concurrency
+        self.persist = persist
+        self.limit = limit
+        self.answers = 0
+        self.failed = 0
+        self.requests = 0
+        self.fallbacks = 0
+        self.tokens = 0
+
+    async def run(self) -> dict:
+        create_tables([session_turns])
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        started = time.perf_counter()
+        with open(self.output, "a") as out:
+            # A worker that dies on an unexpected error cancels the producer and the other
+            # workers instead of leaving the producer blocked on the bounded queue.
+            async with asyncio.TaskGroup() as group:
+                for _ in range(self.concurrency):
+                    group.create_task(self._worker(queue, out))
+                group.create_task(self._produce(queue))
+
+        elapsed = time.perf_counter() - started
+        return {
+            "answers": self.answers,
+            "failed_answers": self.failed,
+            "requests": self.requests,
+            "fallback_requests": self.fallbacks,
+            "seconds": round(elapsed, 2),
+            "answers_per_second": round(self.answers / elapsed, 2) if elapsed else 0.0,
+            "tokens_per_answer": round(self.tokens / self.answers, 1) if self.answers else 0.0,
+            "checkpoint_id": self.checkpoint.last_id,
+        }
+
+    async def _produce(self, queue: asyncio.Queue):
+        chunks = iter_turn_chunks(self.checkpoint.last_id, self.limit)
+        while chunk := await run_io(next, chunks, None):
+            for start in range(0, len(chunk), self.pack_size):
+                pack = chunk[start:start + self.pack_size]
+                await queue.put((self.checkpoint.register(pack[-1]["id"]), pack))
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def _worker(self, queue: asyncio.Queue, out):
+        while (job := await queue.get()) is not None:
+            seq, pack = job
+            try:
+                evaluations = await self._evaluate_pack(pack)
+            except Exception as e:
+                # Recorded in the output so the pack can be re-scored later; the
+                # checkpoint still moves on so one bad pack does not stall the run.
+                logger.exception("Pack of %d answers failed", len(pack))
+                for item in pack:
+                    out.write(json.dumps({
+                        "session_id": item["session_id"],
+                        "turn_index": item["turn_index"],
+                        "prompt_version": BATCH_PROMPT_VERSION,
+                        "error": f"{type(e).__name__}: {e}",
+                    }) + "\n")
+                out.flush()
+                self.failed += len(pack)
+                self.checkpoint.complete(seq)
+                continue
+            for item, evaluation in zip(pack, evaluations):
+                out.write(json.dumps({
+                    "session_id": item["session_id"],
+                    "turn_index": item["turn_index"],
+                    "prompt_version": BATCH_PROMPT_VERSION,
+                    "evaluation": evaluation.model_dump(),
+                }) + "\n")
+            out.flush()
+            if self.persist:
+                await run_io(write_back, pack, evaluations)
+            self.answers += len(pack)
+            self.checkpoint.complete(seq)
+
+    async def _evaluate_pack(self, pack: list) -> list:
+        prompt = build_batch_prompt(pack)
+        data = await agenerate_json(prompt, caller="batch_evaluate")
+        self.requests += 1
+        self.tokens += estimate_tokens(prompt) + estimate_tokens(json.dumps(data))
+        evaluations = parse_batch_response(data, len(pack))
+
+        # Anything the packed response dropped or mangled is scored on its own.
+        missing = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        if missing:
+            self.fallbacks += len(missing)
+            singles = await asyncio.gather(*(evaluate_answer(pack[i]["question"], pack[i]["answer"]) for i in missing))
+            for i, evaluation in zip(missing, singles):
+                evaluations[i] = evaluation
+        return evaluations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="data/batch_eval.jsonl")
+    parser.add_argument("--checkpoint", default=None, help="defaults to <output>.checkpoint")
+    parser.add_argument("--pack-size", type=int, default=10, help="Q/A pairs per Gemini request")
+    parser.add_argument("--concurrency", type=int, default=8, help="packs in flight at once")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many answers")
+    parser.add_argument("--write-back", action="store_true", help="also overwrite evaluations in the session tables")
+    args = parser.parse_args()
+
+    configure_logging()
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    evaluator = BatchEvaluator(
+        output=args.output,
+        checkpoint=args.checkpoint or f"{args.output}.checkpoint",
+        pack_size=args.pack_size,
+        concurrency=args.concurrency,
+        persist=args.write_back,
+        limit=args.limit,
+    )
+    print(json.dumps(asyncio.run(evaluator.run()), indent=2))
+
+if __name__ == "__main__":
+    main()
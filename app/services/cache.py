@@ -0,0 +1,48 @@
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """Small in-process LRU cache with optional per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+            return default
+        return entry[0]
+
+    def evict_expired(self) -> int:
+        """Drops every expired entry now instead of on its next access; returns how many."""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at is not None and expires_at < now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, self) is not self
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,134 @@
+from collections import deque
+import os
+
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", "3"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1200"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", "6000"))
+# The persona is the system instruction of every next-question call.
+PERSONA_TOKEN_BUDGET = int(os.getenv("PERSONA_TOKEN_BUDGET", "1000"))
+# Shortest useful line per turn in the final summary; below this, earlier turns are omitted.
+MIN_SUMMARY_TURN_CHARS = 120
+
+# Rough English average; good enough for budgeting without a tokenizer dependency.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def clip(text: str, max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= max_chars else text[:max(0, max_chars - 3)] + "..."
+
+def clip_tokens(text: str, token_budget: int) -> str:
+    """Truncates text to roughly token_budget tokens, keeping its line breaks."""
+    max_chars = token_budget * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max(0, max_chars - 3)] + "..."
+
+def compact_turn(turn: dict, max_chars: int = 400, include_feedback: bool = False) -> str:
+    """Renders one Q/A turn as a single line, clipped to roughly max_chars."""
+    question, evaluation = turn["question"], turn["evaluation"]
+    scores = ""
+    if evaluation is not None:
+        scores = f" | scores conf/clar/corr {evaluation.confidence_score}/{evaluation.clarity_score}/{evaluation.correctness_score}"
+        if include_feedback:
+            scores += f" | feedback: {clip(evaluation.feedback, max_chars // 4)}"
+    budget = max(40, max_chars - len(scores))
+    return (
+        f"Q [{question.question_type}/{question.difficulty}]: {clip(question.question_text, budget * 2 // 5)}"
+        f" | A: {clip(turn['answer'], budget * 3 // 5)}{scores}"
+    )
+
+class ConversationMemory:
+    """Bounded prompt context for an interview.
+
+    Keeps the last ``recent_turns`` turns verbatim (answers clipped) and folds older
+    turns into a digest of one-line entries as they fall out of the window. When
+    the digest exceeds its share of ``token_budget`` the oldest entries are dropped,
+    so the rendered context stays roughly constant however long the interview runs.
+    """
+
+    def __init__(self, recent_turns: int = MEMORY_RECENT_TURNS, token_budget: int = MEMORY_TOKEN_BUDGET):
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.turn_count = 0
+        self.dropped_turns = 0
+        self._recent = deque()
+        self._digest = deque()
+        self._digest_tokens = 0
+
+    @property
+    def _digest_budget(self) -> int:
+        return self.token_budget // 2
+
+    @property
+    def _recent_chars(self) -> int:
+        return (self.token_budget - self._digest_budget) * CHARS_PER_TOKEN // max(1, self.recent_turns)
+
+    def add_turn(self, turn: dict):
+        self.turn_count += 1
+        self._recent.append(turn)
+        while len(self._recent) > self.recent_turns:
+            self._fold(self._recent.popleft())
+
+    def _fold(self, turn: dict):
+        line = compact_turn(turn, max_chars=160)
+        self._digest.append(line)
+        self._digest_tokens += estimate_tokens(line)
+        while self._digest_tokens > self._digest_budget and self._digest:
+            self._digest_tokens -= estimate_tokens(self._digest.popleft())
+            self.dropped_turns += 1
+
+    def state(self) -> dict:
+        """JSON-serializable state; recent turns are stored as a count and re-bound to the history."""
+        return {
+            "turn_count": self.turn_count,
+            "dropped_turns": self.dropped_turns,
+            "recent": len(self._recent),
+            "digest": list(self._digest),
+            "digest_tokens": self._digest_tokens,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, history: list) -> "ConversationMemory":
+        memory = cls()
+        if state["turn_count"] > len(history):
+            return memory  # history was replaced; rebuild from scratch
+        memory.turn_count = state["turn_count"]
+        memory.dropped_turns = state["dropped_turns"]
+        memory._recent.extend(history[memory.turn_count - state["recent"]:memory.turn_count])
+        memory._digest.extend(state["digest"])
+        memory._digest_tokens = state["digest_tokens"]
+        return memory
+
+    def render(self, skip_last: int = 0) -> str:
+        """Renders the digest and recent turns, leaving out the newest ``skip_last`` turns."""
+        recent = list(self._recent)[:len(self._recent) - skip_last] if skip_last else list(self._recent)
+        lines = []
+        if self.dropped_turns:
+            lines.append(f"({self.dropped_turns} earliest questions omitted)")
+        lines.extend(self._digest)
+        lines.extend(compact_turn(turn, max_chars=self._recent_chars) for turn in recent)
+        return "\n".join(lines) if lines else "(no previous questions)"
+
+def summarize_history(history: list, token_budget: int = SUMMARY_TOKEN_BUDGET) -> str:
+    """Compact one-line-per-turn transcript for the final summary, at most token_budget tokens.
+
+    Each turn gets an equal share of the budget; when a share would drop below
+    MIN_SUMMARY_TURN_CHARS, the earliest turns are left out instead.
+    """
+    if not history:
+        return "(no questions answered)"
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    keep = max(1, min(len(history), budget_chars // MIN_SUMMARY_TURN_CHARS))
+    lines = []
+    if keep < len(history):
+        lines.append(f"({len(history) - keep} earliest questions omitted)")
+        budget_chars -= len(lines[0]) + 1
+    # Each line is clipped to its share, newline included.
+    per_turn_chars = max(1, budget_chars // keep - 1)
+    start = len(history) - keep
+    lines.extend(
+        clip(f"{i}. {compact_turn(turn, max_chars=per_turn_chars, include_feedback=True)}", per_turn_chars)
+        for i, turn in enumerate(history[start:], start=start + 1)
+    )
+    return "\n".join(lines)
@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, MetaData
+import os
+import time
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/interview_pilot.db")
+
+if DATABASE_URL.startswith("sqlite:///"):
+    os.makedirs(os.path.dirname(DATABASE_URL[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+else:
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+metadata = MetaData()
+
+def create_tables(tables: list, attempts: int = 5):
+    """Creates missing tables; safe when several workers start at the same time."""
+    from sqlalchemy.exc import OperationalError, ProgrammingError
+    for attempt in range(attempts):
+        try:
+            metadata.create_all(engine, tables=tables)
+            return
+        except (OperationalError, ProgrammingError):
+            # Another worker created a table or index between the existence check and
+            # the CREATE; the next pass skips whatever exists now.
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
@@ -0,0 +1,95 @@
+from sqlalchemy import Table, Column, String, Text, select, insert, delete
+from app.services.cache import LRUCache
+from app.services.db import engine, metadata, create_tables
+from app.services.executor import run_io
+import hashlib
+import os
+
+DOC_CACHE_MEMORY_SIZE = int(os.getenv("DOC_CACHE_MEMORY_SIZE", "512"))
+
+parsed_documents = Table(
+    "parsed_documents",
+    metadata,
+    Column("cache_key", String(128), primary_key=True),
+    Column("kind", String(16), nullable=False),
+    Column("payload", Text, nullable=False),
+)
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class DocumentCache:
+    """Two-tier cache of parsed documents keyed by file hash and prompt version.
+
+    The in-memory LRU absorbs repeat uploads within a worker; the SQLite tier
+    survives restarts and is shared by every worker on the host. Entries are the
+    full pydantic model, so the raw text comes back along with the extraction.
+    """
+
+    def __init__(self, maxsize: int = DOC_CACHE_MEMORY_SIZE):
+        self._memory = LRUCache(maxsize)
+        self._table_ready = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind: str, digest: str, prompt_version: str) -> str:
+        return f"{kind}:{prompt_version}:{digest}"
+
+    async def get(self, key: str, model_cls):
+        value = self._memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+        payload = await run_io(self._load, key)
+        if payload is None:
+            self.misses += 1
+            return None
+        value = model_cls.model_validate_json(payload)
+        self._memory.set(key, value)
+        self.disk_hits += 1
+        return value
+
+    async def put(self, key: str, kind: str, value):
+        self._memory.set(key, value)
+        await run_io(self._store, key, kind, value.model_dump_json())
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "llm_calls_saved": hits,
+            "memory_entries": len(self._memory),
+        }
+
+    def _ensure_table(self):
+        if not self._table_ready:
+            create_tables([parsed_documents])
+            self._table_ready = True
+
+    def _load(self, key: str):
+        self._ensure_table()
+        with engine.connect() as conn:
+            return conn.execute(
+                select(parsed_documents.c.payload).where(parsed_documents.c.cache_key == key)
+            ).scalar()
+
+    def _store(self, key: str, kind: str, payload: str):
+        self._ensure_table()
+        with engine.begin() as conn:
+            conn.execute(delete(parsed_documents).where(parsed_documents.c.cache_key == key))
+            conn.execute(insert(parsed_documents).values(cache_key=key, kind=kind, payload=payload))
+
+document_cache = DocumentCache()
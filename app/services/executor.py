@@ -0,0 +1,58 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from app.services.scheduler import PrioritySemaphore
+
+# CPU-bound work (Whisper, WeasyPrint, PyMuPDF) goes to a small pool sized to the
+# machine; blocking network calls (Gemini SDK) go to a wider I/O pool so they never
+# queue behind a transcription.
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2)))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "32"))
+# Processes for pure-Python CPU work that holds the GIL; created on first use.
+PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Never fork: by the time the pool starts this process has running thread pools and
+# possibly torch/Whisper loaded, and forked children can deadlock on inherited locks.
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_cpu_pool = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu-worker")
+_io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io-worker")
+# The pool's own queue is FIFO; holding back submissions here lets live turns go first.
+_cpu_gate = PrioritySemaphore(CPU_WORKERS)
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+async def run_cpu(func, *args, **kwargs):
+    """Runs a CPU-bound callable on the bounded CPU pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    async with _cpu_gate:
+        return await loop.run_in_executor(_cpu_pool, functools.partial(func, *args, **kwargs))
+
+async def run_io(func, *args, **kwargs):
+    """Runs a blocking I/O callable on the I/O pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_pool, functools.partial(func, *args, **kwargs))
+
+async def run_process(func, *args, **kwargs):
+    """Runs a picklable CPU-bound callable on the process pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), functools.partial(func, *args, **kwargs))
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Returns the shared process pool, starting it on first use."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PROCESS_WORKERS, mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+            )
+    return _process_pool
+
+def shutdown():
+    """Stops accepting work and waits for running jobs to finish."""
+    _cpu_pool.shutdown(wait=True)
+    _io_pool.shutdown(wait=True)
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True)
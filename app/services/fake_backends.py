@@ -0,0 +1,182 @@
+"""Deterministic stand-ins for Gemini and Whisper, for benchmarks and offline runs.
+
+Enabled with LLM_BACKEND=fake and ASR_BACKEND=fake. Responses are chosen from the
+schema each prompt asks for and seeded by the prompt (or clip length), so repeated
+runs produce the same interviews. Latency is simulated: the fake LLM takes
+FAKE_LLM_LATENCY_MS to the first token and then emits FAKE_LLM_TOKENS_PER_SECOND;
+the fake ASR spends FAKE_ASR_RTF seconds of CPU-pool time per second of audio.
+"""
+from app.services.transcription_worker import TranscriptionWorker, SAMPLE_RATE
+from types import SimpleNamespace
+import asyncio
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import time
+import wave
+import numpy as np
+
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "200"))
+FAKE_ASR_RTF = float(os.getenv("FAKE_ASR_RTF", "0.1"))
+FAKE_SEED = os.getenv("FAKE_SEED", "0")
+
+CHARS_PER_TOKEN = 4
+STREAM_CHUNK_TOKENS = 4
+
+QUESTIONS = [
+    "Can you walk me through a system you designed recently and the trade-offs you made?",
+    "Tell me about a time you disagreed with a teammate. How did you resolve it?",
+    "How would you find the cause of a sudden latency spike in a production service?",
+    "What is your approach to testing code that talks to external services?",
+    "Describe a project you are proud of. What was your specific contribution?",
+    "How do you decide when a piece of code is worth refactoring?",
+]
+
+TRANSCRIPTS = [
+    "I led the redesign of our ingestion pipeline. We moved from nightly batches to a streaming setup with Kafka, which cut data freshness from a day to a few minutes.",
+    "We disagreed about whether to rewrite a legacy service. I suggested a small spike to measure the risk, and the data made the decision for us.",
+    "I would start with the dashboards to see which endpoints regressed, then compare traces before and after the last deploy and check the database for slow queries.",
+    "I keep a thin adapter around the external service, test my logic against a fake, and run a smaller set of contract tests against the real thing.",
+    "I'm proud of the billing migration. I wrote the reconciliation job that let us run both systems side by side for a month without losing a single invoice.",
+]
+
+JD = {
+    "role_title": "Backend Engineer",
+    "company_name": "Example Corp",
+    "required_skills": ["Python", "SQL", "Kafka", "AWS"],
+    "responsibilities": ["Build data pipelines", "Operate production services"],
+    "summary_markdown": "**Backend Engineer** building data pipelines.",
+}
+RESUME = {
+    "candidate_name": "Sam Candidate",
+    "skills": ["Python", "SQL", "Docker"],
+    "experience_summary": "Five years building backend services.",
+    "summary_markdown": "Backend engineer with five years of experience.",
+}
+PERSONA = {
+    "system_prompt": "You are a friendly but rigorous interviewer for a backend engineering role.",
+    "initial_greeting": "Hello {candidate_name}, thanks for joining. Let's get started.",
+    "topics_to_evaluate": ["Python", "System Design", "Databases", "Testing", "Collaboration"],
+}
+
+def _rng(*parts) -> random.Random:
+    digest = hashlib.sha256("\x00".join([FAKE_SEED, *map(str, parts)]).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+def fake_completion(prompt: str) -> str:
+    """Returns a canned response matching the JSON schema the prompt asks for."""
+    rng = _rng(prompt)
+    if '"job_description"' in prompt:
+        data = {"job_description": JD, "resume": RESUME, "persona": PERSONA}
+    elif '"system_prompt"' in prompt:
+        data = PERSONA
+    elif '"overall_score"' in prompt:
+        data = {
+            "overall_score": rng.randint(5, 9),
+            "strengths": ["Clear communication", "Solid system design fundamentals"],
+            "areas_for_improvement": ["Quantify impact more often"],
+            "summary_feedback": "The candidate gave structured answers and backed them with concrete examples.",
+        }
+    elif '"id": 0' in prompt:
+        count = len(re.findall(r"^\s*\[\d+\]\s*$", prompt, re.MULTILINE))
+        data = [{"id": i, **_evaluation(rng)} for i in range(count)]
+    elif '"confidence_score"' in prompt:
+        data = _evaluation(rng)
+    elif '"question_text"' in prompt:
+        data = {
+            "question_text": rng.choice(QUESTIONS),
+            "question_type": rng.choice(["technical", "behavioral"]),
+            "reason": "Benchmark",
+            "difficulty": rng.choice(["low", "medium", "high"]),
+        }
+    elif '"role_title"' in prompt:
+        data = JD
+    elif '"experience_summary"' in prompt:
+        data = RESUME
+    else:
+        return "This is a fake response."
+    return json.dumps(data)
+
+def _evaluation(rng: random.Random) -> dict:
+    return {
+        "confidence_score": rng.randint(2, 5),
+        "clarity_score": rng.randint(2, 5),
+        "correctness_score": rng.randint(2, 5),
+        "feedback": "Good structure; add more detail on the outcome.",
+        "follow_up_needed": rng.random() < 0.3,
+    }
+
+def _response(text: str, prompt: str) -> SimpleNamespace:
+    usage = SimpleNamespace(
+        prompt_token_count=len(prompt) // CHARS_PER_TOKEN + 1,
+        candidates_token_count=len(text) // CHARS_PER_TOKEN + 1,
+    )
+    return SimpleNamespace(text=text, usage_metadata=usage)
+
+def _chunks(text: str) -> list:
+    size = STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+class FakeGenerativeModel:
+    """Drop-in for genai.GenerativeModel covering the calls llm_client makes."""
+
+    def generate_content(self, prompt: str, generation_config=None, stream: bool = False):
+        text = fake_completion(prompt)
+        if stream:
+            return self._stream_sync(prompt, text)
+        time.sleep(self._seconds(text))
+        return _response(text, prompt)
+
+    async def generate_content_async(self, prompt: str, generation_config=None, stream: bool = False):
+        text = fake_completion(prompt)
+        if stream:
+            return self._stream_async(prompt, text)
+        await asyncio.sleep(self._seconds(text))
+        return _response(text, prompt)
+
+    def _stream_sync(self, prompt: str, text: str):
+        time.sleep(FAKE_LLM_LATENCY_MS / 1000)
+        for chunk in _chunks(text):
+            time.sleep(STREAM_CHUNK_TOKENS / FAKE_LLM_TOKENS_PER_SECOND)
+            yield _response(chunk, prompt)
+
+    async def _stream_async(self, prompt: str, text: str):
+        await asyncio.sleep(FAKE_LLM_LATENCY_MS / 1000)
+        for chunk in _chunks(text):
+            await asyncio.sleep(STREAM_CHUNK_TOKENS / FAKE_LLM_TOKENS_PER_SECOND)
+            yield _response(chunk, prompt)
+
+    @staticmethod
+    def _seconds(text: str) -> float:
+        return FAKE_LLM_LATENCY_MS / 1000 + (len(text) / CHARS_PER_TOKEN) / FAKE_LLM_TOKENS_PER_SECOND
+
+class FakeTranscriptionWorker(TranscriptionWorker):
+    """TranscriptionWorker with the real queue and batching but no model.
+
+    A batch costs FAKE_ASR_RTF times its longest clip, spent on the CPU pool like a
+    real decode, and returns a canned transcript chosen by clip length.
+    """
+
+    def _load_model(self):
+        return "fake"
+
+    def _warm_up(self, model):
+        pass
+
+    def _run_batch(self, model, batch) -> list:
+        time.sleep(max(len(job.audio) for job in batch) / SAMPLE_RATE * FAKE_ASR_RTF)
+        return [_rng(len(job.audio)).choice(TRANSCRIPTS) for job in batch]
+
+def load_audio(source) -> np.ndarray:
+    """Silent samples of the clip's duration; WAV headers are read, other formats are estimated."""
+    try:
+        with wave.open(io.BytesIO(source) if isinstance(source, bytes) else source, "rb") as wav:
+            seconds = wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError):
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        seconds = size / 4000  # ~32 kbit/s compressed audio
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
@@ -1,18 +1,64 @@
 from app.models.schemas import AgentPersona, Question, Evaluation
-from app.services.llm_client import generate_json
+from app.services.llm_client import agenerate_json, astream_json_field
 from app.services.whisper_service import transcribe_audio
+from app.services.session_store import create_session_store, SESSION_TTL_SECONDS, SESSION_GC_INTERVAL_SECONDS
+from app.services.conversation_memory import ConversationMemory, summarize_history, clip, clip_tokens, PERSONA_TOKEN_BUDGET
+from app.services.cache import LRUCache
+from app.services.turn_record import TurnRecord
+from app.services.proctoring import start_timeline, get_timeline, mark_question
+from app.services.metrics import ACTIVE_SESSIONS
+from app.services.scheduler import scheduler, Priority, CLASS_TIMEOUTS
+import asyncio
+import hashlib
+import logging
+import os
 import uuid
 import time
 
+# When enabled, the next question is generated as soon as the transcript is ready and
+# the answer is scored in the background; the final report waits for pending scores.
+PIPELINED_EVALUATION = os.getenv("PIPELINED_EVALUATION", "1") == "1"
+
+# The opening question only depends on the persona, so it is generated in the background
+# as soon as /agent/build returns and picked up by start_session.
+PREFETCH_OPENING_QUESTION = os.getenv("PREFETCH_OPENING_QUESTION", "1") == "1"
+PREFETCH_CACHE_SIZE = int(os.getenv("PREFETCH_CACHE_SIZE", "1000"))
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", "900"))
+# Nominal length used for the prefetch prompt; the real duration is only known at start.
+PREFETCH_DURATION_MINUTES = 30
+# A turn may queue for the rest of the interview plus this much, capped by the class timeout.
+LIVE_TURN_GRACE_SECONDS = float(os.getenv("LIVE_TURN_GRACE_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
 class InterviewSession:
     def __init__(self, session_id: str, agent_persona: AgentPersona, duration_minutes: int):
         self.session_id = session_id
         self.agent_persona = agent_persona
         self.start_time = time.time()
         self.duration_seconds = duration_minutes * 60
-        self.history = [] # List of (Question, Answer, Evaluation) tuples
+        self.history = [] # List of TurnRecord
         self.current_question = None
         self.face_missing_seconds = 0
+        self._memory = None
+
+    @property
+    def memory(self) -> ConversationMemory:
+        """Rolling prompt context, fed incrementally with any turns added since the last access."""
+        if self._memory is None:
+            self._memory = ConversationMemory()
+        for turn in self.history[self._memory.turn_count:]:
+            self._memory.add_turn(turn)
+        return self._memory
+
+    def restore_memory(self, state: dict):
+        """Restores memory persisted with the session instead of refolding the whole history."""
+        self._memory = ConversationMemory.from_state(state, self.history)
+
+    @property
+    def system_instruction(self) -> str:
+        """The persona as sent with every next-question call, capped at PERSONA_TOKEN_BUDGET."""
+        return clip_tokens(self.agent_persona.system_prompt, PERSONA_TOKEN_BUDGET)
 
     def get_time_remaining(self) -> int:
         elapsed = time.time() - self.start_time
@@ -22,59 +68,222 @@ class InterviewSession:
     def is_finished(self) -> bool:
         return self.get_time_remaining() <= 0
 
-# In-memory store for sessions (replace with DB later)
-sessions = {}
+# Backend is chosen by SESSION_STORE; use "sql" when running more than one worker.
+store = create_session_store(InterviewSession)
+
+# Background evaluation tasks per session, kept referenced until they finish.
+_pending_evaluations = {}
+
+# Sessions started in this process and not yet ended, for the active-sessions gauge.
+# Abandoned sessions age out with the session TTL.
+_active_sessions = LRUCache(100000, ttl=SESSION_TTL_SECONDS)
+ACTIVE_SESSIONS.set_function(lambda: len(_active_sessions))
+
+# agent_id -> (persona fingerprint, start time, task) for speculatively generated opening questions.
+_prefetched_questions = LRUCache(PREFETCH_CACHE_SIZE, ttl=PREFETCH_TTL_SECONDS)
+_prefetch_tasks = set()
+prefetch_stats = {"hits": 0, "in_flight_hits": 0, "misses": 0, "failures": 0, "seconds_saved": 0.0}
+
+def persona_fingerprint(agent_persona: AgentPersona) -> str:
+    return hashlib.sha256(agent_persona.model_dump_json().encode("utf-8")).hexdigest()
+
+def prefetch_opening_question(agent_persona: AgentPersona):
+    """Starts generating the opening question for a freshly built persona in the background."""
+    if not PREFETCH_OPENING_QUESTION:
+        return
+    session = InterviewSession(agent_persona.agent_id, agent_persona, PREFETCH_DURATION_MINUTES)
+    task = asyncio.create_task(generate_next_question(session, is_first=True))
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+    _prefetched_questions.set(agent_persona.agent_id, (persona_fingerprint(agent_persona), time.perf_counter(), task))
+
+async def _take_prefetched_question(agent_persona: AgentPersona) -> Question:
+    """Returns the prefetched opening question for this persona, or None on a miss."""
+    entry = _prefetched_questions.pop(agent_persona.agent_id)
+    # The persona comes back from the client; only reuse the question if it is unchanged.
+    if entry is None or entry[0] != persona_fingerprint(agent_persona):
+        prefetch_stats["misses"] += 1
+        return None
+    _, started, task = entry
+    if task.done():
+        prefetch_stats["hits"] += 1
+    else:
+        prefetch_stats["in_flight_hits"] += 1
+    waited_from = time.perf_counter()
+    try:
+        question = await task
+    except Exception:
+        logger.exception("Prefetched opening question failed")
+        prefetch_stats["failures"] += 1
+        return None
+    # Time saved is the part of the generation that ran before the candidate clicked start.
+    prefetch_stats["seconds_saved"] += max(0.0, waited_from - started)
+    return question
+
+def prefetch_cache_stats() -> dict:
+    taken = prefetch_stats["hits"] + prefetch_stats["in_flight_hits"] + prefetch_stats["misses"]
+    return {
+        **prefetch_stats,
+        "seconds_saved": round(prefetch_stats["seconds_saved"], 3),
+        "hit_rate": round((prefetch_stats["hits"] + prefetch_stats["in_flight_hits"]) / taken, 3) if taken else 0.0,
+        "cached": len(_prefetched_questions),
+    }
 
-def start_session(agent_persona: AgentPersona, duration_minutes: int) -> str:
+async def start_session(agent_persona: AgentPersona, duration_minutes: int) -> str:
     session_id = str(uuid.uuid4())
+    store.ensure_capacity()  # before spending a Gemini call on the opening question
     session = InterviewSession(session_id, agent_persona, duration_minutes)
-    sessions[session_id] = session
+    start_timeline(session_id, session.start_time, session.duration_seconds)
     
-    # Generate first question
-    first_question = generate_next_question(session, is_first=True)
+    # Generate first question, unless it was prefetched while the persona was shown
+    async with scheduler.slot(Priority.SESSION_START):
+        first_question = await _take_prefetched_question(agent_persona)
+        if first_question is None:
+            first_question = await generate_next_question(session, is_first=True)
     session.current_question = first_question
+    await store.create(session)
+    _active_sessions.set(session_id, True)
     
     return session_id
 
-def get_session(session_id: str) -> InterviewSession:
-    return sessions.get(session_id)
+async def session_gc_loop():
+    """Deletes stored sessions past their retention (a no-op for the memory store)."""
+    while True:
+        try:
+            await store.purge_expired()
+        except Exception:
+            logger.exception("Session retention sweep failed")
+        await asyncio.sleep(SESSION_GC_INTERVAL_SECONDS)
+
+async def get_session(session_id: str) -> InterviewSession:
+    return await store.get(session_id)
+
+async def end_session(session_id: str, face_missing_seconds: int) -> InterviewSession:
+    session = await get_session(session_id)
+    if not session:
+        return None
+    # Prefer the server-side timeline; the client's total covers sessions it never reached.
+    timeline = get_timeline(session_id)
+    session.face_missing_seconds = round(timeline.absent_seconds) if timeline and timeline.has_data else face_missing_seconds
+    await store.save(session)
+    _active_sessions.pop(session_id)
+    return session
 
-def process_answer(session_id: str, audio_file_path: str):
-    session = get_session(session_id)
+async def process_answer(session_id: str, audio_source):
+    """Transcribes an answer given as a file path or encoded audio bytes and moves the interview on."""
+    session = await get_session(session_id)
     if not session:
         raise ValueError("Session not found")
     
-    # 1. Transcribe
-    transcript = transcribe_audio(audio_file_path)
+    async with scheduler.slot(Priority.LIVE_TURN, _turn_timeout(session)):
+        # 1. Transcribe
+        transcript = await transcribe_audio(audio_source)
+        
+        return await _record_answer(session, transcript)
+
+async def process_transcript(session_id: str, transcript: str, on_question_text=None):
+    """Same as process_answer for an answer that was already transcribed while streaming.
+
+    If on_question_text is given, the next question's text is streamed to it as it is generated.
+    """
+    session = await get_session(session_id)
+    if not session:
+        raise ValueError("Session not found")
     
-    # 2. Evaluate
-    evaluation = evaluate_answer(session, transcript)
+    async with scheduler.slot(Priority.LIVE_TURN, _turn_timeout(session)):
+        return await _record_answer(session, transcript, on_question_text)
+
+def _turn_timeout(session: InterviewSession) -> float:
+    """Queue deadline for a live turn; sessions closer to their end are served first."""
+    return min(CLASS_TIMEOUTS[Priority.LIVE_TURN], session.get_time_remaining() + LIVE_TURN_GRACE_SECONDS)
+
+async def _record_answer(session: InterviewSession, transcript: str, on_question_text=None):
+    if not transcript.strip():
+        # Nothing was said: keep the current question instead of recording an empty turn.
+        return {
+            "transcript": "",
+            "no_speech": True,
+            "evaluation": None,
+            "evaluation_pending": False,
+            "next_question": session.current_question,
+            "time_remaining": session.get_time_remaining()
+        }
+
+    # 2. Evaluate (in the background when pipelined)
+    question = session.current_question
+    if PIPELINED_EVALUATION:
+        evaluation = None
+    else:
+        evaluation = await evaluate_answer(question, transcript)
     
     # 3. Save to history
-    session.history.append({
-        "question": session.current_question,
-        "answer": transcript,
-        "evaluation": evaluation
-    })
+    await store.append_turn(session, TurnRecord.from_parts(question, transcript, evaluation))
+    mark_question(session.session_id)
+    if PIPELINED_EVALUATION:
+        _schedule_evaluation(session, len(session.history) - 1)
     
     # 4. Generate next question or end
     if session.is_finished():
         next_question = None
     else:
-        next_question = generate_next_question(session)
+        next_question = await generate_next_question(session, on_text=on_question_text)
         session.current_question = next_question
+        await store.save(session)
         
     return {
         "transcript": transcript,
+        # Pipelined: scored in the background and only available in the final report.
         "evaluation": evaluation,
+        "evaluation_pending": evaluation is None,
         "next_question": next_question,
         "time_remaining": session.get_time_remaining()
     }
 
-def generate_next_question(session: InterviewSession, is_first: bool = False) -> Question:
+def _schedule_evaluation(session: InterviewSession, turn_index: int):
+    task = asyncio.create_task(_evaluate_turn(session, turn_index))
+    pending = _pending_evaluations.setdefault(session.session_id, set())
+    pending.add(task)
+
+    def _discard(done):
+        pending.discard(done)
+        if not pending:
+            _pending_evaluations.pop(session.session_id, None)
+
+    task.add_done_callback(_discard)
+
+async def _evaluate_turn(session: InterviewSession, turn_index: int):
+    turn = session.history[turn_index]
+    try:
+        evaluation = await evaluate_answer(turn["question"], turn["answer"])
+        await store.set_evaluation(session, turn_index, evaluation)
+    except Exception:
+        # Left unscored; complete_evaluations retries before the report is built.
+        logger.exception("Background evaluation failed for session %s turn %d", session.session_id, turn_index)
+
+async def complete_evaluations(session_id: str) -> InterviewSession:
+    """Waits for background scoring and fills in any turn still missing an evaluation.
+
+    Returns a freshly loaded session so evaluations written by other workers are included.
+    """
+    pending = _pending_evaluations.get(session_id)
+    if pending:
+        await asyncio.gather(*list(pending), return_exceptions=True)
+
+    session = await get_session(session_id)
+    if not session:
+        return None
+    missing = [i for i, turn in enumerate(session.history) if turn["evaluation"] is None]
+    evaluations = await asyncio.gather(*(
+        evaluate_answer(session.history[i]["question"], session.history[i]["answer"]) for i in missing
+    ))
+    for i, evaluation in zip(missing, evaluations):
+        await store.set_evaluation(session, i, evaluation)
+    return session
+
+def build_next_question_prompt(session: InterviewSession, is_first: bool = False) -> str:
+    """Builds the per-turn prompt; the persona is sent separately as the system instruction."""
     prompt = f"""
-    You are the AI interviewer defined by this persona:
-    {session.agent_persona.system_prompt}
+    You are the AI interviewer defined by your system instructions.
 
     Current Context:
     - Time Remaining: {session.get_time_remaining()} seconds
@@ -90,10 +299,18 @@ def generate_next_question(session: InterviewSession, is_first: bool = False) ->
         """
     else:
         last_exchange = session.history[-1]
+        evaluation = last_exchange['evaluation']
+        evaluation_line = (
+            f"Evaluation: confidence {evaluation.confidence_score}/5, clarity {evaluation.clarity_score}/5, "
+            f"correctness {evaluation.correctness_score}/5. {evaluation.feedback}"
+        ) if evaluation else ""
         prompt += f"""
+        Earlier in the interview:
+        {session.memory.render(skip_last=1)}
+
         Last Question: {last_exchange['question'].question_text}
         Candidate Answer: {last_exchange['answer']}
-        Evaluation: {last_exchange['evaluation']}
+        {evaluation_line}
 
         Based on the last answer and the overall progress, generate the next question.
         
@@ -114,8 +331,15 @@ def generate_next_question(session: InterviewSession, is_first: bool = False) ->
         "difficulty": "low|medium|high"
     }
     """
-    
-    data = generate_json(prompt)
+    return prompt
+
+async def generate_next_question(session: InterviewSession, is_first: bool = False, on_text=None) -> Question:
+    prompt = build_next_question_prompt(session, is_first)
+    if on_text is None:
+        data = await agenerate_json(prompt, system_instruction=session.system_instruction, caller="next_question")
+    else:
+        data = await astream_json_field(prompt, "question_text", on_text, system_instruction=session.system_instruction,
+                                        caller="next_question")
     if isinstance(data, list):
         data = data[0] if data else {}
     
@@ -126,11 +350,11 @@ def generate_next_question(session: InterviewSession, is_first: bool = False) ->
         difficulty=data.get("difficulty", "medium")
     )
 
-def evaluate_answer(session: InterviewSession, answer_text: str) -> Evaluation:
+async def evaluate_answer(question: Question, answer_text: str) -> Evaluation:
     prompt = f"""
     Evaluate the following answer based on the question asked.
 
-    Question: {session.current_question.question_text}
+    Question: {question.question_text}
     Answer: {answer_text}
 
     Score from 1-5 on:
@@ -148,7 +372,7 @@ def evaluate_answer(session: InterviewSession, answer_text: str) -> Evaluation:
     }}
     """
     
-    data = generate_json(prompt)
+    data = await agenerate_json(prompt, caller="evaluate")
     if isinstance(data, list):
         data = data[0] if data else {}
     
@@ -160,19 +384,15 @@ def evaluate_answer(session: InterviewSession, answer_text: str) -> Evaluation:
         follow_up_needed=data.get("follow_up_needed", False)
     )
 
-def generate_interview_summary(session: InterviewSession) -> dict:
-    """Generates an overall summary and score for the interview."""
+def build_summary_prompt(session: InterviewSession) -> str:
+    history_text = summarize_history(session.history)
     
-    history_text = ""
-    for item in session.history:
-        history_text += f"Q: {item['question'].question_text}\nA: {item['answer']}\nEvaluation: {item['evaluation']}\n\n"
-        
-    prompt = f"""
+    return f"""
     Analyze the following interview session and provide a comprehensive summary.
     
-    Candidate Persona: {session.agent_persona.system_prompt}
+    Candidate Persona: {clip(session.agent_persona.system_prompt, 2000)}
     
-    Interview History:
+    Interview History (one line per question, answers may be abbreviated):
     {history_text}
     
     Output JSON matching this schema:
@@ -183,8 +403,12 @@ def generate_interview_summary(session: InterviewSession) -> dict:
         "summary_feedback": "Detailed paragraph..."
     }}
     """
+
+async def generate_interview_summary(session: InterviewSession) -> dict:
+    """Generates an overall summary and score for the interview."""
     
-    data = generate_json(prompt)
+    prompt = build_summary_prompt(session)
+    data = await agenerate_json(prompt, caller="summary")
     if isinstance(data, list):
         data = data[0] if data else {}
         
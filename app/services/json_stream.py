@@ -0,0 +1,65 @@
+import json
+import re
+
+class JsonStringField:
+    """Incrementally decodes one string field of a JSON object as it streams in.
+
+    ``feed`` takes raw response chunks and returns whatever new characters of the
+    field's value became decodable, so callers can act on the text before the
+    object is complete.
+    """
+
+    def __init__(self, name: str):
+        self._key = re.compile(r'"' + re.escape(name) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = None  # index of the next undecoded character of the value
+        self.done = False
+        self.value = ""
+
+    def feed(self, chunk: str) -> str:
+        if self.done:
+            return ""
+        self._buffer += chunk
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        decoded = []
+        buffer, i = self._buffer, self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            if char != "\\":
+                decoded.append(char)
+                i += 1
+                continue
+            escape = self._escape_length(buffer, i)
+            if escape is None:
+                break  # escape sequence split across chunks; wait for more
+            decoded.append(json.loads(f'"{buffer[i:i + escape]}"'))
+            i += escape
+        self._pos = i
+        text = "".join(decoded)
+        self.value += text
+        return text
+
+    @staticmethod
+    def _escape_length(buffer: str, i: int):
+        if i + 1 >= len(buffer):
+            return None
+        if buffer[i + 1] != "u":
+            return 2
+        if i + 6 > len(buffer):
+            return None
+        # A high surrogate is only decodable together with the low surrogate after it.
+        if 0xD800 <= int(buffer[i + 2:i + 6], 16) <= 0xDBFF:
+            if i + 12 > len(buffer):
+                return None
+            if buffer[i + 6:i + 8] == "\\u":
+                return 12
+        return 6
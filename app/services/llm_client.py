@@ -1,27 +1,259 @@
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
+from app.services.executor import run_io
+from app.services.cache import LRUCache
+from app.services.json_stream import JsonStringField
+from app.services.scheduler import PrioritySemaphore
+from app.services.metrics import LLM_SECONDS, LLM_RETRIES, LLM_ERRORS, LLM_COALESCED, record_llm_usage
+import asyncio
+import hashlib
 import json
+import logging
+import random
+import time
 
 load_dotenv()
 
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    print("WARNING: GEMINI_API_KEY not found in environment variables.")
+logger = logging.getLogger(__name__)
 
-genai.configure(api_key=api_key)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")
+# GEMINI_API_ENDPOINT / GEMINI_TRANSPORT let the client talk to a local fake server
+# (see benchmarks/fake_gemini_server.py) instead of the real API.
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT") or None
+transport = os.getenv("GEMINI_TRANSPORT") or None
+# "fake" swaps in the deterministic model from fake_backends (no network, no SDK).
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
 
-model = genai.GenerativeModel('gemini-2.0-flash-lite')
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+
+JSON_CONFIG = {"response_mime_type": "application/json"}
+
+_model = None
+_instructed_models = LRUCache(256)
+_retryable_errors = None
+_semaphore = None
+_inflight = {}
+
+def get_model(system_instruction: str = None):
+    """Configures the Gemini SDK and builds the model on first use.
+
+    Models with a system instruction (e.g. an interviewer persona) are cached so a
+    session reuses the same instance every turn.
+    """
+    global _model
+    if LLM_BACKEND == "fake":
+        if _model is None:
+            from app.services.fake_backends import FakeGenerativeModel
+            _model = FakeGenerativeModel()
+        return _model
+    if system_instruction:
+        model = _instructed_models.get(system_instruction)
+        if model is None:
+            import google.generativeai as genai
+            get_model()
+            model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=system_instruction)
+            _instructed_models.set(system_instruction, model)
+        return model
+    if _model is None:
+        import google.generativeai as genai
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            logger.warning("GEMINI_API_KEY not found in environment variables.")
+
+        client_options = {"api_endpoint": GEMINI_API_ENDPOINT} if GEMINI_API_ENDPOINT else None
+        genai.configure(api_key=api_key, transport=transport, client_options=client_options)
+        _model = genai.GenerativeModel(GEMINI_MODEL)
+    return _model
+
+def get_retryable_errors() -> tuple:
+    """429 and 5xx responses are worth retrying; everything else is a caller error."""
+    global _retryable_errors
+    if _retryable_errors is None and LLM_BACKEND == "fake":
+        _retryable_errors = (asyncio.TimeoutError,)
+    if _retryable_errors is None:
+        from google.api_core import exceptions as google_exceptions
+
+        _retryable_errors = (
+            google_exceptions.TooManyRequests,
+            google_exceptions.ResourceExhausted,
+            google_exceptions.InternalServerError,
+            google_exceptions.BadGateway,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.GatewayTimeout,
+            asyncio.TimeoutError,
+        )
+    return _retryable_errors
 
 def generate_text(prompt: str) -> str:
     """Generates text using Gemini."""
-    response = model.generate_content(prompt)
+    response = get_model().generate_content(prompt)
     return response.text
 
 def generate_json(prompt: str) -> dict:
     """Generates JSON using Gemini."""
-    response = model.generate_content(prompt, generation_config={"response_mime_type": "application/json"})
+    response = get_model().generate_content(prompt, generation_config=JSON_CONFIG)
+    return _parse_json(response.text)
+
+async def agenerate_text(prompt: str, timeout: float = None, system_instruction: str = None, caller: str = "other") -> str:
+    """Generates text using Gemini without blocking the event loop."""
+    return await _coalesced(prompt, None, timeout, system_instruction, caller)
+
+async def agenerate_json(prompt: str, timeout: float = None, system_instruction: str = None, caller: str = "other") -> dict:
+    """Generates JSON using Gemini without blocking the event loop.
+
+    Identical prompts already in flight share a single request, at most
+    LLM_MAX_CONCURRENCY requests run at once, and 429/5xx failures are retried
+    with jittered exponential backoff until the deadline is reached. ``caller``
+    labels the request in the llm_* metrics. A coalesced request is billed once:
+    its latency and tokens are recorded under the caller that issued it, and
+    callers that joined it only count in llm_coalesced_total.
+    """
+    return _parse_json(await _coalesced(prompt, JSON_CONFIG, timeout, system_instruction, caller))
+
+async def astream_json_field(prompt: str, field: str, on_text, timeout: float = None, system_instruction: str = None,
+                             caller: str = "other") -> dict:
+    """Generates JSON with Gemini's streaming API, passing the named string field to
+    ``on_text`` piece by piece as it arrives. Returns the parsed object once complete.
+    """
+    extractor = JsonStringField(field)
+    chunks = []
+    async for chunk in astream_text(prompt, JSON_CONFIG, timeout, system_instruction, caller):
+        chunks.append(chunk)
+        text = extractor.feed(chunk)
+        if text:
+            await on_text(text)
+    return _parse_json("".join(chunks))
+
+async def astream_text(prompt: str, generation_config=None, timeout: float = None, system_instruction: str = None,
+                       caller: str = "other"):
+    """Yields response text chunks as Gemini generates them.
+
+    Streams are not coalesced. 429/5xx failures are retried like agenerate_json,
+    but only until the first chunk has been yielded.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (timeout or LLM_TIMEOUT_SECONDS)
+    attempt = 0
+    start = time.perf_counter()
+    while True:
+        started = False
+        try:
+            async with _get_semaphore():
+                stream = _stream_model(prompt, generation_config, system_instruction, caller)
+                try:
+                    while True:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError("Gemini request exceeded its deadline")
+                        try:
+                            chunk = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+                        except StopAsyncIteration:
+                            LLM_SECONDS.labels(caller).observe(time.perf_counter() - start)
+                            return
+                        started = True
+                        yield chunk
+                finally:
+                    await stream.aclose()
+        except Exception as e:
+            if started or not isinstance(e, get_retryable_errors()) or not await _backoff(caller, e, attempt, deadline):
+                LLM_ERRORS.labels(caller, type(e).__name__).inc()
+                raise
+            attempt += 1
+
+async def _backoff(caller: str, error: Exception, attempt: int, deadline: float) -> bool:
+    """Sleeps before retry attempt+1; returns False when no retry is left within the deadline."""
+    loop = asyncio.get_running_loop()
+    if attempt >= LLM_MAX_RETRIES:
+        return False
+    backoff = random.uniform(0, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    if loop.time() + backoff >= deadline:
+        return False
+    LLM_RETRIES.labels(caller).inc()
+    logger.warning("Retrying %s Gemini call after %s (attempt %d)", caller, type(error).__name__, attempt + 1)
+    await asyncio.sleep(backoff)
+    return True
+
+def _parse_json(text: str) -> dict:
     try:
-        return json.loads(response.text)
+        return json.loads(text)
     except json.JSONDecodeError:
         return {}
+
+def _get_semaphore() -> PrioritySemaphore:
+    global _semaphore
+    if _semaphore is None:
+        # Live turns waiting for a Gemini slot go ahead of onboarding and reports.
+        _semaphore = PrioritySemaphore(LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+async def _coalesced(prompt: str, generation_config, timeout, system_instruction=None, caller: str = "other"):
+    key = hashlib.sha256(f"{generation_config}\x00{system_instruction}\x00{prompt}".encode("utf-8")).hexdigest()
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_generate_with_retry(prompt, generation_config, timeout, system_instruction, caller))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        LLM_COALESCED.labels(caller).inc()
+    # Shield so one cancelled caller does not cancel the request for the others.
+    return await asyncio.shield(future)
+
+async def _generate_with_retry(prompt: str, generation_config, timeout, system_instruction=None, caller: str = "other"):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (timeout or LLM_TIMEOUT_SECONDS)
+    attempt = 0
+    start = time.perf_counter()
+    while True:
+        try:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("Gemini request exceeded its deadline")
+            async with _get_semaphore():
+                response = await asyncio.wait_for(
+                    _call_model(prompt, generation_config, system_instruction),
+                    timeout=deadline - loop.time(),
+                )
+            LLM_SECONDS.labels(caller).observe(time.perf_counter() - start)
+            record_llm_usage(caller, response)
+            return response.text
+        except Exception as e:
+            if not isinstance(e, get_retryable_errors()) or not await _backoff(caller, e, attempt, deadline):
+                LLM_ERRORS.labels(caller, type(e).__name__).inc()
+                raise
+            attempt += 1
+
+async def _call_model(prompt: str, generation_config, system_instruction=None):
+    model = get_model(system_instruction)
+    if transport == "rest":
+        # The SDK only ships an async client for gRPC, so REST calls use the I/O pool.
+        return await run_io(model.generate_content, prompt, generation_config=generation_config)
+    return await model.generate_content_async(prompt, generation_config=generation_config)
+
+async def _stream_model(prompt: str, generation_config, system_instruction=None, caller: str = "other"):
+    model = get_model(system_instruction)
+    last = None
+    if transport == "rest":
+        response = await run_io(model.generate_content, prompt, generation_config=generation_config, stream=True)
+        chunks = iter(response)
+        while (chunk := await run_io(next, chunks, None)) is not None:
+            last = chunk
+            yield _chunk_text(chunk)
+    else:
+        response = await model.generate_content_async(prompt, generation_config=generation_config, stream=True)
+        async for chunk in response:
+            last = chunk
+            yield _chunk_text(chunk)
+    # Usage metadata is complete on the last chunk of a stream.
+    if last is not None:
+        record_llm_usage(caller, last)
+
+def _chunk_text(chunk) -> str:
+    # The final chunk of a stream may carry only the finish reason and no parts.
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+import time
+
+# Buckets cover everything from a cached PDF parse to a slow Gemini call with retries.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "interview_stage_seconds", "Latency of hot-path stages (transcribe, parse_pdf, write_pdf, ...)",
+    ["stage"], buckets=LATENCY_BUCKETS,
+)
+STAGE_ERRORS = Counter("interview_stage_errors_total", "Stages that raised", ["stage"])
+
+LLM_SECONDS = Histogram(
+    "llm_request_seconds", "Gemini call latency including retries, by calling feature",
+    ["caller"], buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported by Gemini usage metadata", ["caller", "kind"])
+LLM_RETRIES = Counter("llm_retries_total", "Retried Gemini attempts (429/5xx/timeout)", ["caller"])
+LLM_ERRORS = Counter("llm_errors_total", "Gemini calls that failed after retries", ["caller", "error"])
+LLM_COALESCED = Counter("llm_coalesced_total", "Calls that joined an identical in-flight Gemini request", ["caller"])
+
+ACTIVE_SESSIONS = Gauge("interview_active_sessions", "Sessions started and not yet ended in this process")
+TRANSCRIPTION_QUEUE_DEPTH = Gauge("transcription_queue_depth", "Clips waiting for a Whisper replica")
+
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "scheduler_queue_wait_seconds", "Time admitted work waited for a scheduler slot, by priority class",
+    ["priority"], buckets=LATENCY_BUCKETS,
+)
+SCHEDULER_REJECTED = Counter("scheduler_rejected_total", "Work shed (queue full) or expired in the queue", ["priority", "reason"])
+SCHEDULER_QUEUED = Gauge("scheduler_queued", "Work waiting for a scheduler slot", ["priority"])
+
+@contextmanager
+def observe_stage(stage: str):
+    """Records the duration of the enclosed block under interview_stage_seconds{stage}."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+def record_llm_usage(caller: str, response):
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    LLM_TOKENS.labels(caller, "prompt").inc(getattr(usage, "prompt_token_count", 0) or 0)
+    LLM_TOKENS.labels(caller, "completion").inc(getattr(usage, "candidates_token_count", 0) or 0)
@@ -0,0 +1,172 @@
+from app.models.schemas import AgentPersona, JobDescription, Resume
+from app.services.parsers import (
+    parse_jd, parse_resume, parse_pdf, jd_from_data, resume_from_data, has_extracted_fields,
+    PROMPT_VERSION, JD_FIELDS, RESUME_FIELDS,
+)
+from app.services.pdf_extraction import select_prompt_text, JD_PRIORITY_SECTIONS, RESUME_PRIORITY_SECTIONS
+from app.services.agent import build_agent_persona, persona_base_from_data, remember_persona_base, specialize_persona, CANDIDATE_PLACEHOLDER
+from app.services.doc_cache import document_cache
+from app.services.llm_client import agenerate_json
+from app.services.executor import run_cpu
+from app.services.metrics import STAGE_SECONDS
+from app.services.upload_store import StoredUpload
+from app.services.scheduler import scheduler, Priority
+from contextlib import contextmanager
+from pydantic import ValidationError
+import asyncio
+import logging
+import os
+import time
+
+# "pipelined": JD and resume are extracted concurrently, then the persona is built.
+# "single_call": one Gemini request returns the JD, resume and persona together.
+ONBOARDING_MODE = os.getenv("ONBOARDING_MODE", "pipelined")
+ONBOARDING_MODES = ("pipelined", "single_call")
+# Each document gets its own share of the combined prompt in single-call mode.
+SINGLE_CALL_DOC_CHARS = 8000
+# Single-call extractions come from a different prompt and truncation window than
+# parse_jd/parse_resume, so they are cached under their own version.
+SINGLE_CALL_PROMPT_VERSION = f"single-{PROMPT_VERSION}.1"
+
+logger = logging.getLogger(__name__)
+
+class StageTimings:
+    """Wall-clock duration per onboarding stage, rendered as a Server-Timing header."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - start
+
+    def finish(self, mode: str):
+        self.stages["total"] = time.perf_counter() - self.started
+        for name, seconds in self.stages.items():
+            STAGE_SECONDS.labels(f"onboarding_{mode}_{name}").observe(seconds)
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+
+async def build_persona_from_uploads(jd_upload: StoredUpload, resume_upload: StoredUpload,
+                                     mode: str = None) -> tuple:
+    """Runs onboarding for the uploaded JD and resume; returns (persona, timings, mode used)."""
+    mode = mode or ONBOARDING_MODE
+    timings = StageTimings()
+    persona = None
+    async with scheduler.slot(Priority.ONBOARDING) as waited:
+        timings.stages["queue"] = waited
+        if mode == "single_call":
+            persona = await _single_call(jd_upload, resume_upload, timings)
+            if persona is None:
+                mode = "pipelined"
+        if persona is None:
+            persona = await _pipelined(jd_upload, resume_upload, timings)
+    timings.finish(mode)
+    return persona, timings, mode
+
+async def _timed(timings: StageTimings, name: str, coro):
+    with timings.stage(name):
+        return await coro
+
+async def _pipelined(jd_upload: StoredUpload, resume_upload: StoredUpload, timings: StageTimings) -> AgentPersona:
+    jd, resume = await asyncio.gather(
+        _timed(timings, "jd", parse_jd(jd_upload.source, jd_upload.digest)),
+        _timed(timings, "resume", parse_resume(resume_upload.source, resume_upload.digest)),
+    )
+    with timings.stage("persona"):
+        return await build_agent_persona(jd, resume)
+
+async def _single_call(jd_upload: StoredUpload, resume_upload: StoredUpload, timings: StageTimings) -> AgentPersona:
+    """One Gemini request for all three objects; None means fall back to the pipelined mode."""
+    if (await document_cache.get(document_cache.make_key("jd", jd_upload.digest, PROMPT_VERSION), JobDescription) is not None
+            and await document_cache.get(document_cache.make_key("resume", resume_upload.digest, PROMPT_VERSION), Resume) is not None):
+        # Both documents are already parsed; the pipelined path costs at most the persona call.
+        return None
+
+    jd_key = document_cache.make_key("jd", jd_upload.digest, SINGLE_CALL_PROMPT_VERSION)
+    resume_key = document_cache.make_key("resume", resume_upload.digest, SINGLE_CALL_PROMPT_VERSION)
+    jd, resume = await document_cache.get(jd_key, JobDescription), await document_cache.get(resume_key, Resume)
+    if jd is not None and resume is not None:
+        with timings.stage("persona"):
+            return await build_agent_persona(jd, resume)
+
+    with timings.stage("extract"):
+        jd_text, resume_text = await asyncio.gather(
+            run_cpu(parse_pdf, jd_upload.source), run_cpu(parse_pdf, resume_upload.source),
+        )
+    try:
+        with timings.stage("llm"):
+            data = await agenerate_json(build_single_call_prompt(jd_text, resume_text), caller="onboarding")
+    except Exception as e:
+        # Timeouts, exhausted 429/5xx retries or an SDK error: the smaller pipelined calls may still succeed.
+        logger.warning("Single-call onboarding request failed (%s: %s); falling back", type(e).__name__, e)
+        return None
+    try:
+        jd_data, resume_data = _section(data, "job_description"), _section(data, "resume")
+        persona_data = _section(data, "persona")
+        if not has_extracted_fields(jd_data, JD_FIELDS) or not has_extracted_fields(resume_data, RESUME_FIELDS):
+            raise ValueError("empty extraction")
+        jd = jd_from_data(jd_data, jd_text)
+        resume = resume_from_data(resume_data, resume_text)
+        base = persona_base_from_data(persona_data)
+    except (ValidationError, TypeError, ValueError) as e:
+        logger.warning("Single-call onboarding returned an invalid response (%s); falling back", e)
+        return None
+
+    await document_cache.put(jd_key, "jd", jd)
+    await document_cache.put(resume_key, "resume", resume)
+    if persona_data.get("system_prompt"):
+        remember_persona_base(jd, base)
+    return specialize_persona(base, resume, jd)
+
+def _section(data, name: str) -> dict:
+    section = data.get(name) if isinstance(data, dict) else None
+    if not isinstance(section, dict):
+        raise ValueError(f"missing {name}")
+    return section
+
+def build_single_call_prompt(jd_text: str, resume_text: str) -> str:
+    return f"""
+    You are an expert technical recruiter and hiring manager.
+    From the job description and resume below:
+    1. Extract the job description's role title, company name, required skills, responsibilities and a markdown summary.
+    2. Extract the candidate's name, skills, an experience summary and a markdown summary.
+    3. Create an interviewer persona for the role. The persona is reused for every candidate,
+       so it must not mention this candidate; use the literal placeholder {CANDIDATE_PLACEHOLDER}
+       in the greeting where the candidate's name goes. It needs a detailed system prompt
+       (tone, style, focus areas), an initial greeting and 5-7 topics to evaluate.
+
+    Output JSON matching this schema:
+    {{
+        "job_description": {{
+            "role_title": "...",
+            "company_name": "...",
+            "required_skills": ["..."],
+            "responsibilities": ["..."],
+            "summary_markdown": "..."
+        }},
+        "resume": {{
+            "candidate_name": "...",
+            "skills": ["..."],
+            "experience_summary": "...",
+            "summary_markdown": "..."
+        }},
+        "persona": {{
+            "system_prompt": "...",
+            "initial_greeting": "...",
+            "topics_to_evaluate": ["..."]
+        }}
+    }}
+
+    Job Description Text:
+    {select_prompt_text(jd_text, SINGLE_CALL_DOC_CHARS, JD_PRIORITY_SECTIONS)}
+
+    Resume Text:
+    {select_prompt_text(resume_text, SINGLE_CALL_DOC_CHARS, RESUME_PRIORITY_SECTIONS)}
+    """
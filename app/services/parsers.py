@@ -1,19 +1,38 @@
-import fitz  # PyMuPDF
 from app.models.schemas import JobDescription, Resume
+from app.services.pdf_extraction import extract_text, select_prompt_text, JD_PRIORITY_SECTIONS, RESUME_PRIORITY_SECTIONS
+from app.services.metrics import observe_stage
+from typing import Union
 
-def parse_pdf(file_path: str) -> str:
-    """Extracts text from a PDF file."""
-    doc = fitz.open(file_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    return text
+def parse_pdf(source: Union[str, bytes]) -> str:
+    """Extracts text from a PDF file path or in-memory PDF bytes, up to PDF_EXTRACT_MAX_CHARS."""
+    with observe_stage("parse_pdf"):
+        return extract_text(source)
 
-from app.services.llm_client import generate_json
+from app.services.llm_client import agenerate_json
+from app.services.executor import run_cpu, run_io
+from app.services.doc_cache import document_cache, hash_file, hash_bytes
 
-def parse_jd(file_path: str) -> JobDescription:
-    """Parses a Job Description file."""
-    raw_text = parse_pdf(file_path)
+# Bump when the extraction prompts below change so stale cache entries are ignored.
+PROMPT_VERSION = "2"
+
+JD_FIELDS = ("role_title", "company_name", "required_skills", "responsibilities", "summary_markdown")
+RESUME_FIELDS = ("candidate_name", "skills", "experience_summary", "summary_markdown")
+
+def has_extracted_fields(data, fields: tuple) -> bool:
+    """True if the model returned at least one of the fields; empty or non-JSON replies are not cached."""
+    return isinstance(data, dict) and any(data.get(field) for field in fields)
+
+async def _content_hash(source: Union[str, bytes]) -> str:
+    return hash_bytes(source) if isinstance(source, bytes) else await run_io(hash_file, source)
+
+async def parse_jd(source: Union[str, bytes], digest: str = None) -> JobDescription:
+    """Parses a Job Description file (path or PDF bytes); pass digest if the SHA-256 is already known."""
+    cache_key = document_cache.make_key("jd", digest or await _content_hash(source), PROMPT_VERSION)
+    cached = await document_cache.get(cache_key, JobDescription)
+    if cached is not None:
+        return cached
+
+    raw_text = await run_cpu(parse_pdf, source)
     
     prompt = f"""
     Extract the following information from the job description text below:
@@ -33,11 +52,18 @@ def parse_jd(file_path: str) -> JobDescription:
     }}
 
     Text:
-    {raw_text[:10000]}
+    {select_prompt_text(raw_text, priorities=JD_PRIORITY_SECTIONS)}
     """
     
-    data = generate_json(prompt)
+    data = await agenerate_json(prompt, caller="parse_jd")
     
+    jd = jd_from_data(data, raw_text)
+    if has_extracted_fields(data, JD_FIELDS):
+        await document_cache.put(cache_key, "jd", jd)
+    return jd
+
+def jd_from_data(data: dict, raw_text: str) -> JobDescription:
+    """Validates extracted JD fields, filling defaults for anything the model left out."""
     return JobDescription(
         role_title=data.get("role_title") or "Unknown Role",
         company_name=data.get("company_name") or "Unknown Company",
@@ -47,9 +73,14 @@ def parse_jd(file_path: str) -> JobDescription:
         summary_markdown=data.get("summary_markdown") or "No summary available."
     )
 
-def parse_resume(file_path: str) -> Resume:
-    """Parses a Resume file."""
-    raw_text = parse_pdf(file_path)
+async def parse_resume(source: Union[str, bytes], digest: str = None) -> Resume:
+    """Parses a Resume file (path or PDF bytes); pass digest if the SHA-256 is already known."""
+    cache_key = document_cache.make_key("resume", digest or await _content_hash(source), PROMPT_VERSION)
+    cached = await document_cache.get(cache_key, Resume)
+    if cached is not None:
+        return cached
+
+    raw_text = await run_cpu(parse_pdf, source)
     
     prompt = f"""
     Extract the following information from the resume text below:
@@ -67,11 +98,18 @@ def parse_resume(file_path: str) -> Resume:
     }}
 
     Text:
-    {raw_text[:10000]}
+    {select_prompt_text(raw_text, priorities=RESUME_PRIORITY_SECTIONS)}
     """
     
-    data = generate_json(prompt)
+    data = await agenerate_json(prompt, caller="parse_resume")
     
+    resume = resume_from_data(data, raw_text)
+    if has_extracted_fields(data, RESUME_FIELDS):
+        await document_cache.put(cache_key, "resume", resume)
+    return resume
+
+def resume_from_data(data: dict, raw_text: str) -> Resume:
+    """Validates extracted resume fields, filling defaults for anything the model left out."""
     return Resume(
         candidate_name=data.get("candidate_name") or "Unknown Candidate",
         skills=data.get("skills") or [],
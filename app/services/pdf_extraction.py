@@ -0,0 +1,115 @@
+from app.services.executor import get_process_pool, PROCESS_WORKERS
+from typing import Union
+import os
+import re
+
+# Extraction stops once this many characters have been read; the prompt only ever
+# sees PROMPT_TEXT_CHARS of it, chosen by section priority. The extracted text is also
+# what is stored as raw_text on JobDescription/Resume, so 0 (no limit) keeps it whole.
+PDF_EXTRACT_MAX_CHARS = int(os.getenv("PDF_EXTRACT_MAX_CHARS", "50000"))
+PROMPT_TEXT_CHARS = 10000
+# Documents with at least this many pages are split across the process pool.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "24"))
+PREAMBLE_CHARS = 1500
+
+JD_PRIORITY_SECTIONS = (
+    "requirements", "qualifications", "skills", "responsibilities", "what you will do",
+    "what you'll do", "about the role", "role", "experience",
+)
+RESUME_PRIORITY_SECTIONS = (
+    "skills", "technical skills", "experience", "work experience", "professional experience",
+    "employment", "projects", "summary", "education",
+)
+
+_HEADING = re.compile(r"^\s*([A-Za-z][A-Za-z &/'’-]{1,48}?)\s*:?\s*$")
+
+def extract_text(source: Union[str, bytes], max_chars: int = PDF_EXTRACT_MAX_CHARS) -> str:
+    """Extracts page text in order, stopping once max_chars characters have been read (0 = no limit)."""
+    import fitz
+
+    max_chars = max_chars if max_chars > 0 else float("inf")
+    with (fitz.open(stream=source, filetype="pdf") if isinstance(source, bytes) else fitz.open(source)) as doc:
+        page_count = doc.page_count
+        if page_count < PDF_PARALLEL_MIN_PAGES or PROCESS_WORKERS <= 1:
+            chunks = []
+            total = 0
+            for page in doc:
+                text = page.get_text()
+                chunks.append(text)
+                total += len(text)
+                if total >= max_chars:
+                    break
+            return _truncate("".join(chunks), max_chars)
+    return _extract_parallel(source, page_count, max_chars)
+
+def _extract_pages(source: Union[str, bytes], start: int, stop: int) -> str:
+    import fitz
+
+    with (fitz.open(stream=source, filetype="pdf") if isinstance(source, bytes) else fitz.open(source)) as doc:
+        return "".join(doc[i].get_text() for i in range(start, stop))
+
+def _extract_parallel(source: Union[str, bytes], page_count: int, max_chars: int) -> str:
+    pool = get_process_pool()
+    step = max(1, -(-page_count // (PROCESS_WORKERS * 2)))
+    futures = [pool.submit(_extract_pages, source, start, min(page_count, start + step))
+               for start in range(0, page_count, step)]
+    chunks = []
+    total = 0
+    # Consume ranges in page order so the early stop keeps a prefix of the document.
+    for i, future in enumerate(futures):
+        text = future.result()
+        chunks.append(text)
+        total += len(text)
+        if total >= max_chars:
+            for pending in futures[i + 1:]:
+                pending.cancel()
+            break
+    return _truncate("".join(chunks), max_chars)
+
+def _truncate(text: str, max_chars) -> str:
+    return text if len(text) <= max_chars else text[:max_chars]
+
+def split_sections(text: str) -> list:
+    """Splits text into (heading, body) pairs on short title-like lines; the preamble has heading ''."""
+    sections = []
+    heading, start = "", 0
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        match = _HEADING.match(line)
+        if match and len(line.strip()) <= 50 and (line.strip().isupper() or line.strip().istitle() or line.rstrip().endswith(":")):
+            if offset > start:
+                sections.append((heading, text[start:offset]))
+            heading, start = match.group(1).strip().lower(), offset
+        offset += len(line)
+    sections.append((heading, text[start:]))
+    return sections
+
+def select_prompt_text(text: str, budget: int = PROMPT_TEXT_CHARS, priorities: tuple = ()) -> str:
+    """Fits text into budget, keeping the opening section and priority sections before everything else.
+
+    Selected sections are emitted in their original order so the model still sees a
+    coherent document.
+    """
+    if len(text) <= budget:
+        return text
+    sections = split_sections(text)
+
+    def rank(item):
+        index, (heading, _) = item
+        if index == 0:
+            return (0, index)
+        for priority, name in enumerate(priorities):
+            if name in heading:
+                return (1 + priority, index)
+        return (1 + len(priorities), index)
+
+    chosen = {}
+    remaining = budget
+    for index, (heading, body) in sorted(enumerate(sections), key=rank):
+        if remaining <= 0:
+            break
+        # The opening section usually carries the name/title; keep it but cap its share.
+        limit = min(remaining, PREAMBLE_CHARS) if index == 0 else remaining
+        chosen[index] = body[:limit]
+        remaining -= len(chosen[index])
+    return "".join(chosen[i] for i in sorted(chosen))
@@ -1,79 +1,93 @@
-from weasyprint import HTML
-from app.services.interview_engine import InterviewSession
+from typing import TYPE_CHECKING
+from app.services.executor import run_io, run_process
+from app.services.metrics import observe_stage
+from app.services.proctoring import get_timeline
 import os
 
-def generate_final_report(session: InterviewSession) -> str:
-    """Generates a PDF report for the interview session."""
-    
-    from app.services.interview_engine import generate_interview_summary
-    summary_data = generate_interview_summary(session)
-    
-    html_content = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: sans-serif; padding: 20px; }}
-            h1 {{ color: #2563eb; }}
-            h2 {{ color: #1e40af; border-bottom: 2px solid #e5e7eb; padding-bottom: 10px; margin-top: 30px; }}
-            .question {{ margin-top: 20px; font-weight: bold; }}
-            .answer {{ margin-bottom: 10px; font-style: italic; }}
-            .feedback {{ background-color: #f3f4f6; padding: 10px; border-radius: 5px; }}
-            .score {{ font-weight: bold; color: #059669; }}
-            .summary-box {{ background-color: #eff6ff; padding: 20px; border-radius: 10px; margin-bottom: 30px; }}
-            .badge {{ display: inline-block; padding: 5px 10px; border-radius: 15px; font-size: 0.9em; margin-right: 5px; margin-bottom: 5px; }}
-            .badge-green {{ background-color: #d1fae5; color: #065f46; }}
-            .badge-red {{ background-color: #fee2e2; color: #991b1b; }}
-        </style>
-    </head>
-    <body>
-        <h1>Interview Report</h1>
-        <p><strong>Session ID:</strong> {session.session_id}</p>
-        <p><strong>Duration:</strong> {session.duration_seconds / 60} minutes</p>
-        <p><strong>Time Outside Camera:</strong> {session.face_missing_seconds} seconds</p>
-        
-        <div class="summary-box">
-            <h2>Overall Assessment</h2>
-            <p><strong>Overall Score:</strong> {summary_data['overall_score']}/10</p>
-            <p>{summary_data['summary_feedback']}</p>
-            
-            <h3>Strengths</h3>
-            <div>
-                {''.join([f'<span class="badge badge-green">{s}</span>' for s in summary_data['strengths']])}
-            </div>
-            
-            <h3>Areas for Improvement</h3>
-            <div>
-                {''.join([f'<span class="badge badge-red">{s}</span>' for s in summary_data['areas_for_improvement']])}
-            </div>
-        </div>
-        
-        <h2>Transcript & Feedback</h2>
-    """
-    
-    for item in session.history:
-        q = item['question']
-        a = item['answer']
-        e = item['evaluation']
-        
-        html_content += f"""
-        <div class="question">Q: {q.question_text}</div>
-        <div class="answer">A: {a}</div>
-        <div class="feedback">
-            <p><span class="score">Confidence: {e.confidence_score}/5 | Clarity: {e.clarity_score}/5 | Correctness: {e.correctness_score}/5</span></p>
-            <p>{e.feedback}</p>
-        </div>
-        <hr>
-        """
-        
-    html_content += """
-    </body>
-    </html>
-    """
-    
-    output_dir = "data/reports"
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"report_{session.session_id}.pdf")
-    
-    HTML(string=html_content).write_pdf(output_path)
-    
+# Only for annotations: pool workers import this module for write_pdf, and pulling in
+# the interview engine there would start a session store in every worker.
+if TYPE_CHECKING:
+    from app.services.interview_engine import InterviewSession
+
+REPORT_DIR = "data/reports"
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+# Compiled once per process. The stylesheet and font configuration are parsed once per
+# render worker and passed to every WeasyPrint call instead of inline <style> blocks.
+_template = None
+_stylesheet = None
+_font_config = None
+
+def get_template():
+    global _template
+    if _template is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=select_autoescape(["html"]),
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        _template = env.get_template("report.html")
+    return _template
+
+def render_report_html(session: "InterviewSession", summary: dict, inline_css: bool = True) -> str:
+    """Renders the report template; transcript and model output are HTML-escaped."""
+    # Per-question off-camera time is kept up to date by the presence timeline, when this
+    # worker has one for the session.
+    timeline = get_timeline(session.session_id)
+    if timeline is not None and timeline.has_data:
+        face_missing_seconds = round(timeline.absent_seconds)
+        off_camera_seconds = timeline.off_camera_seconds()
+    else:
+        face_missing_seconds = session.face_missing_seconds
+        off_camera_seconds = []
+    return get_template().render(
+        session_id=session.session_id,
+        duration_minutes=session.duration_seconds / 60,
+        face_missing_seconds=face_missing_seconds,
+        off_camera_seconds=off_camera_seconds,
+        summary=summary,
+        history=session.history,
+        inline_css=inline_css,
+    )
+
+async def write_html_report(session: "InterviewSession", summary: dict, output_path: str) -> str:
+    """Writes the self-contained HTML report (styles inlined)."""
+    html_content = render_report_html(session, summary)
+    await run_io(_write_atomic, output_path, html_content)
     return output_path
+
+async def write_pdf_report(session: "InterviewSession", summary: dict, output_path: str) -> str:
+    """Renders the PDF report on the process pool so WeasyPrint never blocks this worker."""
+    html_content = render_report_html(session, summary, inline_css=False)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    # Render to a temporary file and rename so readers never see a partial PDF
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with observe_stage("write_pdf"):
+        await run_process(write_pdf, html_content, tmp_path)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def write_pdf(html_content: str, output_path: str):
+    """Renders HTML to a PDF file with WeasyPrint, using the cached report stylesheet."""
+    from weasyprint import HTML
+    HTML(string=html_content).write_pdf(output_path, stylesheets=[_get_stylesheet()], font_config=_font_config)
+
+def _get_stylesheet():
+    global _stylesheet, _font_config
+    if _stylesheet is None:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+        _font_config = FontConfiguration()
+        with open(os.path.join(TEMPLATE_DIR, "report.css")) as f:
+            _stylesheet = CSS(string=f.read(), font_config=_font_config)
+    return _stylesheet
+
+def _write_atomic(path: str, content: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
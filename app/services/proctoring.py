@@ -0,0 +1,164 @@
+"""Server-side face-presence timeline per interview session.
+
+The browser posts run-length-encoded presence every few seconds: the offset of
+the first run from the page's first presence sample (on the browser's monotonic
+clock), whether the face was present during it, and the lengths of the
+alternating runs in milliseconds. The first batch from a page anchors that clock
+to the server's receive time, so wall-clock skew or jumps on the client never
+reach the timeline and question boundaries (server time) line up with it.
+
+Absent intervals are appended to compact arrays of millisecond offsets from the
+session start. Each interval is also credited to the question on screen at the
+time, so per-question "time off camera" is a running total and reports never
+rescan the timeline. Batches that end in the future or past the end of the
+interview are rejected; retried or overlapping batches are harmless because
+anything before the end of the already recorded timeline is ignored.
+"""
+from app.services.cache import LRUCache
+from app.services.session_store import SESSION_TTL_SECONDS
+from array import array
+from bisect import bisect_right
+import os
+import time
+
+PRESENCE_MAX_SESSIONS = int(os.getenv("PRESENCE_MAX_SESSIONS", "100000"))
+# Upper bounds for one batch; the browser sends a batch every few seconds.
+MAX_PRESENCE_RUNS = 1000
+MAX_PRESENCE_BATCH_MS = 10 * 60 * 1000
+MAX_PAGE_ID_CHARS = 64
+# Slack for network delay when checking that a batch does not end in the future, and
+# for presence reported after the interview's nominal end (the final flush at /end).
+PRESENCE_SKEW_MS = 30 * 1000
+PRESENCE_GRACE_MS = 5 * 60 * 1000
+
+stats = {"batches": 0, "runs": 0, "rejected": 0}
+
+class PresenceTimeline:
+    __slots__ = ("start_ms", "limit_ms", "page_id", "page_anchor_ms", "reported_ms", "absent_starts",
+                 "absent_ends", "absent_total_ms", "question_starts", "off_camera_ms")
+
+    def __init__(self, start_time: float, duration_seconds: float):
+        self.start_ms = int(start_time * 1000)
+        self.limit_ms = int(duration_seconds * 1000) + PRESENCE_GRACE_MS
+        self.page_id = None
+        self.page_anchor_ms = 0  # session offset of the current page's presence clock origin
+        self.reported_ms = 0  # timeline is complete up to this offset
+        self.absent_starts = array("I")
+        self.absent_ends = array("I")
+        self.absent_total_ms = 0
+        self.question_starts = array("I", [0])
+        self.off_camera_ms = array("I", [0])
+
+    def add_batch(self, page_id: str, first_offset_ms: int, present: bool, runs: list, received_at: float = None) -> int:
+        """Places a batch on the timeline and appends it; returns new absent ms.
+
+        Raises ValueError if the batch would end in the future or after the interview.
+        """
+        now_ms = int((time.time() if received_at is None else received_at) * 1000) - self.start_ms
+        end_on_page = first_offset_ms + sum(runs)
+        if page_id != self.page_id:
+            # First batch from this page (or a reload): its last run ended about now.
+            anchor = max(0, now_ms - end_on_page)
+        else:
+            anchor = self.page_anchor_ms
+        end = anchor + end_on_page
+        if end > now_ms + PRESENCE_SKEW_MS or end > self.limit_ms:
+            raise ValueError("Presence batch ends in the future or after the interview")
+        self.page_id, self.page_anchor_ms = page_id, anchor
+        return self._add_runs(anchor + first_offset_ms, present, runs)
+
+    def _add_runs(self, offset: int, present: bool, runs) -> int:
+        added = 0
+        for length in runs:
+            begin, end = max(offset, self.reported_ms), offset + length
+            if end > begin:
+                if not present:
+                    self._add_absent(begin, end)
+                    added += end - begin
+                self.reported_ms = end
+            offset = end
+            present = not present
+        return added
+
+    def _add_absent(self, begin: int, end: int):
+        if self.absent_ends and self.absent_ends[-1] == begin:
+            self.absent_ends[-1] = end  # continues the previous interval across batches
+        else:
+            self.absent_starts.append(begin)
+            self.absent_ends.append(end)
+        self.absent_total_ms += end - begin
+
+        # Split across the questions shown during the interval.
+        index = bisect_right(self.question_starts, begin) - 1
+        while begin < end:
+            stop = self.question_starts[index + 1] if index + 1 < len(self.question_starts) else end
+            stop = min(stop, end)
+            self.off_camera_ms[index] += stop - begin
+            begin = stop
+            index += 1
+
+    def mark_question(self, at: float = None):
+        """Starts attributing off-camera time to the next question from ``at`` (epoch seconds)."""
+        offset = int((time.time() if at is None else at) * 1000) - self.start_ms
+        self.question_starts.append(max(self.question_starts[-1], offset))
+        self.off_camera_ms.append(0)
+
+    @property
+    def has_data(self) -> bool:
+        return self.reported_ms > 0
+
+    @property
+    def absent_seconds(self) -> float:
+        return self.absent_total_ms / 1000
+
+    def off_camera_seconds(self) -> list:
+        """Seconds off camera per question, in question order."""
+        return [ms / 1000 for ms in self.off_camera_ms]
+
+    def summary(self) -> dict:
+        return {
+            "reported_seconds": self.reported_ms / 1000,
+            "off_camera_seconds": self.absent_seconds,
+            "off_camera_intervals": len(self.absent_starts),
+            "off_camera_by_question": self.off_camera_seconds(),
+        }
+
+_timelines = LRUCache(PRESENCE_MAX_SESSIONS, ttl=SESSION_TTL_SECONDS)
+
+def start_timeline(session_id: str, start_time: float, duration_seconds: float) -> PresenceTimeline:
+    timeline = PresenceTimeline(start_time, duration_seconds)
+    _timelines.set(session_id, timeline)
+    return timeline
+
+def get_timeline(session_id: str) -> PresenceTimeline:
+    return _timelines.get(session_id)
+
+def mark_question(session_id: str, at: float = None):
+    timeline = _timelines.get(session_id)
+    if timeline is not None:
+        timeline.mark_question(at)
+
+def ingest(timeline: PresenceTimeline, batch: dict) -> int:
+    """Validates one posted batch ({"c": page id, "o": offset ms, "p": 0|1, "r": [ms, ...]}) and applies it."""
+    try:
+        page_id, first_offset, present, runs = batch["c"], batch["o"], batch["p"], batch["r"]
+        if not isinstance(page_id, str) or len(page_id) > MAX_PAGE_ID_CHARS:
+            raise ValueError
+        if not isinstance(first_offset, int) or not isinstance(runs, list) or present not in (0, 1):
+            raise ValueError
+        if len(runs) > MAX_PRESENCE_RUNS or not all(isinstance(r, int) and r >= 0 for r in runs):
+            raise ValueError
+        if not 0 <= first_offset <= timeline.limit_ms or sum(runs) > MAX_PRESENCE_BATCH_MS:
+            raise ValueError
+        added = timeline.add_batch(page_id, first_offset, bool(present), runs)
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        stats["rejected"] += 1
+        detail = str(e) if isinstance(e, ValueError) and str(e) else \
+            "Presence batch must be {\"c\": page_id, \"o\": offset_ms, \"p\": 0|1, \"r\": [run_ms, ...]}"
+        raise ValueError(detail) from None
+    stats["batches"] += 1
+    stats["runs"] += len(runs)
+    return added
+
+def proctoring_stats() -> dict:
+    return {**stats, "timelines": len(_timelines)}
@@ -0,0 +1,157 @@
+from app.services.interview_engine import InterviewSession, get_session, complete_evaluations, generate_interview_summary
+from app.services.pdf_generator import write_html_report, write_pdf_report, REPORT_DIR
+from app.services.executor import run_io
+from app.services.cache import LRUCache
+from app.services.scheduler import scheduler, Priority
+from app.services.proctoring import get_timeline
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import os
+
+REPORT_FORMATS = ("pdf", "html")
+
+logger = logging.getLogger(__name__)
+
+def history_version(session: InterviewSession) -> str:
+    """Identifies the report content: it changes when a turn is added or proctoring stats change."""
+    timeline = get_timeline(session.session_id)
+    absent_ms = timeline.absent_total_ms if timeline else 0
+    key = f"{session.session_id}:{len(session.history)}:{session.face_missing_seconds}:{absent_ms}:{session.duration_seconds}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+def report_path(session_id: str, version: str, fmt: str = "pdf") -> str:
+    return os.path.join(REPORT_DIR, f"report_{session_id}_{version}.{fmt}")
+
+class ReportJobs:
+    """Renders final reports in the background and caches them on disk by history version.
+
+    Rendering has two stages. The html stage waits for pending evaluations, asks Gemini
+    for the summary and writes the HTML report (plus the summary as JSON). The pdf
+    stage reuses that summary and renders the PDF on the process pool. ``?format=html``
+    only needs the first stage.
+
+    Jobs are keyed by (session_id, version, format), so each file is rendered once per
+    version no matter how many times it is downloaded; the files on disk are the cache
+    and are shared by every worker using the same data directory. Once a version is
+    written, older versions of the same session's report are deleted. Each stage runs in a
+    background scheduler slot, so reports yield to live interview turns.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._failures = LRUCache(1000)
+
+    async def start(self, session_id: str):
+        """Schedules rendering of the current report version if it is not cached or running."""
+        session = await get_session(session_id)
+        if session:
+            self._ensure_job(session_id, history_version(session), "pdf")
+
+    async def get(self, session_id: str, fmt: str = "pdf") -> tuple:
+        """Returns (path, version) for the current report, rendering it if needed."""
+        session = await get_session(session_id)
+        if not session:
+            return None, None
+        version = history_version(session)
+        path = report_path(session_id, version, fmt)
+        if not os.path.exists(path):
+            await self._ensure_job(session_id, version, fmt)
+        return path, version
+
+    async def current_version(self, session_id: str) -> str:
+        session = await get_session(session_id)
+        return history_version(session) if session else None
+
+    async def status(self, session_id: str) -> dict:
+        version = await self.current_version(session_id)
+        if version is None:
+            return None
+        html_ready = os.path.exists(report_path(session_id, version, "html"))
+        if os.path.exists(report_path(session_id, version)):
+            state = "ready"
+        elif any((session_id, version, fmt) in self._jobs for fmt in REPORT_FORMATS):
+            state = "pending"
+        elif (session_id, version) in self._failures:
+            return {"state": "failed", "version": version, "error": self._failures.get((session_id, version))}
+        else:
+            state = "not_started"
+        return {"state": state, "version": version, "html_ready": html_ready}
+
+    def _ensure_job(self, session_id: str, version: str, fmt: str) -> asyncio.Task:
+        key = (session_id, version, fmt)
+        task = self._jobs.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(session_id, version, fmt))
+            self._jobs[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    def _finish(self, key: tuple, task: asyncio.Task):
+        self._jobs.pop(key, None)
+        if not task.cancelled():
+            # Failures are recorded in _failures; retrieve so unawaited jobs don't warn.
+            task.exception()
+
+    async def _render(self, session_id: str, version: str, fmt: str):
+        path = report_path(session_id, version, fmt)
+        if os.path.exists(path):
+            return
+        try:
+            if fmt == "html":
+                async with scheduler.slot(Priority.BACKGROUND):
+                    session = await complete_evaluations(session_id)
+                    summary = await generate_interview_summary(session)
+                    await run_io(_write_json, report_path(session_id, version, "json"), summary)
+                    await write_html_report(session, summary, path)
+            else:
+                summary_path = report_path(session_id, version, "json")
+                if not os.path.exists(summary_path):
+                    # Outside the slot: the html stage needs one of its own.
+                    await self._ensure_job(session_id, version, "html")
+                async with scheduler.slot(Priority.BACKGROUND):
+                    session = await get_session(session_id)
+                    summary = await run_io(_read_json, summary_path)
+                    await write_pdf_report(session, summary, path)
+            self._failures.pop((session_id, version))
+            running = {v for (sid, v, _) in self._jobs if sid == session_id and v != version}
+            await run_io(_prune_versions, session_id, version, running)
+        except Exception as e:
+            logger.exception("Report %s for session %s failed", fmt, session_id)
+            self._failures.set((session_id, version), str(e))
+            raise
+
+def _prune_versions(session_id: str, version: str, running: set) -> int:
+    """Deletes report files of versions written before this one, except versions still rendering."""
+    prefix = f"report_{session_id}_"
+    newest = max((os.path.getmtime(report_path(session_id, version, fmt)) for fmt in (*REPORT_FORMATS, "json")
+                  if os.path.exists(report_path(session_id, version, fmt))), default=None)
+    if newest is None:
+        return 0
+    removed = 0
+    for path in glob.glob(os.path.join(REPORT_DIR, glob.escape(prefix) + "*")):
+        other, _, fmt = os.path.basename(path)[len(prefix):].partition(".")
+        if other == version or other in running or fmt not in (*REPORT_FORMATS, "json"):
+            continue  # temporary files have a longer suffix and belong to a writer
+        try:
+            if os.path.getmtime(path) <= newest:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            pass  # pruned by another worker
+    return removed
+
+def _write_json(path: str, data: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _read_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+report_jobs = ReportJobs()
@@ -0,0 +1,232 @@
+"""Priority scheduler for request-level work.
+
+Every unit of user-facing work takes a slot in one of four classes, highest
+priority first: live interview turns, session starts, onboarding (uploads and
+persona builds) and background jobs (reports). Free slots go to the waiting
+request with the highest class and, within a class, the earliest deadline. Per
+class limits keep lower classes from occupying the whole capacity, and full
+queues or expired deadlines are rejected with SchedulerOverloaded (a 503).
+
+Admitted work carries its class in a context variable, and the shared resources
+below the gate (the Gemini concurrency limit and the CPU pool) hand out permits
+with PrioritySemaphore, so a live turn queued behind onboarding work at one of
+them still goes first. The Whisper queue only ever holds live-turn audio and
+stays FIFO.
+"""
+from app.services.metrics import SCHEDULER_WAIT_SECONDS, SCHEDULER_REJECTED, SCHEDULER_QUEUED
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from collections import deque
+from enum import IntEnum
+import asyncio
+import heapq
+import itertools
+import os
+
+class Priority(IntEnum):
+    LIVE_TURN = 0
+    SESSION_START = 1
+    ONBOARDING = 2
+    BACKGROUND = 3
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_CAPACITY = int(os.getenv("SCHEDULER_CAPACITY", "64"))
+
+# Concurrent slots, queue length and default deadline (seconds) per class.
+_DEFAULTS = {
+    Priority.LIVE_TURN: (SCHEDULER_CAPACITY, 1000, 60),
+    Priority.SESSION_START: (8, 1000, 30),
+    Priority.ONBOARDING: (8, 64, 120),
+    Priority.BACKGROUND: (2, 32, 600),
+}
+CLASS_LIMITS = {p: int(os.getenv(f"SCHEDULER_LIMIT_{p.name}", str(d[0]))) for p, d in _DEFAULTS.items()}
+CLASS_MAX_QUEUE = {p: int(os.getenv(f"SCHEDULER_QUEUE_{p.name}", str(d[1]))) for p, d in _DEFAULTS.items()}
+CLASS_TIMEOUTS = {p: float(os.getenv(f"SCHEDULER_TIMEOUT_{p.name}", str(d[2]))) for p, d in _DEFAULTS.items()}
+
+WAIT_SAMPLES = 1000
+
+# Class of the scheduler slot the current task holds; None outside any slot.
+current_priority = ContextVar("current_priority", default=None)
+
+class SchedulerOverloaded(Exception):
+    def __init__(self, message: str, retry_after: int = 5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class PrioritySemaphore:
+    """asyncio.Semaphore that wakes waiters by scheduler class instead of arrival order.
+
+    The class comes from ``current_priority``; work outside any slot (or with the
+    scheduler disabled) counts as background, so waiters of one class stay FIFO.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters = []
+        self._seq = itertools.count()
+
+    async def acquire(self):
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        priority = current_priority.get() if SCHEDULER_ENABLED else None
+        entry = (Priority.BACKGROUND if priority is None else priority, next(self._seq),
+                 asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, entry)
+        self._wake()  # entries left by cancelled waiters may be hiding a free permit
+        try:
+            await entry[2]
+        except BaseException:
+            if entry[2].cancelled():
+                if entry in self._waiters:  # release() may already have skipped and popped it
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            else:
+                self.release()  # handed a permit just as the caller went away
+            raise
+
+    def release(self):
+        self._value += 1
+        self._wake()
+
+    def _wake(self):
+        """Hands free permits to the highest-priority waiters that are still waiting."""
+        while self._value > 0 and self._waiters:
+            future = heapq.heappop(self._waiters)[2]
+            if future.done():
+                continue  # cancelled; its task cleans up without a permit
+            self._value -= 1
+            future.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+class _Waiter:
+    __slots__ = ("priority", "future", "enqueued_at")
+
+    def __init__(self, priority: Priority, future: asyncio.Future, enqueued_at: float):
+        self.priority = priority
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+class Scheduler:
+    def __init__(self, capacity: int = SCHEDULER_CAPACITY, limits: dict = None, max_queue: dict = None,
+                 timeouts: dict = None, enabled: bool = SCHEDULER_ENABLED):
+        self.capacity = capacity
+        self.limits = limits or CLASS_LIMITS
+        self.max_queue = max_queue or CLASS_MAX_QUEUE
+        self.timeouts = timeouts or CLASS_TIMEOUTS
+        self.enabled = enabled
+        self._heap = []
+        self._seq = itertools.count()
+        self._running = {p: 0 for p in Priority}
+        self._queued = {p: 0 for p in Priority}
+        self._admitted = {p: 0 for p in Priority}
+        self._rejected = {p: {"shed": 0, "expired": 0} for p in Priority}
+        self._waits = {p: deque(maxlen=WAIT_SAMPLES) for p in Priority}
+        for p in Priority:
+            SCHEDULER_QUEUED.labels(p.name.lower()).set_function(lambda p=p: self._queued[p])
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, timeout: float = None):
+        """Holds a slot of the given class for the duration of the block; yields the seconds waited.
+
+        ``timeout`` is how long the work may wait in the queue (defaults to the class
+        timeout); within a class, requests with less time left are served first.
+        """
+        if not self.enabled:
+            yield 0.0
+            return
+        waited = await self._acquire(priority, timeout)
+        token = current_priority.set(priority)
+        try:
+            yield waited
+        finally:
+            current_priority.reset(token)
+            self._release(priority)
+
+    async def _acquire(self, priority: Priority, timeout: float) -> float:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        timeout = self.timeouts[priority] if timeout is None else max(0.0, timeout)
+        if self._can_run(priority) and not any(self._queued[p] for p in Priority if p <= priority):
+            self._grant(priority, 0.0)
+            return 0.0
+        if self._queued[priority] >= self.max_queue[priority]:
+            self._reject(priority, "shed")
+            raise SchedulerOverloaded(f"Server busy: {priority.name.lower()} queue is full")
+
+        waiter = _Waiter(priority, loop.create_future(), now)
+        heapq.heappush(self._heap, (priority, now + timeout, next(self._seq), waiter))
+        self._queued[priority] += 1
+        self._dispatch()  # a slot may be free even though other classes are queued
+        try:
+            return await asyncio.wait_for(waiter.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._reject(priority, "expired")
+            raise SchedulerOverloaded(f"Server busy: {priority.name.lower()} work waited {timeout:.0f}s") from None
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(priority)  # granted just as the caller went away
+            raise
+        finally:
+            if not waiter.future.done() or waiter.future.cancelled():
+                self._queued[priority] -= 1
+                self._dispatch()
+
+    def _can_run(self, priority: Priority) -> bool:
+        return sum(self._running.values()) < self.capacity and self._running[priority] < self.limits[priority]
+
+    def _grant(self, priority: Priority, waited: float):
+        self._running[priority] += 1
+        self._admitted[priority] += 1
+        self._waits[priority].append(waited)
+        SCHEDULER_WAIT_SECONDS.labels(priority.name.lower()).observe(waited)
+
+    def _reject(self, priority: Priority, reason: str):
+        self._rejected[priority][reason] += 1
+        SCHEDULER_REJECTED.labels(priority.name.lower(), reason).inc()
+
+    def _release(self, priority: Priority):
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Grants free slots to waiters in (class, deadline) order, skipping classes at their limit."""
+        blocked = []
+        now = asyncio.get_running_loop().time()
+        while self._heap and sum(self._running.values()) < self.capacity:
+            entry = heapq.heappop(self._heap)
+            waiter = entry[3]
+            if waiter.future.done():
+                continue  # timed out or cancelled; its queue count is already settled
+            if self._running[waiter.priority] >= self.limits[waiter.priority]:
+                blocked.append(entry)
+                continue
+            self._queued[waiter.priority] -= 1
+            waited = now - waiter.enqueued_at
+            self._grant(waiter.priority, waited)
+            waiter.future.set_result(waited)
+        for entry in blocked:
+            heapq.heappush(self._heap, entry)
+
+    def stats(self) -> dict:
+        classes = {}
+        for p in Priority:
+            waits = sorted(self._waits[p])
+            classes[p.name.lower()] = {
+                "limit": self.limits[p],
+                "running": self._running[p],
+                "queued": self._queued[p],
+                "admitted": self._admitted[p],
+                **self._rejected[p],
+                "wait_p50_ms": round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+                "wait_p95_ms": round(waits[int(len(waits) * 0.95)] * 1000, 1) if waits else 0.0,
+                "wait_max_ms": round(waits[-1] * 1000, 1) if waits else 0.0,
+            }
+        return {"enabled": self.enabled, "capacity": self.capacity, "classes": classes}
+
+scheduler = Scheduler()
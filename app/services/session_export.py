@@ -0,0 +1,118 @@
+"""Streaming export of completed interviews for analytics.
+
+Reads finished sessions from the session tables (``SESSION_STORE=sql``) and writes
+one row per answered question: session header columns plus the question, answer
+and scores. Rows are fetched and written in chunks, so memory stays flat however
+many sessions are exported. Parquet output needs ``pyarrow``.
+
+    python -m app.services.session_export --format jsonl --output data/sessions.jsonl
+    python -m app.services.session_export --format parquet --output data/sessions.parquet --since 1735689600
+"""
+from sqlalchemy import select
+from app.services.db import engine, create_tables
+from app.services.session_store import interview_sessions, session_turns
+from app.services.turn_record import TurnRecord
+import argparse
+import json
+import os
+import time
+
+FETCH_SIZE = 1000
+EXPORT_FORMATS = ("jsonl", "parquet")
+
+COLUMNS = (
+    "session_id", "start_time", "duration_seconds", "face_missing_seconds", "turn_index",
+    "question_text", "question_type", "difficulty", "answer",
+    "confidence_score", "clarity_score", "correctness_score", "feedback", "follow_up_needed",
+)
+
+def iter_export_rows(since: float = None, now: float = None):
+    """Yields lists of flat turn rows for sessions whose time is up, ordered by session and turn."""
+    now = now or time.time()
+    query = (
+        select(
+            interview_sessions.c.session_id, interview_sessions.c.start_time,
+            interview_sessions.c.duration_seconds, interview_sessions.c.face_missing_seconds,
+            session_turns.c.turn_index, session_turns.c.question, session_turns.c.answer, session_turns.c.evaluation,
+        )
+        .join(session_turns, session_turns.c.session_id == interview_sessions.c.session_id)
+        .where(interview_sessions.c.start_time + interview_sessions.c.duration_seconds <= now)
+        .order_by(interview_sessions.c.session_id, session_turns.c.turn_index)
+    )
+    if since is not None:
+        query = query.where(interview_sessions.c.start_time >= since)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query).mappings()
+        while rows := result.fetchmany(FETCH_SIZE):
+            yield [
+                {
+                    "session_id": row["session_id"],
+                    "start_time": row["start_time"],
+                    "duration_seconds": row["duration_seconds"],
+                    "face_missing_seconds": row["face_missing_seconds"],
+                    "turn_index": row["turn_index"],
+                    **TurnRecord.from_json(row["question"], row["answer"], row["evaluation"]).as_row(),
+                }
+                for row in rows
+            ]
+
+def write_jsonl(chunks, path: str) -> int:
+    count = 0
+    with open(path, "w") as out:
+        for rows in chunks:
+            out.writelines(json.dumps(row) + "\n" for row in rows)
+            count += len(rows)
+    return count
+
+def write_parquet(chunks, path: str) -> int:
+    """Writes each fetched chunk as its own row group."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)") from None
+
+    schema = pa.schema([
+        ("session_id", pa.string()), ("start_time", pa.float64()), ("duration_seconds", pa.float64()),
+        ("face_missing_seconds", pa.int32()), ("turn_index", pa.int32()),
+        ("question_text", pa.string()), ("question_type", pa.dictionary(pa.int8(), pa.string())),
+        ("difficulty", pa.dictionary(pa.int8(), pa.string())), ("answer", pa.string()),
+        ("confidence_score", pa.int8()), ("clarity_score", pa.int8()), ("correctness_score", pa.int8()),
+        ("feedback", pa.string()), ("follow_up_needed", pa.bool_()),
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in chunks:
+            columns = {name: [row[name] for row in rows] for name in COLUMNS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(rows)
+    return count
+
+def export_sessions(path: str, fmt: str = "jsonl", since: float = None) -> dict:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    create_tables([interview_sessions, session_turns])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    started = time.perf_counter()
+    # Written to a temporary name so readers never see a half-written file.
+    tmp = f"{path}.tmp"
+    writer = write_parquet if fmt == "parquet" else write_jsonl
+    try:
+        rows = writer(iter_export_rows(since), tmp)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return {"rows": rows, "format": fmt, "output": path, "seconds": round(time.perf_counter() - started, 2)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="data/sessions.jsonl")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--since", type=float, default=None, help="only sessions started at or after this unix time")
+    args = parser.parse_args()
+    print(json.dumps(export_sessions(args.output, args.format, args.since), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+from sqlalchemy import Table, Column, Integer, Float, String, Text, select, insert, update, delete
+from app.models.schemas import AgentPersona, Question, Evaluation
+from app.services.cache import LRUCache
+from app.services.turn_record import TurnRecord
+from app.services.db import engine, metadata, create_tables
+from app.services.executor import run_io
+from abc import ABC, abstractmethod
+import json
+import os
+import time
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "1000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(4 * 3600)))
+# SQL rows outlive the in-memory TTL so batch re-scoring and exports can still read
+# finished interviews; sessions idle for longer than this are deleted with their turns.
+SQL_SESSION_RETENTION_HOURS = float(os.getenv("SQL_SESSION_RETENTION_HOURS", str(30 * 24)))
+SESSION_GC_INTERVAL_SECONDS = 3600
+
+class SessionStoreFull(Exception):
+    """The per-process store holds SESSION_CACHE_SIZE live sessions; new ones are refused."""
+
+interview_sessions = Table(
+    "interview_sessions",
+    metadata,
+    Column("session_id", String(36), primary_key=True),
+    Column("agent_persona", Text, nullable=False),
+    Column("start_time", Float, nullable=False),
+    Column("duration_seconds", Float, nullable=False),
+    Column("current_question", Text),
+    Column("face_missing_seconds", Integer, nullable=False, default=0),
+    # ConversationMemory.state(), so a worker loading the session does not refold every turn.
+    Column("memory", Text),
+    Column("updated_at", Float, nullable=False),
+)
+
+# One row per answered question; rows are only ever appended.
+session_turns = Table(
+    "session_turns",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("session_id", String(36), nullable=False, index=True),
+    Column("turn_index", Integer, nullable=False),
+    Column("question", Text, nullable=False),
+    Column("answer", Text, nullable=False),
+    Column("evaluation", Text),
+)
+
+class SessionStore(ABC):
+    """Interface for interview session persistence.
+
+    ``create`` and ``save`` persist the session header (persona, timing, current
+    question, proctoring stats); ``append_turn`` adds one TurnRecord without
+    rewriting earlier ones; ``set_evaluation`` fills in a score computed after the
+    turn was appended. ``purge_expired`` removes sessions past their retention.
+    """
+
+    @abstractmethod
+    async def create(self, session):
+        ...
+
+    @abstractmethod
+    async def get(self, session_id: str):
+        ...
+
+    @abstractmethod
+    async def save(self, session):
+        ...
+
+    @abstractmethod
+    async def append_turn(self, session, turn: TurnRecord):
+        ...
+
+    @abstractmethod
+    async def set_evaluation(self, session, turn_index: int, evaluation: Evaluation):
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: str):
+        ...
+
+    async def purge_expired(self) -> int:
+        return 0
+
+    def ensure_capacity(self):
+        """Raises SessionStoreFull if a new session cannot be stored."""
+
+class MemorySessionStore(SessionStore):
+    """Per-process store with idle-TTL eviction. Only valid for a single worker.
+
+    Sessions are only dropped once idle for ``ttl``; when ``maxsize`` live sessions are
+    held, new ones are refused rather than evicting an interview in progress.
+    """
+
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE, ttl: float = SESSION_TTL_SECONDS):
+        self.maxsize = maxsize
+        self._sessions = LRUCache(maxsize, ttl=ttl)
+
+    def ensure_capacity(self):
+        if len(self._sessions) >= self.maxsize:
+            self._sessions.evict_expired()
+        if len(self._sessions) >= self.maxsize:
+            raise SessionStoreFull(f"Server busy: {self.maxsize} interviews in progress")
+
+    async def create(self, session):
+        self.ensure_capacity()
+        self._sessions.set(session.session_id, session)
+
+    async def get(self, session_id: str):
+        return self._sessions.get(session_id)
+
+    async def save(self, session):
+        self._sessions.set(session.session_id, session)
+
+    async def append_turn(self, session, turn: TurnRecord):
+        session.history.append(turn)
+        self._sessions.set(session.session_id, session)
+
+    async def set_evaluation(self, session, turn_index: int, evaluation: Evaluation):
+        session.history[turn_index]["evaluation"] = evaluation
+
+    async def delete(self, session_id: str):
+        self._sessions.pop(session_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+class SqlSessionStore(SessionStore):
+    """SQLAlchemy-backed store shared by every worker pointed at the same DATABASE_URL."""
+
+    def __init__(self, session_cls):
+        self.session_cls = session_cls
+        create_tables([interview_sessions, session_turns])
+
+    async def create(self, session):
+        await run_io(self._insert_session, session)
+
+    async def get(self, session_id: str):
+        return await run_io(self._load_session, session_id)
+
+    async def save(self, session):
+        await run_io(self._update_session, session)
+
+    async def append_turn(self, session, turn: TurnRecord):
+        session.history.append(turn)
+        await run_io(self._insert_turn, session.session_id, len(session.history) - 1, turn)
+
+    async def set_evaluation(self, session, turn_index: int, evaluation: Evaluation):
+        session.history[turn_index]["evaluation"] = evaluation
+        await run_io(self._update_evaluation, session.session_id, turn_index, evaluation)
+
+    async def delete(self, session_id: str):
+        await run_io(self._delete_session, session_id)
+
+    async def purge_expired(self, retention_seconds: float = SQL_SESSION_RETENTION_HOURS * 3600) -> int:
+        return await run_io(self._delete_idle_sessions, time.time() - retention_seconds)
+
+    def _header(self, session) -> dict:
+        return {
+            "current_question": session.current_question.model_dump_json() if session.current_question else None,
+            "face_missing_seconds": session.face_missing_seconds,
+            "memory": json.dumps(session.memory.state()),
+            "updated_at": time.time(),
+        }
+
+    def _insert_session(self, session):
+        with engine.begin() as conn:
+            conn.execute(insert(interview_sessions).values(
+                session_id=session.session_id,
+                agent_persona=session.agent_persona.model_dump_json(),
+                start_time=session.start_time,
+                duration_seconds=session.duration_seconds,
+                **self._header(session),
+            ))
+
+    def _update_session(self, session):
+        with engine.begin() as conn:
+            conn.execute(
+                update(interview_sessions)
+                .where(interview_sessions.c.session_id == session.session_id)
+                .values(**self._header(session))
+            )
+
+    def _insert_turn(self, session_id: str, turn_index: int, turn: TurnRecord):
+        with engine.begin() as conn:
+            conn.execute(insert(session_turns).values(
+                session_id=session_id,
+                turn_index=turn_index,
+                question=turn.question.model_dump_json(),
+                answer=turn.answer,
+                evaluation=turn.evaluation.model_dump_json() if turn.evaluation else None,
+            ))
+
+    def _update_evaluation(self, session_id: str, turn_index: int, evaluation: Evaluation):
+        with engine.begin() as conn:
+            conn.execute(
+                update(session_turns)
+                .where(session_turns.c.session_id == session_id, session_turns.c.turn_index == turn_index)
+                .values(evaluation=evaluation.model_dump_json())
+            )
+
+    def _load_session(self, session_id: str):
+        with engine.connect() as conn:
+            row = conn.execute(
+                select(interview_sessions).where(interview_sessions.c.session_id == session_id)
+            ).mappings().first()
+            if row is None:
+                return None
+            turns = conn.execute(
+                select(session_turns)
+                .where(session_turns.c.session_id == session_id)
+                .order_by(session_turns.c.turn_index)
+            ).mappings().all()
+
+        session = self.session_cls(session_id, AgentPersona.model_validate_json(row["agent_persona"]), 0)
+        session.start_time = row["start_time"]
+        session.duration_seconds = row["duration_seconds"]
+        session.face_missing_seconds = row["face_missing_seconds"]
+        if row["current_question"]:
+            session.current_question = Question.model_validate_json(row["current_question"])
+        session.history = [TurnRecord.from_json(turn["question"], turn["answer"], turn["evaluation"]) for turn in turns]
+        if row["memory"]:
+            session.restore_memory(json.loads(row["memory"]))
+        return session
+
+    def _delete_session(self, session_id: str):
+        with engine.begin() as conn:
+            conn.execute(delete(session_turns).where(session_turns.c.session_id == session_id))
+            conn.execute(delete(interview_sessions).where(interview_sessions.c.session_id == session_id))
+
+    def _delete_idle_sessions(self, cutoff: float) -> int:
+        expired = select(interview_sessions.c.session_id).where(interview_sessions.c.updated_at < cutoff)
+        with engine.begin() as conn:
+            conn.execute(delete(session_turns).where(session_turns.c.session_id.in_(expired)))
+            return conn.execute(delete(interview_sessions).where(interview_sessions.c.updated_at < cutoff)).rowcount
+
+def create_session_store(session_cls) -> SessionStore:
+    """Returns the backend selected by SESSION_STORE ("memory" or "sql")."""
+    if SESSION_STORE == "sql":
+        return SqlSessionStore(session_cls)
+    if SESSION_STORE == "memory":
+        return MemorySessionStore()
+    raise ValueError(f"Unknown SESSION_STORE: {SESSION_STORE}")
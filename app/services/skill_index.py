@@ -0,0 +1,223 @@
+"""Local skill normalization and JD x resume overlap scoring.
+
+Free-text skills ("Python 3", "k8s", "5+ years of AWS") are mapped to canonical
+names with an alias table, falling back to a token trie that finds known skills
+inside longer phrases. The skills the JDs ask for get column ids in a vocabulary
+so resumes can be stacked into a boolean matrix and scored against one or many
+JDs with NumPy instead of a Gemini call per candidate.
+"""
+from functools import lru_cache
+import re
+import numpy as np
+
+# alias -> canonical skill. Canonical names map to themselves implicitly.
+ALIASES = {
+    "python3": "python", "python 3": "python", "py": "python",
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "node": "node.js", "nodejs": "node.js", "node js": "node.js",
+    "react.js": "react", "reactjs": "react", "react js": "react",
+    "vue.js": "vue", "vuejs": "vue",
+    "angular.js": "angular", "angularjs": "angular",
+    "golang": "go",
+    "c sharp": "c#", "csharp": "c#",
+    "cpp": "c++", "c plus plus": "c++",
+    "postgres": "postgresql", "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes", "kube": "kubernetes",
+    "amazon web services": "aws", "gcp": "google cloud", "google cloud platform": "google cloud",
+    "azure cloud": "azure", "microsoft azure": "azure",
+    "ml": "machine learning", "dl": "deep learning", "ai": "artificial intelligence",
+    "nlp": "natural language processing", "cv": "computer vision",
+    "tf": "tensorflow", "pytorch": "pytorch", "torch": "pytorch",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "ci/cd": "ci/cd", "cicd": "ci/cd", "ci cd": "ci/cd", "continuous integration": "ci/cd",
+    "rest": "rest api", "restful": "rest api", "restful api": "rest api", "rest apis": "rest api",
+    "gql": "graphql",
+    "apache kafka": "kafka", "apache spark": "spark", "pyspark": "spark",
+    "docker compose": "docker",
+    "unix": "linux",
+    "oop": "object-oriented programming", "object oriented programming": "object-oriented programming",
+    "dsa": "data structures and algorithms", "algorithms": "data structures and algorithms",
+    "data structures": "data structures and algorithms",
+    "system design": "system design", "distributed systems": "distributed systems",
+    "communication skills": "communication", "team work": "teamwork", "team player": "teamwork",
+}
+CANONICAL_SKILLS = set(ALIASES.values()) | {
+    "java", "kotlin", "scala", "rust", "ruby", "php", "swift", "sql", "nosql", "mysql", "redis",
+    "elasticsearch", "terraform", "ansible", "git", "html", "css", "django", "flask", "fastapi",
+    "spring", "pandas", "numpy", "airflow", "snowflake", "tableau", "excel", "microservices",
+    "leadership", "agile", "scrum", "testing", "security", "networking", "bash",
+}
+
+# Too ambiguous to pick out of a longer phrase ("go to market", "rest of the team");
+# they still match when they are the whole skill.
+_EXACT_ONLY = {"go", "rest", "node", "spring", "swift", "excel", "cv", "ts", "tf", "py", "ai", "dl"}
+
+_TOKEN_SPLIT = re.compile(r"[\s,;:()\[\]|]+")
+
+def _tokens(text: str) -> list:
+    return [t.rstrip(".") for t in _TOKEN_SPLIT.split(text.lower()) if t.rstrip(".")]
+
+def _build_trie() -> dict:
+    trie = {}
+    for phrase in list(ALIASES) + list(CANONICAL_SKILLS):
+        if phrase in _EXACT_ONLY:
+            continue
+        node = trie
+        for token in _tokens(phrase):
+            node = node.setdefault(token, {})
+        node[None] = ALIASES.get(phrase, phrase)
+    return trie
+
+_TRIE = _build_trie()
+
+@lru_cache(maxsize=65536)
+def canonicalize(skill: str) -> tuple:
+    """Maps one free-text skill to canonical skill names (usually one)."""
+    tokens = _tokens(skill)
+    if not tokens:
+        return ()
+    phrase = " ".join(tokens)
+    if phrase in ALIASES:
+        return (ALIASES[phrase],)
+    if phrase in CANONICAL_SKILLS:
+        return (phrase,)
+
+    # Longest-match scan for known skills inside a longer phrase ("5+ years of AWS and k8s").
+    found = []
+    i = 0
+    while i < len(tokens):
+        node, match, end = _TRIE, None, i
+        for j in range(i, len(tokens)):
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            if None in node:
+                match, end = node[None], j + 1
+        if match:
+            if match not in found:
+                found.append(match)
+            i = end
+        else:
+            i += 1
+    return tuple(found) if found else (phrase,)
+
+def normalize_skills(skills: list) -> list:
+    """Canonical, de-duplicated skills in first-seen order."""
+    seen = {}
+    for skill in skills or []:
+        for name in canonicalize(skill):
+            seen.setdefault(name, None)
+    return list(seen)
+
+class SkillVocabulary:
+    """Canonical skill -> column id; unseen skills are added on first use."""
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    @classmethod
+    def from_jds(cls, jd_skill_lists: list) -> "SkillVocabulary":
+        """Vocabulary of the skills the given JDs ask for; nothing else can affect a score."""
+        vocabulary = cls()
+        for skills in jd_skill_lists:
+            vocabulary.columns(skills)
+        return vocabulary
+
+    def id(self, name: str, add: bool = True) -> int:
+        column = self.ids.get(name)
+        if column is None and add:
+            column = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return column
+
+    def columns(self, skills: list, add: bool = True) -> list:
+        columns = (self.id(name, add) for name in normalize_skills(skills))
+        return [c for c in columns if c is not None]
+
+class ResumeMatrix:
+    """Boolean resume x skill matrix for bulk scoring against job descriptions.
+
+    Columns are the JD vocabulary only: resume skills no JD asks for are dropped,
+    so the matrix stays n x (JD skills) however varied the resumes are.
+    """
+
+    # Rows converted to float32 at a time in ``overlap``.
+    OVERLAP_CHUNK_ROWS = 65536
+
+    def __init__(self, resume_skills: list, vocabulary: SkillVocabulary):
+        self.vocabulary = vocabulary
+        rows, cols = [], []
+        for row, skills in enumerate(resume_skills):
+            columns = self.vocabulary.columns(skills, add=False)
+            rows.extend([row] * len(columns))
+            cols.extend(columns)
+        self.matrix = np.zeros((len(resume_skills), len(self.vocabulary.names)), dtype=bool)
+        self.matrix[np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)] = True
+
+    @classmethod
+    def for_jds(cls, resume_skills: list, jd_skill_lists: list) -> "ResumeMatrix":
+        return cls(resume_skills, SkillVocabulary.from_jds(jd_skill_lists))
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def jd_vector(self, jd_skills: list) -> tuple:
+        """(column ids of JD skills known to the matrix, number of distinct JD skills)."""
+        names = normalize_skills(jd_skills)
+        columns = [c for c in (self.vocabulary.id(n, add=False) for n in names) if c is not None and c < self.matrix.shape[1]]
+        return np.asarray(columns, dtype=np.intp), len(names)
+
+    def scores(self, jd_skills: list) -> np.ndarray:
+        """Fraction of the JD's skills present on each resume."""
+        columns, total = self.jd_vector(jd_skills)
+        if not total:
+            return np.zeros(len(self), dtype=np.float32)
+        return self.matrix[:, columns].sum(axis=1, dtype=np.float32) / total
+
+    def overlap(self, jd_skill_lists: list) -> np.ndarray:
+        """JD x resume matrix of matched-skill counts for several JDs at once."""
+        jds = np.zeros((len(jd_skill_lists), self.matrix.shape[1]), dtype=np.float32)
+        for row, skills in enumerate(jd_skill_lists):
+            jds[row, self.jd_vector(skills)[0]] = 1.0
+        result = np.empty((len(jd_skill_lists), len(self)), dtype=np.float32)
+        # BLAS needs floats; converting in chunks keeps the copy bounded.
+        for start in range(0, len(self), self.OVERLAP_CHUNK_ROWS):
+            chunk = self.matrix[start:start + self.OVERLAP_CHUNK_ROWS]
+            np.matmul(jds, chunk.T.astype(np.float32), out=result[:, start:start + len(chunk)])
+        return result
+
+    def rank(self, jd_skills: list, top_k: int = 50) -> list:
+        """Top resumes as (row, score) pairs, best first; ties keep input order."""
+        scores = self.scores(jd_skills)
+        top_k = min(top_k, len(scores))
+        if not top_k:
+            return []
+        # Everything tied with the k-th best score is a candidate, so the cut at
+        # the boundary falls on input order rather than on partition order.
+        kth = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        candidates = np.flatnonzero(scores >= kth)
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:top_k]]
+        return [(int(row), float(scores[row])) for row in top]
+
+def match_skills(jd_skills: list, resume_skills: list) -> dict:
+    """Matched and missing JD skills for one candidate, in the JD's order."""
+    have = set(normalize_skills(resume_skills))
+    required = normalize_skills(jd_skills)
+    matched = [s for s in required if s in have]
+    return {
+        "score": round(len(matched) / len(required), 3) if required else 0.0,
+        "matched": matched,
+        "missing": [s for s in required if s not in have],
+    }
+
+def rank_candidates(jd_skills: list, resume_skills: list, top_k: int = 50) -> list:
+    """Ranks resumes (lists of skills) against a JD; returns the top_k with matched/missing skills."""
+    matrix = ResumeMatrix.for_jds(resume_skills, [jd_skills])
+    results = []
+    for row, score in matrix.rank(jd_skills, top_k):
+        match = match_skills(jd_skills, resume_skills[row])
+        results.append({"index": row, "score": round(score, 3), "matched": match["matched"], "missing": match["missing"]})
+    return results
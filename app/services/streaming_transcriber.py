@@ -0,0 +1,98 @@
+from app.services.whisper_service import transcribe_array
+import asyncio
+import numpy as np
+import os
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = SAMPLE_RATE * 30 // 1000  # 30 ms VAD frames
+
+STREAM_SILENCE_RMS = float(os.getenv("STREAM_SILENCE_RMS", "0.01"))
+STREAM_MIN_PAUSE_MS = int(os.getenv("STREAM_MIN_PAUSE_MS", "600"))
+STREAM_MIN_SEGMENT_SECONDS = float(os.getenv("STREAM_MIN_SEGMENT_SECONDS", "2"))
+STREAM_MAX_SEGMENT_SECONDS = float(os.getenv("STREAM_MAX_SEGMENT_SECONDS", "20"))
+STREAM_PROMPT_CHARS = 200
+
+class StreamingTranscriber:
+    """Transcribes an answer incrementally while the candidate is still speaking.
+
+    Audio arrives as 16 kHz mono int16 PCM. An energy VAD cuts the stream at natural
+    pauses (or at STREAM_MAX_SEGMENT_SECONDS) and each segment is sent to the
+    transcription worker, conditioned on the text recognised so far. Segments are transcribed in
+    order, so when the candidate stops only the last segment is still outstanding.
+    """
+
+    def __init__(self, on_text=None):
+        self.on_text = on_text
+        self._pending = np.zeros(0, dtype=np.int16)  # samples not yet framed
+        self._frames = []
+        self._segment_samples = 0
+        self._trailing_silence = 0
+        self._has_speech = False
+        self._texts = []
+        self._tail = None
+        self._tasks = []
+
+    def feed(self, pcm: bytes):
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if self._pending.size:
+            samples = np.concatenate([self._pending, samples])
+        usable = samples.size - samples.size % FRAME_SAMPLES
+        self._pending = samples[usable:].copy()
+        if not usable:
+            return
+
+        frames = samples[:usable].astype(np.float32).reshape(-1, FRAME_SAMPLES) / 32768.0
+        voiced = np.sqrt(np.mean(frames ** 2, axis=1)) > STREAM_SILENCE_RMS
+        min_pause_frames = STREAM_MIN_PAUSE_MS // 30
+        for frame, is_voiced in zip(frames, voiced):
+            self._frames.append(frame)
+            self._segment_samples += FRAME_SAMPLES
+            if is_voiced:
+                self._has_speech = True
+                self._trailing_silence = 0
+            else:
+                self._trailing_silence += 1
+
+            seconds = self._segment_samples / SAMPLE_RATE
+            at_pause = self._trailing_silence >= min_pause_frames and seconds >= STREAM_MIN_SEGMENT_SECONDS
+            if (self._has_speech and at_pause) or seconds >= STREAM_MAX_SEGMENT_SECONDS:
+                self._cut_segment()
+
+    async def finish(self) -> str:
+        """Flushes the final segment and returns the full transcript."""
+        if self._pending.size:
+            self._frames.append(self._pending.astype(np.float32) / 32768.0)
+            self._pending = np.zeros(0, dtype=np.int16)
+        self._cut_segment()
+        if self._tail is not None:
+            await self._tail
+        return " ".join(text.strip() for text in self._texts if text.strip())
+
+    async def close(self):
+        """Cancels segments still being transcribed, e.g. when the socket drops mid-answer."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._tail = None
+
+    def _cut_segment(self):
+        frames, has_speech = self._frames, self._has_speech
+        self._frames = []
+        self._segment_samples = 0
+        self._trailing_silence = 0
+        self._has_speech = False
+        if not frames or not has_speech:
+            return
+        audio = np.concatenate(frames)
+        self._tail = asyncio.ensure_future(self._transcribe_after(self._tail, audio))
+        self._tasks.append(self._tail)
+
+    async def _transcribe_after(self, previous, audio: np.ndarray):
+        if previous is not None:
+            await previous
+        prompt = " ".join(self._texts)[-STREAM_PROMPT_CHARS:]
+        text = await transcribe_array(audio, prompt)
+        self._texts.append(text)
+        if self.on_text:
+            await self.on_text(" ".join(t.strip() for t in self._texts if t.strip()))
@@ -0,0 +1,27 @@
+from contextvars import ContextVar
+import logging
+import os
+import uuid
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Set per HTTP request / WebSocket by the middleware in main.py; tasks spawned while
+# handling the request inherit it.
+trace_id_var = ContextVar("trace_id", default="-")
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id_var.get()
+        return True
+
+def configure_logging():
+    handler = logging.StreamHandler()
+    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(trace_id)s] %(name)s: %(message)s"))
+    root = logging.getLogger("app")
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(handler)
+    root.propagate = False
@@ -0,0 +1,159 @@
+from app.services.executor import run_cpu
+from app.services.scheduler import Priority, current_priority
+import asyncio
+import time
+import numpy as np
+
+# whisper/torch are imported inside the methods that need them so that importing
+# this module stays cheap; they are loaded when the first replica starts.
+SAMPLE_RATE = 16000
+N_SAMPLES = 30 * SAMPLE_RATE  # Whisper's fixed 30-second input window
+WARMUP_SECONDS = 1
+
+class TranscriptionJob:
+    def __init__(self, audio: np.ndarray, prompt: str, future: asyncio.Future):
+        self.audio = audio
+        self.prompt = prompt
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+class TranscriptionWorker:
+    """Queue in front of one or more Whisper replicas with dynamic micro-batching.
+
+    Each replica pulls a job, then keeps collecting queued jobs for up to
+    ``batch_wait_ms`` (or until ``max_batch`` is reached) and decodes them together.
+    Clips of at most 30 seconds without a text prompt are stacked into one batched
+    ``whisper.decode`` call; longer or prompted clips fall back to ``transcribe``.
+    """
+
+    def __init__(self, model_name: str = "base", device: str = None, compute_type: str = "float32",
+                 replicas: int = 1, max_batch: int = 8, batch_wait_ms: float = 20):
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+        self.replicas = replicas
+        self.max_batch = max_batch
+        self.batch_wait_ms = batch_wait_ms
+        self._queue = None
+        self._models = []
+        self._consumers = []
+        self._start_lock = None
+        self.jobs = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.audio_seconds = 0.0
+        self.compute_seconds = 0.0
+        self.queue_wait_seconds = 0.0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._consumers)
+
+    async def start(self):
+        """Loads every replica, warms it up and starts the batching loops."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            self._queue = asyncio.Queue()
+            for _ in range(self.replicas):
+                model = await run_cpu(self._load_model)
+                await run_cpu(self._warm_up, model)
+                self._models.append(model)
+            self._consumers = [asyncio.create_task(self._consume(model)) for model in self._models]
+
+    async def stop(self):
+        for task in self._consumers:
+            task.cancel()
+        self._consumers = []
+
+    async def transcribe(self, audio: np.ndarray, prompt: str = None) -> str:
+        if not self.started:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(TranscriptionJob(audio, prompt, future))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "compute_type": self.compute_type,
+            "replicas": len(self._models),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "jobs": self.jobs,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": round(self.jobs / self.batches, 2) if self.batches else 0.0,
+            "avg_queue_wait_seconds": round(self.queue_wait_seconds / self.jobs, 4) if self.jobs else 0.0,
+            "real_time_factor": round(self.compute_seconds / self.audio_seconds, 4) if self.audio_seconds else 0.0,
+        }
+
+    def _load_model(self):
+        import torch
+        import whisper
+        model = whisper.load_model(self.model_name, device=self.device)
+        if self.compute_type == "int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def _warm_up(self, model):
+        model.transcribe(np.zeros(SAMPLE_RATE * WARMUP_SECONDS, dtype=np.float32), fp16=self._fp16)
+
+    @property
+    def _fp16(self) -> bool:
+        return self.compute_type == "float16"
+
+    async def _consume(self, model):
+        loop = asyncio.get_running_loop()
+        current_priority.set(Priority.LIVE_TURN)  # only live turns send audio
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            started = time.perf_counter()
+            for job in batch:
+                self.queue_wait_seconds += started - job.enqueued_at
+            try:
+                texts = await run_cpu(self._run_batch, model, batch)
+            except Exception as e:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                continue
+
+            self.compute_seconds += time.perf_counter() - started
+            self.audio_seconds += sum(len(job.audio) for job in batch) / SAMPLE_RATE
+            self.jobs += len(batch)
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            for job, text in zip(batch, texts):
+                if not job.future.done():
+                    job.future.set_result(text)
+
+    def _run_batch(self, model, batch) -> list:
+        import torch
+        import whisper
+        texts = [None] * len(batch)
+        batchable = [i for i, job in enumerate(batch)
+                     if job.prompt is None and len(job.audio) <= N_SAMPLES]
+        if len(batchable) > 1:
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(batch[i].audio), model.dims.n_mels)
+                for i in batchable
+            ]).to(model.device)
+            results = whisper.decode(model, mel, whisper.DecodingOptions(fp16=self._fp16, without_timestamps=True))
+            for i, result in zip(batchable, results):
+                texts[i] = result.text
+        for i, job in enumerate(batch):
+            if texts[i] is None:
+                texts[i] = model.transcribe(job.audio, initial_prompt=job.prompt, fp16=self._fp16)["text"]
+        return texts
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Optional
+from app.models.schemas import Question, Evaluation
+import json
+import sys
+
+@dataclass(slots=True)
+class TurnRecord:
+    """One answered question, stored flat instead of as a dict of pydantic models.
+
+    Question type and difficulty come from a handful of values and are interned, and
+    scores are plain small ints. ``turn["question"]``, ``turn["answer"]`` and
+    ``turn["evaluation"]`` still work (and ``turn.question`` in templates); the
+    models are rebuilt without validation on access.
+    """
+    question_text: str
+    question_type: str
+    difficulty: str
+    reason: str
+    answer: str
+    confidence_score: Optional[int] = None
+    clarity_score: Optional[int] = None
+    correctness_score: Optional[int] = None
+    feedback: Optional[str] = None
+    follow_up_needed: Optional[bool] = None
+
+    @classmethod
+    def from_parts(cls, question: Question, answer: str, evaluation: Evaluation = None) -> "TurnRecord":
+        turn = cls(
+            question_text=question.question_text,
+            question_type=sys.intern(question.question_type),
+            difficulty=sys.intern(question.difficulty),
+            reason=question.reason,
+            answer=answer,
+        )
+        turn.evaluation = evaluation
+        return turn
+
+    @classmethod
+    def from_json(cls, question_json: str, answer: str, evaluation_json: str = None) -> "TurnRecord":
+        """Builds a record from the session_turns columns without going through pydantic."""
+        question = json.loads(question_json)
+        turn = cls(
+            question_text=question["question_text"],
+            question_type=sys.intern(question["question_type"]),
+            difficulty=sys.intern(question["difficulty"]),
+            reason=question["reason"],
+            answer=answer,
+        )
+        if evaluation_json:
+            turn._set_scores(json.loads(evaluation_json))
+        return turn
+
+    @property
+    def question(self) -> Question:
+        return Question.model_construct(
+            question_text=self.question_text,
+            question_type=self.question_type,
+            reason=self.reason,
+            difficulty=self.difficulty,
+        )
+
+    @property
+    def evaluation(self) -> Optional[Evaluation]:
+        if self.confidence_score is None:
+            return None
+        return Evaluation.model_construct(
+            confidence_score=self.confidence_score,
+            clarity_score=self.clarity_score,
+            correctness_score=self.correctness_score,
+            feedback=self.feedback,
+            follow_up_needed=self.follow_up_needed,
+        )
+
+    @evaluation.setter
+    def evaluation(self, evaluation: Optional[Evaluation]):
+        if evaluation is None:
+            self.confidence_score = self.clarity_score = self.correctness_score = None
+            self.feedback = self.follow_up_needed = None
+        else:
+            self._set_scores(evaluation.model_dump())
+
+    def _set_scores(self, data: dict):
+        self.confidence_score = data["confidence_score"]
+        self.clarity_score = data["clarity_score"]
+        self.correctness_score = data["correctness_score"]
+        self.feedback = data["feedback"]
+        self.follow_up_needed = data["follow_up_needed"]
+
+    def __getitem__(self, key: str):
+        if key not in ("question", "answer", "evaluation"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key != "evaluation":
+            raise KeyError(key)
+        self.evaluation = value
+
+    def as_row(self) -> dict:
+        """Flat column dict used by the exporters."""
+        return {
+            "question_text": self.question_text,
+            "question_type": self.question_type,
+            "difficulty": self.difficulty,
+            "answer": self.answer,
+            "confidence_score": self.confidence_score,
+            "clarity_score": self.clarity_score,
+            "correctness_score": self.correctness_score,
+            "feedback": self.feedback,
+            "follow_up_needed": self.follow_up_needed,
+        }
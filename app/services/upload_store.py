@@ -0,0 +1,181 @@
+from fastapi import HTTPException, UploadFile
+from app.services.executor import run_io
+import aiofiles
+import aiofiles.os
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+
+UPLOAD_DIR = "data/uploads"
+CHUNK_SIZE = 1024 * 1024
+
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+MAX_AUDIO_BYTES = int(os.getenv("MAX_AUDIO_BYTES", str(25 * 1024 * 1024)))
+# PDFs up to this size are parsed straight from memory and never touch the disk.
+IN_MEMORY_PDF_BYTES = int(os.getenv("IN_MEMORY_PDF_BYTES", str(2 * 1024 * 1024)))
+# Audio answers up to this size are piped to ffmpeg from memory.
+IN_MEMORY_AUDIO_BYTES = int(os.getenv("IN_MEMORY_AUDIO_BYTES", str(8 * 1024 * 1024)))
+UPLOAD_RETENTION_HOURS = float(os.getenv("UPLOAD_RETENTION_HOURS", "24"))
+UPLOAD_GC_INTERVAL_SECONDS = 3600
+# Multipart boundaries, part headers and small form fields on top of the file bytes.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+class StoredUpload:
+    """An uploaded file, held either in memory (``data``) or on disk (``path``)."""
+
+    def __init__(self, digest: str, size: int, path: str = None, data: bytes = None):
+        self.digest = digest
+        self.size = size
+        self.path = path
+        self.data = data
+
+    @property
+    def source(self):
+        return self.data if self.data is not None else self.path
+
+async def receive_upload(file: UploadFile, kind: str, max_bytes: int, memory_limit: int = 0) -> StoredUpload:
+    """Streams an upload to a unique path while hashing it, rejecting it once it exceeds max_bytes.
+
+    Uploads no larger than memory_limit are kept in memory instead of being written.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte limit")
+
+    digest = hashlib.sha256()
+    buffered = []
+    size = 0
+    path = None
+    out = None
+    try:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte limit")
+            digest.update(chunk)
+            if out is None and size <= memory_limit:
+                buffered.append(chunk)
+                continue
+            if out is None:
+                path = _new_path(kind, file.filename)
+                out = await aiofiles.open(path, "wb")
+                for pending in buffered:
+                    await out.write(pending)
+                buffered = []
+            await out.write(chunk)
+    except BaseException:
+        if out is not None:
+            await out.close()
+            await aiofiles.os.remove(path)
+        raise
+    if size == 0:
+        raise HTTPException(status_code=400, detail="File is empty")
+    if out is not None:
+        await out.close()
+        return StoredUpload(digest.hexdigest(), size, path=path)
+    if memory_limit:
+        return StoredUpload(digest.hexdigest(), size, data=b"".join(buffered))
+
+    # Caller asked for a file on disk even for small uploads (memory_limit=0)
+    path = _new_path(kind, file.filename)
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(b"".join(buffered))
+    return StoredUpload(digest.hexdigest(), size, path=path)
+
+class UploadSizeLimitMiddleware:
+    """Rejects oversized request bodies before they are parsed.
+
+    Starlette reads a whole multipart body into a spooled temporary file before the
+    route runs, so the per-file checks in receive_upload only fire after the bytes
+    were stored. This ASGI middleware answers 413 up front when Content-Length is
+    over the route's limit, and stops reading a body (chunked or lying about its
+    length) as soon as it passes the limit. ``limits`` is a list of (path regex, bytes).
+    """
+
+    def __init__(self, app, limits: list):
+        self.app = app
+        self.limits = [(re.compile(pattern), max_bytes + MULTIPART_OVERHEAD_BYTES) for pattern, max_bytes in limits]
+
+    async def __call__(self, scope, receive, send):
+        limit = self._limit(scope)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces through FastAPI's body parsing as a 413 response.
+                    raise HTTPException(status_code=413, detail=f"Request body exceeds the {limit} byte limit")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _limit(self, scope):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            return None
+        for pattern, limit in self.limits:
+            if pattern.match(scope["path"]):
+                return limit
+        return None
+
+    async def _reject(self, send, limit: int):
+        body = f'{{"detail":"Request body exceeds the {limit} byte limit"}}'.encode()
+        await send({"type": "http.response.start", "status": 413, "headers": [
+            (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), (b"connection", b"close"),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+async def discard(upload: StoredUpload):
+    """Deletes the upload's file once it has been processed."""
+    if upload.path:
+        try:
+            await aiofiles.os.remove(upload.path)
+        except FileNotFoundError:
+            pass
+
+def collect_garbage(retention_seconds: float = UPLOAD_RETENTION_HOURS * 3600) -> int:
+    """Removes uploads older than the retention period, e.g. left behind by a crash."""
+    cutoff = time.time() - retention_seconds
+    removed = 0
+    for root, _, files in os.walk(UPLOAD_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+async def gc_loop():
+    while True:
+        try:
+            await run_io(collect_garbage)
+        except Exception:
+            logger.exception("Upload retention sweep failed")
+        await asyncio.sleep(UPLOAD_GC_INTERVAL_SECONDS)
+
+def _new_path(kind: str, filename: str) -> str:
+    directory = os.path.join(UPLOAD_DIR, kind)
+    os.makedirs(directory, exist_ok=True)
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not ext[1:].isalnum() or len(ext) > 8:
+        ext = ""
+    return os.path.join(directory, f"{uuid.uuid4().hex}{ext}")
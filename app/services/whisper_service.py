@@ -1,10 +1,57 @@
-import whisper
+from app.services.executor import run_cpu
+from app.services.transcription_worker import TranscriptionWorker
+from app.services.metrics import observe_stage, TRANSCRIPTION_QUEUE_DEPTH
+from app.services.audio_preprocessing import decode_audio, preprocess
+from typing import Optional, Union
+import numpy as np
 import os
 
-# Load model once at startup (or lazily)
-model = whisper.load_model("base")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE") or None
+# float32 | float16 (GPU only) | int8 (dynamic quantization, CPU only)
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "float32")
+WHISPER_REPLICAS = int(os.getenv("WHISPER_REPLICAS", "1"))
+WHISPER_MAX_BATCH = int(os.getenv("WHISPER_MAX_BATCH", "8"))
+WHISPER_BATCH_WAIT_MS = float(os.getenv("WHISPER_BATCH_WAIT_MS", "20"))
+# "fake" keeps the queue and batching but replaces Whisper with canned transcripts.
+ASR_BACKEND = os.getenv("ASR_BACKEND", "whisper")
 
-def transcribe_audio(file_path: str) -> str:
-    """Transcribes audio file using local Whisper model."""
-    result = model.transcribe(file_path)
-    return result["text"]
+if ASR_BACKEND == "fake":
+    from app.services.fake_backends import FakeTranscriptionWorker as TranscriptionWorker
+
+worker = TranscriptionWorker(
+    model_name=WHISPER_MODEL,
+    device=WHISPER_DEVICE,
+    compute_type=WHISPER_COMPUTE_TYPE,
+    replicas=WHISPER_REPLICAS,
+    max_batch=WHISPER_MAX_BATCH,
+    batch_wait_ms=WHISPER_BATCH_WAIT_MS,
+)
+TRANSCRIPTION_QUEUE_DEPTH.set_function(lambda: worker.stats()["queue_depth"])
+
+async def transcribe_audio(source: Union[str, bytes]) -> str:
+    """Transcribes an audio file path or encoded bytes using local Whisper model.
+
+    Returns "" without touching Whisper when the clip has no speech.
+    """
+    with observe_stage("transcribe"):
+        audio = await run_cpu(load_audio, source)
+        if audio is None:
+            return ""
+        return await worker.transcribe(audio)
+
+async def transcribe_array(audio: np.ndarray, prompt: str = None) -> str:
+    """Transcribes 16 kHz mono float32 samples, optionally conditioned on preceding text.
+
+    Used for streamed segments, so the minimum-speech check for whole clips is skipped.
+    """
+    with observe_stage("transcribe_segment"):
+        audio = await run_cpu(preprocess, audio, 0)
+        return await worker.transcribe(audio, prompt or None)
+
+def load_audio(source: Union[str, bytes]) -> Optional[np.ndarray]:
+    """Decodes to 16 kHz mono float32 samples with silence trimmed; None if there is no speech."""
+    if ASR_BACKEND == "fake":
+        from app.services import fake_backends
+        return fake_backends.load_audio(source)
+    return preprocess(decode_audio(source))
@@ -0,0 +1,81 @@
+"""Load benchmark for concurrent answer submissions.
+
+Starts N interview sessions against a running server and submits one audio answer
+per session at the same time, then prints p50/p99 latency for
+``POST /api/v1/session/{id}/audio``. Run it once against the old build and once
+against the new one to compare.
+
+    uvicorn main:app &
+    python benchmarks/bench_audio_latency.py --url http://localhost:8000 --concurrency 16
+"""
+import argparse
+import asyncio
+import io
+import math
+import struct
+import time
+import wave
+
+import httpx
+
+from stats import percentile
+
+PERSONA = {
+    "agent_id": "bench-agent",
+    "system_prompt": "You are a friendly but rigorous backend engineering interviewer.",
+    "initial_greeting": "Hello, let's start the interview.",
+    "topics_to_evaluate": ["Python", "System Design", "Databases"],
+}
+
+def make_wav(seconds: float = 3.0, rate: int = 16000) -> bytes:
+    """Builds a short mono 16-bit tone so Whisper has something to decode."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        frames = b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / rate)))
+            for i in range(int(seconds * rate))
+        )
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+async def submit(client: httpx.AsyncClient, session_id: str, audio: bytes) -> float:
+    start = time.perf_counter()
+    response = await client.post(
+        f"/api/v1/session/{session_id}/audio",
+        files={"file": ("answer.wav", audio, "audio/wav")},
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+async def main(url: str, concurrency: int, seconds: float):
+    audio = make_wav(seconds)
+    async with httpx.AsyncClient(base_url=url, timeout=600) as client:
+        session_ids = []
+        for _ in range(concurrency):
+            response = await client.post(
+                "/api/v1/session/start",
+                json={"agent_persona": PERSONA, "duration_minutes": 30},
+            )
+            response.raise_for_status()
+            session_ids.append(response.json()["session_id"])
+
+        wall_start = time.perf_counter()
+        latencies = await asyncio.gather(*(submit(client, sid, audio) for sid in session_ids))
+        wall = time.perf_counter() - wall_start
+
+    print(f"requests:   {len(latencies)}")
+    print(f"wall time:  {wall:.2f}s")
+    print(f"p50:        {percentile(latencies, 50):.2f}s")
+    print(f"p99:        {percentile(latencies, 99):.2f}s")
+    print(f"max:        {max(latencies):.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0, help="length of each audio answer")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.concurrency, args.seconds))
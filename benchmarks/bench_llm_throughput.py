@@ -0,0 +1,45 @@
+"""Throughput benchmark for the async Gemini client against the fake server.
+
+Simulates N concurrent interviews, each making a number of sequential
+``agenerate_json`` calls, and reports calls/sec and per-call latency.
+
+    uvicorn benchmarks.fake_gemini_server:app --port 8001 &
+    python benchmarks/bench_llm_throughput.py --interviews 100 --turns 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats import percentile
+
+async def interview(index: int, turns: int, latencies: list):
+    from app.services.llm_client import agenerate_json
+    for turn in range(turns):
+        start = time.perf_counter()
+        await agenerate_json(f"interview {index} turn {turn}: generate the next question")
+        latencies.append(time.perf_counter() - start)
+
+async def main(interviews: int, turns: int):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(interview(i, turns, latencies) for i in range(interviews)))
+    wall = time.perf_counter() - start
+    print(f"calls:       {len(latencies)}")
+    print(f"throughput:  {len(latencies) / wall:.1f} calls/s")
+    print(f"p50 latency: {percentile(latencies, 50) * 1000:.0f} ms")
+    print(f"p99 latency: {percentile(latencies, 99) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="http://localhost:8001")
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+    os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+    os.environ["GEMINI_API_ENDPOINT"] = args.endpoint
+    os.environ["GEMINI_TRANSPORT"] = "rest"
+    asyncio.run(main(args.interviews, args.turns))
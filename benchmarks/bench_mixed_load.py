@@ -0,0 +1,142 @@
+"""Live-turn latency with and without background load.
+
+A fixed set of candidates answer questions continuously. The first phase runs
+them alone. The second phase adds report workers, which run a short interview
+each and download its PDF, and onboarding workers that build personas from
+unseen documents. Live-turn p50/p95/p99 are printed for both phases, together
+with the scheduler's per-class queue waits from /stats.
+
+Run it twice to see what the scheduler buys:
+
+    LLM_BACKEND=fake ASR_BACKEND=fake SCHEDULER_ENABLED=1 uvicorn main:app &
+    python benchmarks/bench_mixed_load.py --live 16 --reports 16 --onboarding 4 --seconds 60
+    # restart with SCHEDULER_ENABLED=0 and run again
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import make_pdf, make_wav
+from stats import percentile
+
+def documents() -> tuple:
+    tag = uuid.uuid4().hex[:8]
+    jd = make_pdf([f"Backend Engineer {tag}", "Requirements", "Python, SQL, Kafka", "Responsibilities", "Build pipelines"])
+    resume = make_pdf([f"Candidate {tag}", "Skills", "Python, SQL", "Experience", "Five years of backend work"])
+    return jd, resume
+
+async def build_persona(client: httpx.AsyncClient) -> dict:
+    jd, resume = documents()
+    response = await client.post("/api/v1/agent/build", files={
+        "jd": ("jd.pdf", jd, "application/pdf"),
+        "resume": ("resume.pdf", resume, "application/pdf"),
+    })
+    response.raise_for_status()
+    return response.json()
+
+async def start(client: httpx.AsyncClient, persona: dict, minutes: int) -> str:
+    response = await client.post("/api/v1/session/start", json={"agent_persona": persona, "duration_minutes": minutes})
+    response.raise_for_status()
+    return response.json()["session_id"]
+
+class Counts:
+    def __init__(self):
+        self.done = 0
+        self.shed = 0
+        self.errors = 0
+
+    def record(self, response: httpx.Response):
+        if response.status_code == 503:
+            self.shed += 1
+        elif response.is_success:
+            self.done += 1
+        else:
+            self.errors += 1
+
+async def live_candidate(client, session_id: str, audio: bytes, stop: float, think: float, latencies: list, counts: Counts):
+    while time.perf_counter() < stop:
+        started = time.perf_counter()
+        response = await client.post(f"/api/v1/session/{session_id}/audio",
+                                     files={"file": ("answer.wav", audio, "audio/wav")})
+        counts.record(response)
+        if response.is_success:
+            latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(think)
+
+async def report_worker(client, persona: dict, audio: bytes, stop: float, answers: int, counts: Counts):
+    while time.perf_counter() < stop:
+        try:
+            session_id = await start(client, persona, 30)
+            for _ in range(answers):
+                await client.post(f"/api/v1/session/{session_id}/audio", files={"file": ("answer.wav", audio, "audio/wav")})
+            await client.post(f"/api/v1/session/{session_id}/end", json={"face_missing_seconds": 0})
+            counts.record(await client.get(f"/api/v1/session/{session_id}/final"))
+        except httpx.HTTPError:
+            counts.errors += 1
+
+async def onboarding_worker(client, stop: float, counts: Counts):
+    while time.perf_counter() < stop:
+        jd, resume = documents()
+        counts.record(await client.post("/api/v1/agent/build", files={
+            "jd": ("jd.pdf", jd, "application/pdf"),
+            "resume": ("resume.pdf", resume, "application/pdf"),
+        }))
+
+async def phase(client, args, persona: dict, audio: bytes, mixed: bool) -> dict:
+    sessions = await asyncio.gather(*(start(client, persona, args.duration_minutes) for _ in range(args.live)))
+    stop = time.perf_counter() + args.seconds
+    latencies, live, reports, onboarding = [], Counts(), Counts(), Counts()
+    tasks = [live_candidate(client, sid, audio, stop, args.think_seconds, latencies, live) for sid in sessions]
+    if mixed:
+        tasks += [report_worker(client, persona, audio, stop, args.report_answers, reports) for _ in range(args.reports)]
+        tasks += [onboarding_worker(client, stop, onboarding) for _ in range(args.onboarding)]
+    await asyncio.gather(*tasks)
+    result = {"live_turns": live.done, "live_shed": live.shed, "live_errors": live.errors}
+    if latencies:
+        result.update({f"live_p{p}_ms": round(percentile(latencies, p) * 1000, 1) for p in (50, 95, 99)})
+    if mixed:
+        result.update({"reports": reports.done, "reports_shed": reports.shed,
+                       "onboardings": onboarding.done, "onboardings_shed": onboarding.shed})
+    return result
+
+async def run(args):
+    audio = make_wav(args.answer_seconds)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        persona = await build_persona(client)
+        alone = await phase(client, args, persona, audio, mixed=False)
+        mixed = await phase(client, args, persona, audio, mixed=True)
+        stats = (await client.get("/stats")).json().get("scheduler", {})
+
+    print(f"scheduler enabled: {stats.get('enabled')}")
+    print(f"{'phase':<10} {'turns':>6} {'shed':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, result in (("alone", alone), ("mixed", mixed)):
+        print(f"{name:<10} {result['live_turns']:>6} {result['live_shed']:>5} {result.get('live_p50_ms', 0):>9.1f} "
+              f"{result.get('live_p95_ms', 0):>9.1f} {result.get('live_p99_ms', 0):>9.1f}")
+    if alone.get("live_p99_ms"):
+        print(f"live p99 under load: {(mixed.get('live_p99_ms', 0) / alone['live_p99_ms'] - 1) * 100:+.0f}%")
+    print(f"background: {mixed['reports']} reports ({mixed['reports_shed']} shed), "
+          f"{mixed['onboardings']} onboardings ({mixed['onboardings_shed']} shed)")
+    if stats.get("classes"):
+        print(json.dumps(stats["classes"], indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--live", type=int, default=16, help="candidates answering continuously")
+    parser.add_argument("--reports", type=int, default=16, help="workers running short interviews and downloading the PDF")
+    parser.add_argument("--onboarding", type=int, default=4, help="workers building personas from new documents")
+    parser.add_argument("--seconds", type=float, default=60.0, help="length of each phase")
+    parser.add_argument("--think-seconds", type=float, default=1.0, help="pause between a live candidate's answers")
+    parser.add_argument("--report-answers", type=int, default=3, help="answers per report interview")
+    parser.add_argument("--answer-seconds", type=float, default=8.0)
+    parser.add_argument("--duration-minutes", type=int, default=30)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    asyncio.run(run(parser.parse_args()))
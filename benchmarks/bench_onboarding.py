@@ -0,0 +1,75 @@
+"""End-to-end latency of /api/v1/agent/build in the pipelined and single-call modes.
+
+Every request uploads a JD and resume that have not been seen before, so the
+document and persona caches do not hide the Gemini calls. Per-stage timings are
+read from the Server-Timing header.
+
+    LLM_BACKEND=fake uvicorn main:app &
+    python benchmarks/bench_onboarding.py --requests 20 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import make_pdf
+from stats import percentile
+
+def documents() -> tuple:
+    tag = uuid.uuid4().hex[:8]
+    jd = make_pdf([f"Backend Engineer {tag}", "Requirements", "Python, SQL, Kafka", "Responsibilities", "Build pipelines"])
+    resume = make_pdf([f"Candidate {tag}", "Skills", "Python, SQL", "Experience", "Five years of backend work"])
+    return jd, resume
+
+def parse_server_timing(header: str) -> dict:
+    stages = {}
+    for part in filter(None, (p.strip() for p in header.split(","))):
+        name, _, duration = part.partition(";dur=")
+        stages[name] = float(duration)
+    return stages
+
+async def build(client: httpx.AsyncClient, mode: str) -> tuple:
+    jd, resume = documents()
+    start = time.perf_counter()
+    response = await client.post(f"/api/v1/agent/build?mode={mode}", files={
+        "jd": ("jd.pdf", jd, "application/pdf"),
+        "resume": ("resume.pdf", resume, "application/pdf"),
+    })
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000, parse_server_timing(response.headers.get("server-timing", "")), \
+        response.headers.get("x-onboarding-mode")
+
+async def run_mode(url: str, mode: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def guarded(client):
+        async with semaphore:
+            return await build(client, mode)
+
+    async with httpx.AsyncClient(base_url=url, timeout=300) as client:
+        results = await asyncio.gather(*(guarded(client) for _ in range(requests)))
+
+    latencies = [r[0] for r in results]
+    fallbacks = sum(1 for r in results if r[2] != mode)
+    print(f"\n{mode}: {requests} requests, {fallbacks} fell back to pipelined")
+    print(f"  {'end-to-end (client)':<22} p50 {percentile(latencies, 50):7.0f} ms   p95 {percentile(latencies, 95):7.0f} ms")
+    stage_names = sorted({name for r in results for name in r[1]}, key=lambda n: (n == "total", n))
+    for name in stage_names:
+        values = [r[1][name] for r in results if name in r[1]]
+        print(f"  {name:<22} p50 {percentile(values, 50):7.0f} ms   p95 {percentile(values, 95):7.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--modes", nargs="+", default=["pipelined", "single_call"])
+    args = parser.parse_args()
+    for mode in args.modes:
+        asyncio.run(run_mode(args.url, mode, args.requests, args.concurrency))
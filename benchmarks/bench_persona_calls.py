@@ -0,0 +1,61 @@
+"""Counts Gemini calls per candidate for persona building during a hiring drive.
+
+Builds personas for many resumes against one JD with a stubbed LLM that sleeps
+for a fixed latency, then reports calls per candidate and persona latency. Before
+the JD-level cache every candidate cost exactly one call.
+
+    python benchmarks/bench_persona_calls.py --candidates 200 --latency-ms 800
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+
+from app.models.schemas import JobDescription, Resume
+from app.services import agent
+
+async def main(candidates: int, latency_ms: float):
+    calls = {"count": 0}
+
+    async def fake_generate_json(prompt: str, **kwargs) -> dict:
+        calls["count"] += 1
+        await asyncio.sleep(latency_ms / 1000)
+        return {
+            "system_prompt": "You are a rigorous but friendly backend interviewer.",
+            "initial_greeting": "Hello {candidate_name}, thanks for joining.",
+            "topics_to_evaluate": ["Python", "APIs", "Databases", "Testing", "Teamwork"],
+        }
+
+    agent.agenerate_json = fake_generate_json
+
+    jd = JobDescription(
+        role_title="Backend Engineer", company_name="Acme", required_skills=["Python", "SQL"],
+        responsibilities=["Build APIs"], raw_text="...", summary_markdown="Backend role.",
+    )
+    latencies = []
+    for i in range(candidates):
+        resume = Resume(
+            candidate_name=f"Candidate {i}", skills=["Python"], experience_summary="3 years",
+            raw_text="...", summary_markdown="Engineer.",
+        )
+        start = time.perf_counter()
+        await agent.build_agent_persona(jd, resume)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    print(f"candidates:           {candidates}")
+    print(f"gemini calls:         {calls['count']} (before: {candidates})")
+    print(f"calls per candidate:  {calls['count'] / candidates:.3f} (before: 1.000)")
+    print(f"p50 persona latency:  {latencies[len(latencies) // 2] * 1000:.2f} ms")
+    print(f"first build latency:  {max(latencies) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    args = parser.parse_args()
+    asyncio.run(main(args.candidates, args.latency_ms))
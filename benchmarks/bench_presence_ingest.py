@@ -0,0 +1,130 @@
+"""Load test for face-presence ingestion.
+
+Starts ``--sessions`` interviews, then has every one of them post a
+run-length-encoded presence batch every ``--interval`` seconds for ``--seconds``,
+the way the interview page does. Arrivals are spread evenly across the interval.
+It prints request latency percentiles, achieved requests per second, and the
+server's ingestion counters. At the end it checks that the off-camera total the
+server recorded for a sample session matches what was sent.
+
+Session setup calls the LLM once per session, so use the fake backend with no latency:
+
+    LLM_BACKEND=fake ASR_BACKEND=fake FAKE_LLM_LATENCY_MS=0 uvicorn main:app &
+    python benchmarks/bench_presence_ingest.py --sessions 2000 --interval 5 --seconds 60
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import make_pdf
+from stats import percentile
+
+async def setup_sessions(client: httpx.AsyncClient, count: int, concurrency: int) -> list:
+    jd = make_pdf(["Backend Engineer", "Requirements", "Python, SQL"])
+    resume = make_pdf(["Candidate", "Skills", "Python, SQL"])
+    response = await client.post("/api/v1/agent/build", files={
+        "jd": ("jd.pdf", jd, "application/pdf"),
+        "resume": ("resume.pdf", resume, "application/pdf"),
+    })
+    response.raise_for_status()
+    persona = response.json()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def start():
+        async with semaphore:
+            response = await client.post("/api/v1/session/start", json={"agent_persona": persona, "duration_minutes": 60})
+            response.raise_for_status()
+            return response.json()["session_id"]
+
+    return await asyncio.gather(*(start() for _ in range(count)))
+
+class Candidate:
+    """Simulated page: the face comes and goes, and runs are batched like interview.js does."""
+
+    def __init__(self, session_id: str, rng: random.Random):
+        self.session_id = session_id
+        self.rng = rng
+        self.origin = time.perf_counter()
+        self.cursor = 0  # ms since origin, like performance.now() in the page
+        self.present = 1
+        self.absent_ms = 0
+
+    def next_batch(self) -> dict:
+        now = int((time.perf_counter() - self.origin) * 1000)
+        batch = {"c": self.session_id, "o": self.cursor, "p": self.present, "r": []}
+        while self.cursor < now:
+            run = min(now - self.cursor, self.rng.randint(500, 8000) if self.present else self.rng.randint(200, 3000))
+            batch["r"].append(run)
+            if not self.present:
+                self.absent_ms += run
+            self.cursor += run
+            if self.cursor < now:
+                self.present = 1 - self.present
+        return batch
+
+async def post_loop(client, candidate: Candidate, offset: float, args, stop: float, latencies: list, errors: list):
+    await asyncio.sleep(offset)
+    while time.perf_counter() < stop:
+        body = json.dumps(candidate.next_batch(), separators=(",", ":"))
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"/api/v1/session/{candidate.session_id}/presence", content=body,
+                                         headers={"Content-Type": "application/json"})
+            if response.status_code == 204:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        await asyncio.sleep(max(0.0, args.interval - (time.perf_counter() - started)))
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        print(f"starting {args.sessions} sessions...")
+        session_ids = await setup_sessions(client, args.sessions, args.start_concurrency)
+        rng = random.Random(args.seed)
+        candidates = [Candidate(session_id, rng) for session_id in session_ids]
+        latencies, errors = [], []
+        started = time.perf_counter()
+        stop = started + args.seconds
+        await asyncio.gather(*(
+            post_loop(client, c, args.interval * i / len(candidates), args, stop, latencies, errors)
+            for i, c in enumerate(candidates)
+        ))
+        wall = time.perf_counter() - started
+
+        sample = candidates[0]
+        recorded = (await client.get(f"/api/v1/session/{sample.session_id}/presence")).json()
+        stats = (await client.get("/stats")).json().get("proctoring", {})
+
+    print(f"{len(latencies)} batches in {wall:.1f}s = {len(latencies) / wall:.0f} req/s "
+          f"(target {args.sessions / args.interval:.0f} req/s), {len(errors)} errors")
+    if latencies:
+        print("latency ms: " + "  ".join(f"p{p} {percentile(latencies, p) * 1000:.1f}" for p in (50, 95, 99))
+              + f"  max {max(latencies) * 1000:.1f}")
+    if errors:
+        print(f"errors: {sorted(set(map(str, errors)))}")
+    print(f"server: {stats}")
+    print(f"sample session: sent {sample.absent_ms / 1000:.1f}s off camera, "
+          f"server recorded {recorded['off_camera_seconds']:.1f}s in {recorded['off_camera_intervals']} intervals")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between batches per session")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--start-concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(run(parser.parse_args()))
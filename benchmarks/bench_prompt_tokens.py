@@ -0,0 +1,59 @@
+"""Prompt size per turn over interview length.
+
+Simulates an interview turn by turn with ~150-word answers and reports the
+estimated token count of the next-question prompt and the final summary prompt,
+next to what full-history concatenation would cost at the same point.
+
+    python benchmarks/bench_prompt_tokens.py --turns 60
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import AgentPersona, Question, Evaluation
+from app.services.conversation_memory import estimate_tokens
+from app.services.interview_engine import InterviewSession, build_next_question_prompt, build_summary_prompt
+from app.services.turn_record import TurnRecord
+
+ANSWER = " ".join(["I designed the service around an event queue so that each worker could scale independently."] * 10)
+
+def full_history_tokens(session: InterviewSession) -> int:
+    text = "".join(
+        f"Q: {t['question'].question_text}\nA: {t['answer']}\nEvaluation: {t['evaluation']}\n\n" for t in session.history
+    )
+    return estimate_tokens(session.agent_persona.system_prompt + text)
+
+def main(turns: int, every: int):
+    persona = AgentPersona(
+        agent_id="bench",
+        system_prompt="You are a rigorous but friendly interviewer for a senior backend role. " * 20,
+        initial_greeting="Hello",
+        topics_to_evaluate=["Python", "System Design", "Databases", "Testing", "Leadership"],
+    )
+    session = InterviewSession("bench", persona, 60)
+    print(f"{'turn':>5} {'next_q tokens':>14} {'summary tokens':>15} {'full-history tokens':>20}")
+    for turn in range(1, turns + 1):
+        session.history.append(TurnRecord.from_parts(
+            Question(
+                question_text=f"Question {turn}: how would you design a rate limiter for a multi-region API?",
+                question_type="technical", reason="bench", difficulty="medium",
+            ),
+            ANSWER,
+            Evaluation(
+                confidence_score=4, clarity_score=4, correctness_score=3,
+                feedback="Solid answer; could discuss failure modes in more depth.", follow_up_needed=False,
+            ),
+        ))
+        if turn == 1 or turn % every == 0:
+            next_q = estimate_tokens(build_next_question_prompt(session)) + estimate_tokens(session.system_instruction)
+            summary = estimate_tokens(build_summary_prompt(session))
+            print(f"{turn:>5} {next_q:>14} {summary:>15} {full_history_tokens(session):>20}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--every", type=int, default=5)
+    args = parser.parse_args()
+    main(args.turns, args.every)
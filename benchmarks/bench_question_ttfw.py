@@ -0,0 +1,65 @@
+"""Time-to-first-word for the next question, blocking vs streamed.
+
+Blocking: ``agenerate_json`` returns the whole question, so the first word can only
+be spoken once the full response has arrived. Streamed: ``astream_json_field``
+hands ``question_text`` over as it arrives; we record when the first words and the
+first complete sentence (what the browser starts speaking) become available.
+
+    uvicorn benchmarks.fake_gemini_server:app --port 8001 &
+    python benchmarks/bench_question_ttfw.py --runs 20
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats import percentile
+
+SENTENCE_END = re.compile(r"[.!?](\s|$)")
+
+async def blocking_run(index: int) -> float:
+    from app.services.llm_client import agenerate_json
+    start = time.perf_counter()
+    await agenerate_json(f"blocking run {index}: generate the next question")
+    return time.perf_counter() - start
+
+async def streamed_run(index: int) -> tuple:
+    from app.services.llm_client import astream_json_field
+    start = time.perf_counter()
+    marks = {}
+    text = []
+
+    async def on_text(piece: str):
+        text.append(piece)
+        marks.setdefault("first_word", time.perf_counter() - start)
+        if "first_sentence" not in marks and SENTENCE_END.search("".join(text)):
+            marks["first_sentence"] = time.perf_counter() - start
+
+    await astream_json_field(f"streamed run {index}: generate the next question", "question_text", on_text)
+    total = time.perf_counter() - start
+    return marks["first_word"], marks.get("first_sentence", total), total
+
+def report(label: str, values: list):
+    print(f"{label:<28} p50 {percentile(values, 50) * 1000:6.0f} ms   p95 {percentile(values, 95) * 1000:6.0f} ms")
+
+async def main(runs: int):
+    blocking = [await blocking_run(i) for i in range(runs)]
+    streamed = [await streamed_run(i) for i in range(runs)]
+    report("blocking: first word", blocking)
+    report("streamed: first word", [s[0] for s in streamed])
+    report("streamed: first sentence", [s[1] for s in streamed])
+    report("streamed: complete", [s[2] for s in streamed])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="http://localhost:8001")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+    os.environ["GEMINI_API_ENDPOINT"] = args.endpoint
+    os.environ["GEMINI_TRANSPORT"] = "rest"
+    asyncio.run(main(args.runs))
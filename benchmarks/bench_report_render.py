@@ -0,0 +1,110 @@
+"""Final report rendering benchmark for 10, 50 and 200-question interviews.
+
+Compares the previous f-string builder (inline <style>, new stylesheet every
+render) with the precompiled Jinja template, for HTML only (``?format=html``) and
+for PDF with the cached stylesheet. The PDF is also rendered through the process
+pool to show the event loop stays free while WeasyPrint runs.
+
+    python benchmarks/bench_report_render.py --questions 10 50 200 --repeat 3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import Question, Evaluation
+from app.services import executor
+from app.services.turn_record import TurnRecord
+from app.services.pdf_generator import render_report_html, write_pdf, write_pdf_report, TEMPLATE_DIR
+
+SUMMARY = {
+    "overall_score": 7,
+    "strengths": ["Clear communication", "Solid fundamentals"],
+    "areas_for_improvement": ["Quantify impact"],
+    "summary_feedback": "Structured answers backed by concrete examples. " * 5,
+}
+
+def make_session(questions: int) -> SimpleNamespace:
+    history = [TurnRecord.from_parts(
+        Question(question_text=f"Question {i}: how would you scale the ingestion service?",
+                 question_type="technical", reason="bench", difficulty="medium"),
+        "I would partition the topic by tenant, add consumers, and watch lag & p99 <closely>. " * 4,
+        Evaluation(confidence_score=4, clarity_score=4, correctness_score=3,
+                   feedback="Good, mention back-pressure.", follow_up_needed=False),
+    ) for i in range(questions)]
+    return SimpleNamespace(session_id="bench", duration_seconds=1800, face_missing_seconds=12, history=history)
+
+def legacy_html(session, summary) -> str:
+    with open(os.path.join(TEMPLATE_DIR, "report.css")) as f:
+        css = f.read()
+    html = f"""<html><head><style>{css}</style></head><body>
+    <h1>Interview Report</h1><p><strong>Session ID:</strong> {session.session_id}</p>
+    <div class="summary-box"><h2>Overall Assessment</h2><p>{summary['overall_score']}/10</p><p>{summary['summary_feedback']}</p>
+    {''.join(f'<span class="badge badge-green">{s}</span>' for s in summary['strengths'])}
+    {''.join(f'<span class="badge badge-red">{s}</span>' for s in summary['areas_for_improvement'])}
+    </div><h2>Transcript & Feedback</h2>"""
+    for item in session.history:
+        q, a, e = item["question"], item["answer"], item["evaluation"]
+        html += f"""<div class="question">Q: {q.question_text}</div><div class="answer">A: {a}</div>
+        <div class="feedback"><p><span class="score">Confidence: {e.confidence_score}/5 | Clarity: {e.clarity_score}/5 | Correctness: {e.correctness_score}/5</span></p>
+        <p>{e.feedback}</p></div><hr>"""
+    return html + "</body></html>"
+
+def legacy_pdf(session, summary, path):
+    from weasyprint import HTML
+    HTML(string=legacy_html(session, summary)).write_pdf(path)
+
+def best_of(repeat: int, func, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+async def pooled_pdf(session, path) -> tuple:
+    """Renders through the process pool and measures event-loop stalls meanwhile."""
+    stalls = []
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - start - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await write_pdf_report(session, SUMMARY, path)
+    elapsed = time.perf_counter() - start
+    tick.cancel()
+    return elapsed, max(stalls, default=0.0)
+
+def main(question_counts, repeat: int):
+    out = tempfile.mkdtemp()
+    path = os.path.join(out, "report.pdf")
+    render_report_html(make_session(1), SUMMARY)  # compile the template once
+    write_pdf(render_report_html(make_session(1), SUMMARY, inline_css=False), path)  # parse the stylesheet once
+
+    print(f"{'questions':>9} {'legacy html':>12} {'tmpl html':>10} {'legacy pdf':>11} {'cached pdf':>11} {'pool pdf':>9} {'loop stall':>11}")
+    for count in question_counts:
+        session = make_session(count)
+        html_old = best_of(repeat, legacy_html, session, SUMMARY)
+        html_new = best_of(repeat, render_report_html, session, SUMMARY)
+        pdf_old = best_of(repeat, legacy_pdf, session, SUMMARY, path)
+        pdf_new = best_of(repeat, lambda: write_pdf(render_report_html(session, SUMMARY, inline_css=False), path))
+        pooled, stall = asyncio.run(pooled_pdf(session, path))
+        print(f"{count:>9} {html_old * 1000:>10.1f}ms {html_new * 1000:>8.1f}ms {pdf_old * 1000:>9.0f}ms "
+              f"{pdf_new * 1000:>9.0f}ms {pooled * 1000:>7.0f}ms {stall * 1000:>9.1f}ms")
+    executor.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.questions, args.repeat)
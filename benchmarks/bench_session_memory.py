@@ -0,0 +1,81 @@
+"""Memory held by interview history: dicts of pydantic models vs TurnRecord.
+
+Builds ``--sessions`` concurrent sessions of ``--minutes`` each, with one answered
+question every ``--seconds-per-turn`` seconds, in both representations, and
+reports the traced allocation per session and in total. Answer text is the same
+size in both, so the overhead without it is printed as well.
+
+    python benchmarks/bench_session_memory.py --sessions 1000 --minutes 60
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import Question, Evaluation
+from app.services.turn_record import TurnRecord
+
+ANSWER_WORDS = "I would start by measuring the current load and then partition the work across independent consumers".split()
+QUESTION_TYPES = ("technical", "behavioral", "situational")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+def make_parts(session: int, turn: int, answer_words: int) -> tuple:
+    # Fresh strings per turn, as they would arrive from Gemini and Whisper.
+    question = Question.model_validate_json(
+        f'{{"question_text": "Question {turn} for session {session}: how would you scale the ingestion service?",'
+        f' "question_type": "{QUESTION_TYPES[turn % 3]}", "reason": "Probes system design depth",'
+        f' "difficulty": "{DIFFICULTIES[turn % 3]}"}}'
+    )
+    answer = " ".join(ANSWER_WORDS[(session + turn + i) % len(ANSWER_WORDS)] for i in range(answer_words))
+    evaluation = Evaluation.model_validate_json(
+        '{"confidence_score": 4, "clarity_score": 3, "correctness_score": 4,'
+        f' "feedback": "Good structure for turn {turn}; mention back-pressure.", "follow_up_needed": false}}'
+    )
+    return question, answer, evaluation
+
+def legacy_turn(question, answer, evaluation) -> dict:
+    return {"question": question, "answer": answer, "evaluation": evaluation}
+
+def compact_turn(question, answer, evaluation) -> TurnRecord:
+    return TurnRecord.from_parts(question, answer, evaluation)
+
+def measure(build, sessions: int, turns: int, answer_words: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    histories = []
+    for s in range(sessions):
+        history = []
+        for t in range(turns):
+            history.append(build(*make_parts(s, t, answer_words)))
+        histories.append(history)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del histories
+    return current
+
+def main(args):
+    turns = int(args.minutes * 60 // args.seconds_per_turn)
+    print(f"{args.sessions} sessions x {turns} turns ({args.minutes} min, one turn per {args.seconds_per_turn}s), "
+          f"{args.answer_words}-word answers")
+    answers = measure(lambda q, a, e: a, args.sessions, turns, args.answer_words)
+    print(f"{'representation':<16} {'total MB':>10} {'per session KB':>15} {'excl. answers KB':>17}")
+    results = {}
+    for name, build in (("dict+pydantic", legacy_turn), ("TurnRecord", compact_turn)):
+        total = measure(build, args.sessions, turns, args.answer_words)
+        results[name] = total
+        print(f"{name:<16} {total / 1e6:>10.1f} {total / args.sessions / 1024:>15.1f} "
+              f"{(total - answers) / args.sessions / 1024:>17.1f}")
+    saved = 1 - results["TurnRecord"] / results["dict+pydantic"]
+    print(f"TurnRecord saves {saved * 100:.0f}% of history memory")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--seconds-per-turn", type=float, default=120, help="time per answered question")
+    parser.add_argument("--answer-words", type=int, default=150)
+    main(parser.parse_args())
@@ -0,0 +1,87 @@
+"""Bulk skill ranking benchmark: one or many JDs against 10k parsed resumes.
+
+Resumes get random skill lists written the way people write them (aliases,
+casing, phrases like "3 years of k8s"). Reports the time to normalize and stack
+them into the resume x skill matrix, to score and rank one JD, to build a JD x
+resume overlap matrix for several JDs, and a pure-Python set-intersection
+baseline for comparison.
+
+    python benchmarks/bench_skill_rank.py --resumes 10000 --jds 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.skill_index import ResumeMatrix, normalize_skills, canonicalize
+
+SKILL_VARIANTS = [
+    ["Python", "python3", "Python 3", "5 years of Python"],
+    ["Kubernetes", "k8s", "K8S", "3 years of k8s"],
+    ["AWS", "Amazon Web Services", "aws"],
+    ["PostgreSQL", "Postgres", "psql"],
+    ["JavaScript", "JS", "ES6"],
+    ["React", "React.js", "ReactJS"],
+    ["Node.js", "NodeJS", "node js"],
+    ["Docker", "docker compose"],
+    ["Kafka", "Apache Kafka"],
+    ["Machine Learning", "ML", "machine learning"],
+    ["CI/CD", "CICD", "Continuous Integration"],
+    ["Go", "Golang"],
+    ["Terraform"], ["Redis"], ["SQL"], ["Java"], ["Spark", "PySpark"], ["GraphQL"],
+    ["System Design"], ["Communication skills", "Communication"], ["Leadership"],
+]
+NOISE = ["Underwater basket weaving", "Public speaking", "Chess", "Photography", "Mentoring"]
+
+def make_resumes(count: int, rng: random.Random) -> list:
+    resumes = []
+    for _ in range(count):
+        skills = [rng.choice(group) for group in rng.sample(SKILL_VARIANTS, rng.randint(4, 12))]
+        skills += rng.sample(NOISE, rng.randint(0, 2))
+        resumes.append(skills)
+    return resumes
+
+def make_jd(rng: random.Random) -> list:
+    return [group[0] for group in rng.sample(SKILL_VARIANTS, rng.randint(5, 9))]
+
+def python_baseline(jd: list, resumes: list, top_k: int) -> list:
+    required = set(normalize_skills(jd))
+    scores = [len(required & set(normalize_skills(r))) / len(required) for r in resumes]
+    return sorted(range(len(resumes)), key=lambda i: -scores[i])[:top_k]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def main(count: int, jd_count: int, top_k: int, seed: int):
+    rng = random.Random(seed)
+    resumes = make_resumes(count, rng)
+    jds = [make_jd(rng) for _ in range(jd_count)]
+
+    canonicalize.cache_clear()
+    matrix, build_cold = timed(ResumeMatrix.for_jds, resumes, jds)
+    _, build_warm = timed(ResumeMatrix.for_jds, resumes, jds)
+    ranking, rank_ms = timed(matrix.rank, jds[0], top_k)
+    overlap, overlap_ms = timed(matrix.overlap, jds)
+    baseline, baseline_ms = timed(python_baseline, jds[0], resumes, top_k)
+
+    print(f"resumes:                 {len(matrix)} x {matrix.matrix.shape[1]} JD skills")
+    print(f"build matrix (cold):     {build_cold:8.1f} ms   (normalization cache empty)")
+    print(f"build matrix (warm):     {build_warm:8.1f} ms")
+    print(f"rank 1 JD, top {top_k:<4}:     {rank_ms:8.2f} ms")
+    print(f"overlap {jd_count} JDs x {count}:  {overlap_ms:8.2f} ms   shape {overlap.shape}")
+    print(f"python set baseline:     {baseline_ms:8.1f} ms")
+    print(f"top 5: {ranking[:5]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.resumes, args.jds, args.top_k, args.seed)
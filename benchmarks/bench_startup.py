@@ -0,0 +1,70 @@
+"""Cold-start benchmark: time and memory to import the application.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter, reports wall
+time, peak RSS and the slowest imports, and exits non-zero when a budget is exceeded
+so it can gate CI.
+
+    python benchmarks/bench_startup.py --max-seconds 3 --max-rss-mb 250
+"""
+import argparse
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+HEAVY_MODULES = ("whisper", "torch", "google.generativeai", "weasyprint", "fitz")
+
+def main(max_seconds: float, max_rss_mb: float, top: int) -> int:
+    env = {**os.environ, "PREWARM": "0"}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        return proc.returncode
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.search(line)
+        if match:
+            imports.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    top_level = sorted((i for i in imports if i[1] <= 1), reverse=True)[:top]
+    loaded_heavy = sorted({name for _, _, name in imports for heavy in HEAVY_MODULES if name == heavy})
+
+    print(f"wall time:     {wall:.2f}s")
+    print(f"peak RSS:      {rss_mb:.0f} MB")
+    print(f"heavy modules: {', '.join(loaded_heavy) or 'none'}")
+    print("slowest top-level imports:")
+    for cumulative_us, _, name in top_level:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if max_seconds and wall > max_seconds:
+        print(f"FAIL: import took {wall:.2f}s (budget {max_seconds}s)")
+        failed = True
+    if max_rss_mb and rss_mb > max_rss_mb:
+        print(f"FAIL: peak RSS {rss_mb:.0f} MB (budget {max_rss_mb} MB)")
+        failed = True
+    if loaded_heavy:
+        print("FAIL: heavy backends were imported at module load")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-seconds", type=float, default=0)
+    parser.add_argument("--max-rss-mb", type=float, default=0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(main(args.max_seconds, args.max_rss_mb, args.top))
@@ -0,0 +1,80 @@
+"""Local stand-in for the Gemini REST API.
+
+Answers ``generateContent`` with a canned JSON body after a configurable delay and
+can inject 429s, so the LLM client can be load-tested without network access.
+``streamGenerateContent`` sends the same body in small chunks, one every
+FAKE_GEMINI_CHUNK_MS, after FAKE_GEMINI_FIRST_CHUNK_MS.
+
+    FAKE_GEMINI_LATENCY_MS=400 FAKE_GEMINI_ERROR_RATE=0.05 \\
+        uvicorn benchmarks.fake_gemini_server:app --port 8001
+"""
+import asyncio
+import json
+import os
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_MS = float(os.getenv("FAKE_GEMINI_LATENCY_MS", "300"))
+ERROR_RATE = float(os.getenv("FAKE_GEMINI_ERROR_RATE", "0"))
+FIRST_CHUNK_MS = float(os.getenv("FAKE_GEMINI_FIRST_CHUNK_MS", "150"))
+CHUNK_MS = float(os.getenv("FAKE_GEMINI_CHUNK_MS", "40"))
+CHUNK_CHARS = int(os.getenv("FAKE_GEMINI_CHUNK_CHARS", "12"))
+
+CANNED = {
+    "question_text": "Thanks, that was helpful. Can you walk me through a system you designed recently, and what you would change about it today?",
+    "question_type": "technical",
+    "reason": "Benchmark",
+    "difficulty": "medium",
+    "confidence_score": 4,
+    "clarity_score": 4,
+    "correctness_score": 4,
+    "feedback": "Clear answer.",
+    "follow_up_needed": False,
+}
+
+app = FastAPI(title="Fake Gemini")
+stats = {"requests": 0, "throttled": 0}
+
+@app.post("/v1beta/models/{model}:generateContent")
+async def generate_content(model: str, request: Request):
+    await request.body()
+    stats["requests"] += 1
+    await asyncio.sleep(random.uniform(0.5, 1.5) * LATENCY_MS / 1000)
+    if random.random() < ERROR_RATE:
+        stats["throttled"] += 1
+        return JSONResponse(status_code=429, content={"error": {"code": 429, "message": "Resource exhausted", "status": "RESOURCE_EXHAUSTED"}})
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": json.dumps(CANNED)}]},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+        "usageMetadata": {"promptTokenCount": 200, "candidatesTokenCount": 60, "totalTokenCount": 260},
+    }
+
+@app.post("/v1beta/models/{model}:streamGenerateContent")
+async def stream_generate_content(model: str, request: Request):
+    """Streams the canned body as a JSON array of partial responses, like the REST API."""
+    await request.body()
+    stats["requests"] += 1
+    body = json.dumps(CANNED)
+
+    async def chunks():
+        await asyncio.sleep(FIRST_CHUNK_MS / 1000)
+        yield "["
+        for start in range(0, len(body), CHUNK_CHARS):
+            if start:
+                yield ",\r\n"
+                await asyncio.sleep(CHUNK_MS / 1000)
+            yield json.dumps({
+                "candidates": [{"content": {"role": "model", "parts": [{"text": body[start:start + CHUNK_CHARS]}]}, "index": 0}],
+            })
+        yield "]"
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+@app.get("/stats")
+async def get_stats():
+    return stats
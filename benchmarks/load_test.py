@@ -0,0 +1,224 @@
+"""Scripted multi-candidate load test for the full interview flow.
+
+Each simulated candidate uploads a JD and resume, builds a persona, starts a
+session, answers ``--answers`` questions with a WAV clip, ends the session and
+downloads the final PDF. Latencies are recorded per step and written as a JSON
+report; pass ``--compare`` with an earlier report to print the differences.
+
+Run the server with the deterministic backends so results are reproducible and do
+not need network access or a GPU:
+
+    LLM_BACKEND=fake ASR_BACKEND=fake uvicorn main:app &
+    python benchmarks/load_test.py --candidates 50 --concurrency 10 --output reports/base.json
+    python benchmarks/load_test.py --candidates 50 --concurrency 10 --compare reports/base.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import struct
+import subprocess
+import time
+import wave
+
+import httpx
+
+from stats import percentile
+
+STEPS = ["upload_jd", "upload_resume", "agent_build", "session_start", "audio", "session_end", "final"]
+
+def make_pdf(lines: list) -> bytes:
+    """Builds a single-page text PDF without any PDF library."""
+    text = "\n".join(
+        f"BT /F1 11 Tf 72 {760 - 14 * i} Td ({line.replace('(', '[').replace(')', ']')}) Tj ET"
+        for i, line in enumerate(lines[:50])
+    ).encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(text)).encode() + b" >>\nstream\n" + text + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+def make_jd(index: int) -> bytes:
+    return make_pdf([
+        f"Backend Engineer {index}", "Example Corp", "",
+        "Requirements", "Python, SQL, Kafka and AWS", "Experience operating production services", "",
+        "Responsibilities", "Build and operate data pipelines", "Own services end to end",
+    ])
+
+def make_resume(index: int) -> bytes:
+    return make_pdf([
+        f"Candidate {index}", "", "Skills", "Python, SQL, Docker, Kubernetes", "",
+        "Experience", f"Backend engineer for {3 + index % 7} years", "Built streaming pipelines with Kafka",
+    ])
+
+def make_wav(seconds: float, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / rate)))
+            for i in range(int(seconds * rate))
+        ))
+    return buffer.getvalue()
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {step: [] for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+
+    async def call(self, step: str, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+            response.raise_for_status()
+        except Exception:
+            self.errors[step] += 1
+            raise
+        self.latencies[step].append(time.perf_counter() - start)
+        return response
+
+    def summary(self) -> dict:
+        steps = {}
+        for step in STEPS:
+            values = self.latencies[step]
+            steps[step] = {"count": len(values), "errors": self.errors[step]}
+            if values:
+                steps[step].update({
+                    "mean_ms": round(sum(values) / len(values) * 1000, 1),
+                    "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(percentile(values, 95) * 1000, 1),
+                    "p99_ms": round(percentile(values, 99) * 1000, 1),
+                    "max_ms": round(max(values) * 1000, 1),
+                })
+        return steps
+
+async def candidate(client: httpx.AsyncClient, rec: Recorder, index: int, args, audio: bytes):
+    jd = make_jd(index % args.jds)
+    resume = make_resume(index)
+    await rec.call("upload_jd", client.post("/api/v1/upload/jd", files={"file": ("jd.pdf", jd, "application/pdf")}))
+    await rec.call("upload_resume", client.post("/api/v1/upload/resume", files={"file": ("resume.pdf", resume, "application/pdf")}))
+    persona = (await rec.call("agent_build", client.post("/api/v1/agent/build", files={
+        "jd": ("jd.pdf", jd, "application/pdf"),
+        "resume": ("resume.pdf", resume, "application/pdf"),
+    }))).json()
+    session_id = (await rec.call("session_start", client.post("/api/v1/session/start", json={
+        "agent_persona": persona, "duration_minutes": args.duration_minutes,
+    }))).json()["session_id"]
+    for _ in range(args.answers):
+        result = (await rec.call("audio", client.post(
+            f"/api/v1/session/{session_id}/audio", files={"file": ("answer.wav", audio, "audio/wav")},
+        ))).json()
+        if not result.get("next_question"):
+            break
+    await rec.call("session_end", client.post(f"/api/v1/session/{session_id}/end", json={"face_missing_seconds": 0}))
+    await rec.call("final", client.get(f"/api/v1/session/{session_id}/final"))
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+async def run(args) -> dict:
+    audio = make_wav(args.answer_seconds)
+    rec = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = 0
+
+    async def guarded(index: int):
+        nonlocal failures
+        # Stagger arrivals over the ramp so the run does not start with a thundering herd.
+        await asyncio.sleep(args.ramp_seconds * index / max(1, args.candidates))
+        async with semaphore:
+            try:
+                await candidate(client, rec, index, args, audio)
+            except Exception:
+                failures += 1
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(guarded(i) for i in range(args.candidates)))
+        wall = time.perf_counter() - start
+        try:
+            server_stats = (await client.get("/stats")).json()
+        except Exception:
+            server_stats = None
+
+    steps = rec.summary()
+    requests = sum(step["count"] for step in steps.values())
+    return {
+        "git_commit": git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "wall_seconds": round(wall, 2),
+        "candidates_completed": args.candidates - failures,
+        "candidates_failed": failures,
+        "candidates_per_minute": round((args.candidates - failures) / wall * 60, 2),
+        "requests_per_second": round(requests / wall, 2),
+        "steps": steps,
+        "server_stats": server_stats,
+    }
+
+def print_report(report: dict, baseline: dict = None):
+    print(f"commit {report['git_commit']}  wall {report['wall_seconds']}s  "
+          f"{report['candidates_completed']} ok / {report['candidates_failed']} failed  "
+          f"{report['candidates_per_minute']} candidates/min  {report['requests_per_second']} req/s")
+    header = f"{'step':<14} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'p50 Δ':>8} {'p95 Δ':>8}"
+    print(header)
+    for step, stats in report["steps"].items():
+        line = (f"{step:<14} {stats['count']:>6} {stats['errors']:>4} {stats.get('p50_ms', 0):>9.1f} "
+                f"{stats.get('p95_ms', 0):>9.1f} {stats.get('p99_ms', 0):>9.1f}")
+        base = (baseline or {}).get("steps", {}).get(step, {})
+        if baseline and base.get("p50_ms") and stats.get("p50_ms"):
+            line += f" {(stats['p50_ms'] / base['p50_ms'] - 1) * 100:>+7.0f}% {(stats['p95_ms'] / base['p95_ms'] - 1) * 100:>+7.0f}%"
+        print(line)
+    if baseline:
+        print(f"throughput vs {baseline.get('git_commit', 'baseline')}: "
+              f"{(report['candidates_per_minute'] / max(baseline['candidates_per_minute'], 1e-9) - 1) * 100:+.0f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5, help="candidates in flight at once")
+    parser.add_argument("--answers", type=int, default=5, help="answers per candidate")
+    parser.add_argument("--answer-seconds", type=float, default=8.0, help="length of each WAV answer")
+    parser.add_argument("--jds", type=int, default=3, help="distinct job descriptions shared by candidates")
+    parser.add_argument("--duration-minutes", type=int, default=30)
+    parser.add_argument("--ramp-seconds", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    parser.add_argument("--compare", default=None, help="earlier JSON report to diff against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
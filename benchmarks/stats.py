@@ -0,0 +1,10 @@
+"""Shared summary statistics for the benchmark scripts, so their percentiles compare."""
+import math
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least pct% of values at or below it."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -1,10 +1,39 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.routers import uploads, agent, session
+from app.routers import uploads, agent, session, ranking
+from app.services import executor
+from app.services.doc_cache import document_cache
+from app.services.agent import persona_cache_stats
+from app.services.interview_engine import prefetch_cache_stats, session_gc_loop
+from app.services import whisper_service, upload_store
+from app.services.llm_client import get_model
+from app.services.audio_preprocessing import preprocessing_stats
+from app.services.scheduler import scheduler
+from app.services.proctoring import proctoring_stats
+from app.services.tracing import configure_logging, new_trace_id, trace_id_var
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+import asyncio
+import logging
+import os
+import time
+
+# Load Whisper and configure Gemini in the background after startup so /health
+# answers immediately; with PREWARM=0 they load on first use instead.
+PREWARM = os.getenv("PREWARM", "1") == "1"
+
+configure_logging()
+logger = logging.getLogger("app.requests")
 
 app = FastAPI(title="AI Interview Pilot")
 
+# Body caps per upload route, enforced before multipart parsing buffers the body.
+app.add_middleware(upload_store.UploadSizeLimitMiddleware, limits=[
+    (r"^/api/v1/upload/(jd|resume)$", upload_store.MAX_PDF_BYTES),
+    (r"^/api/v1/agent/build$", 2 * upload_store.MAX_PDF_BYTES),
+    (r"^/api/v1/session/[^/]+/audio$", upload_store.MAX_AUDIO_BYTES),
+])
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -13,12 +42,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Tags every log line of a request with a trace id, echoed back as X-Trace-Id."""
+    trace_id = request.headers.get("x-trace-id") or new_trace_id()
+    token = trace_id_var.set(trace_id)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+        response.headers["X-Trace-Id"] = trace_id
+        if request.url.path.startswith("/api/"):
+            logger.info("%s %s %d %.0fms", request.method, request.url.path, response.status_code,
+                        (time.perf_counter() - start) * 1000)
+        return response
+    except Exception:
+        logger.exception("%s %s failed", request.method, request.url.path)
+        raise
+    finally:
+        trace_id_var.reset(token)
+
 app.include_router(uploads.router, prefix="/api/v1/upload", tags=["Uploads"])
 app.include_router(agent.router, prefix="/api/v1/agent", tags=["Agent"])
 app.include_router(session.router, prefix="/api/v1/session", tags=["Session"])
+app.include_router(ranking.router, prefix="/api/v1/candidates", tags=["Ranking"])
 
-app.mount("/", StaticFiles(directory="static", html=True), name="static")
+async def prewarm():
+    await executor.run_io(get_model)
+    await whisper_service.worker.start()
+
+@app.on_event("startup")
+async def start_workers():
+    app.state.upload_gc_task = asyncio.create_task(upload_store.gc_loop())
+    app.state.session_gc_task = asyncio.create_task(session_gc_loop())
+    if PREWARM:
+        app.state.prewarm_task = asyncio.create_task(prewarm())
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    await whisper_service.worker.stop()
+    executor.shutdown()
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "transcription_ready": whisper_service.worker.started}
+
+@app.get("/stats")
+async def get_stats():
+    return {
+        "document_cache": document_cache.stats(),
+        "persona_cache": persona_cache_stats(),
+        "opening_question_prefetch": prefetch_cache_stats(),
+        "transcription": whisper_service.worker.stats(),
+        "audio_preprocessing": preprocessing_stats(),
+        "scheduler": scheduler.stats(),
+        "proctoring": proctoring_stats(),
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Mounted last: a mount at "/" matches every path, so routes declared after it are unreachable.
+app.mount("/", StaticFiles(directory="static", html=True), name="static")
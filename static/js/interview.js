@@ -10,6 +10,10 @@ let silenceStart = null;
 let vadState = 'IDLE'; // IDLE, LISTENING, SPEAKING, PROCESSING
 const SILENCE_THRESHOLD = 0.02; // Adjust based on testing
 const SILENCE_DURATION = 2000; // 2 seconds of silence to trigger stop
+const STREAM_SAMPLE_RATE = 16000; // PCM rate expected by the streaming endpoint
+let streamSocket = null;
+let isStreaming = false;
+let streamedQuestion = null; // next question text received so far, and how much of it was spoken
 
 // Initialize
 window.addEventListener('DOMContentLoaded', () => {
@@ -46,9 +50,11 @@ function displayQuestion(text) {
 
 let isAiSpeaking = false;
 
-function speakText(text) {
+function speakText(text, queued = false) {
     if ('speechSynthesis' in window) {
-        window.speechSynthesis.cancel();
+        if (!queued) {
+            window.speechSynthesis.cancel();
+        }
 
         const utterance = new SpeechSynthesisUtterance(text);
         utterance.lang = 'en-US';
@@ -59,6 +65,7 @@ function speakText(text) {
         };
         
         utterance.onend = () => {
+            if (window.speechSynthesis.pending) return; // more sentences queued
             isAiSpeaking = false;
             console.log('AI stopped speaking');
             // Resume listening state if needed
@@ -119,8 +126,15 @@ async function initVAD() {
             }
             const rms = Math.sqrt(sum / input.length);
             handleVAD(rms);
+
+            // Stream audio while the candidate speaks so transcription keeps up
+            if (isStreaming && streamSocket && streamSocket.readyState === WebSocket.OPEN) {
+                streamSocket.send(downsampleToInt16(input, audioContext.sampleRate).buffer);
+            }
         };
 
+        openStreamSocket();
+
         updateVADStatus('LISTENING', 'Listening...');
         vadState = 'LISTENING';
 
@@ -157,19 +171,79 @@ function handleVAD(volume) {
 
 function startRecording() {
     console.log('Starting recording...');
-    audioChunks = [];
-    mediaRecorder.start();
+    if (streamSocket && streamSocket.readyState === WebSocket.OPEN) {
+        isStreaming = true;
+    } else {
+        audioChunks = [];
+        mediaRecorder.start();
+    }
     vadState = 'SPEAKING';
     updateVADStatus('SPEAKING', 'Recording...');
 }
 
 function stopRecording() {
     console.log('Stopping recording...');
-    mediaRecorder.stop();
+    if (isStreaming) {
+        isStreaming = false;
+        streamSocket.send(JSON.stringify({ type: 'end' }));
+    } else {
+        mediaRecorder.stop();
+    }
     vadState = 'PROCESSING';
     updateVADStatus('PROCESSING', 'Processing answer...');
 }
 
+function openStreamSocket() {
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${protocol}://${window.location.host}/api/v1/session/${sessionId}/stream`);
+    socket.binaryType = 'arraybuffer';
+
+    socket.onopen = () => {
+        streamSocket = socket;
+        console.log('Streaming transcription connected');
+    };
+
+    socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'partial') {
+            console.log('Partial transcript:', message.text);
+        } else if (message.type === 'question') {
+            handleQuestionText(message.text);
+        } else if (message.type === 'result') {
+            handleAnswerResult(message);
+        } else if (message.type === 'error') {
+            console.error('Streaming error:', message.detail);
+        }
+    };
+
+    socket.onclose = () => {
+        // Later answers fall back to uploading recorded blobs
+        const wasStreaming = isStreaming;
+        streamSocket = null;
+        isStreaming = false;
+        if (wasStreaming || vadState === 'PROCESSING') {
+            alert('Connection lost while processing your answer. Please refresh.');
+        }
+    };
+}
+
+function downsampleToInt16(input, inputRate) {
+    const ratio = inputRate / STREAM_SAMPLE_RATE;
+    const length = Math.floor(input.length / ratio);
+    const output = new Int16Array(length);
+    for (let i = 0; i < length; i++) {
+        const start = Math.floor(i * ratio);
+        const end = Math.min(input.length, Math.floor((i + 1) * ratio));
+        let sum = 0;
+        for (let j = start; j < end; j++) {
+            sum += input[j];
+        }
+        const sample = Math.max(-1, Math.min(1, sum / Math.max(1, end - start)));
+        output[i] = sample * 0x7fff;
+    }
+    return output;
+}
+
 function updateVADStatus(state, text) {
     const icon = document.getElementById('vad-icon');
     const textElem = document.getElementById('vad-text');
@@ -199,17 +273,7 @@ async function submitAnswer(audioBlob) {
         });
         
         const result = await response.json();
-        
-        if (result.next_question) {
-            displayQuestion(result.next_question.question_text);
-            // Feedback is intentionally hidden now
-            
-            // Resume listening
-            vadState = 'LISTENING';
-            updateVADStatus('LISTENING', 'Listening...');
-        } else {
-            endSession();
-        }
+        handleAnswerResult(result);
 
     } catch (error) {
         console.error('Error submitting answer:', error);
@@ -217,6 +281,64 @@ async function submitAnswer(audioBlob) {
     }
 }
 
+// Speaks each complete sentence of the next question as soon as it has streamed in
+function handleQuestionText(text) {
+    if (!streamedQuestion) {
+        if ('speechSynthesis' in window) {
+            window.speechSynthesis.cancel();
+        }
+        streamedQuestion = { text: '', spoken: 0 };
+    }
+    streamedQuestion.text += text;
+    document.getElementById('interviewer-text').innerText = streamedQuestion.text;
+
+    const pending = streamedQuestion.text.slice(streamedQuestion.spoken);
+    const match = pending.match(/^[\s\S]*[.!?](\s|$)/);
+    if (match && match[0].trim()) {
+        speakText(match[0].trim(), true);
+        streamedQuestion.spoken += match[0].length;
+    }
+}
+
+function finishStreamedQuestion(questionText) {
+    const streamed = streamedQuestion;
+    streamedQuestion = null;
+    if (!streamed || !questionText.startsWith(streamed.text.slice(0, streamed.spoken))) {
+        displayQuestion(questionText);
+        return;
+    }
+    document.getElementById('interviewer-text').innerText = questionText;
+    const rest = questionText.slice(streamed.spoken).trim();
+    if (rest) {
+        speakText(rest, true);
+    }
+}
+
+function handleAnswerResult(result) {
+    if (result.no_speech) {
+        // Nothing was heard; keep the current question and listen again
+        streamedQuestion = null;
+        vadState = 'LISTENING';
+        updateVADStatus('LISTENING', 'No speech detected. Listening...');
+        return;
+    }
+    if (result.next_question) {
+        if (streamedQuestion) {
+            finishStreamedQuestion(result.next_question.question_text);
+        } else {
+            displayQuestion(result.next_question.question_text);
+        }
+        // Feedback is intentionally hidden now
+        
+        // Resume listening
+        vadState = 'LISTENING';
+        updateVADStatus('LISTENING', 'Listening...');
+    } else {
+        streamedQuestion = null;
+        endSession();
+    }
+}
+
 function startTimer() {
     let seconds = 600; // Default 10 mins
     const display = document.getElementById('time-display');
@@ -240,6 +362,11 @@ async function endSession() {
         mediaRecorder.stop();
         isRecording = false;
     }
+    if (streamSocket) {
+        isStreaming = false;
+        streamSocket.onclose = null;
+        streamSocket.close();
+    }
     
     // Stop VAD
     if (audioContext) {
@@ -257,6 +384,7 @@ async function endSession() {
 
     try {
         // Send stats first
+        await flushPresence();
         await fetch(`/api/v1/session/${sessionId}/end`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
@@ -299,6 +427,80 @@ let missingStartTime = null;
 const FACE_CHECK_INTERVAL = 500; // Check every 0.5 second for better accuracy
 const NO_FACE_THRESHOLD = 5000; // Alert after 5 seconds of no face
 
+// Presence is also sent to the server as run-length-encoded batches:
+// {c: page id, o: ms from the first sample to the batch's first run, p: 1 if the face
+// was present in it, r: [run lengths in ms]}. Times come from performance.now(), so
+// changes to the system clock do not move the timeline; the server anchors them.
+const PRESENCE_FLUSH_INTERVAL = 5000;
+const presencePageId = Math.random().toString(36).slice(2) + Date.now().toString(36);
+let presenceOrigin = null;
+let presenceState = null;
+let presenceBatch = null; // runs not yet sent
+let presenceRunStart = null; // ms since presenceOrigin
+let presenceQueue = []; // batches waiting to be (re)sent
+let presenceSending = false;
+
+function presenceNow() {
+    return Math.round(performance.now() - presenceOrigin);
+}
+
+function recordPresence(present) {
+    if (presenceOrigin === null) presenceOrigin = performance.now();
+    const now = presenceNow();
+    const state = present ? 1 : 0;
+    if (presenceState === null) {
+        presenceBatch = { c: presencePageId, o: now, p: state, r: [] };
+        presenceRunStart = now;
+    } else if (state !== presenceState) {
+        presenceBatch.r.push(now - presenceRunStart);
+        presenceRunStart = now;
+    }
+    presenceState = state;
+}
+
+function closePresenceBatch() {
+    if (presenceState === null) return;
+    const now = presenceNow();
+    presenceBatch.r.push(now - presenceRunStart);
+    presenceQueue.push(presenceBatch);
+    presenceBatch = { c: presencePageId, o: now, p: presenceState, r: [] };
+    presenceRunStart = now;
+}
+
+async function flushPresence() {
+    closePresenceBatch();
+    if (presenceSending) return;
+    presenceSending = true;
+    try {
+        // Sent in order; a failed batch stays queued and is retried on the next flush.
+        // The server ignores anything it has already recorded, so retries are safe.
+        while (presenceQueue.length > 0) {
+            const response = await fetch(`/api/v1/session/${sessionId}/presence`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(presenceQueue[0]),
+                keepalive: true
+            });
+            if (!response.ok && response.status !== 400) break;
+            presenceQueue.shift();
+        }
+    } catch (err) {
+        console.warn('Presence upload failed, will retry:', err);
+    } finally {
+        presenceSending = false;
+    }
+}
+
+window.addEventListener('pagehide', () => {
+    // Last chance before the tab goes away; the beacon survives the unload.
+    closePresenceBatch();
+    for (const batch of presenceQueue) {
+        navigator.sendBeacon(`/api/v1/session/${sessionId}/presence`,
+            new Blob([JSON.stringify(batch)], { type: 'application/json' }));
+    }
+    presenceQueue = [];
+});
+
 async function initFaceDetection() {
     const statusElem = document.getElementById('face-status');
     if (statusElem) {
@@ -315,6 +517,7 @@ async function initFaceDetection() {
         
         // Start detection loop
         detectFaceLoop();
+        setInterval(flushPresence, PRESENCE_FLUSH_INTERVAL);
     } catch (err) {
         console.error('Error loading face model:', err);
         if (statusElem) statusElem.innerText = 'Error';
@@ -332,6 +535,7 @@ async function detectFaceLoop() {
             
             if (predictions.length > 0) {
                 // Face found
+                recordPresence(true);
                 lastFaceDetectedTime = Date.now();
                 hideFaceAlert();
                 
@@ -352,6 +556,7 @@ async function detectFaceLoop() {
                 }
             } else {
                 // No face found
+                recordPresence(false);
                 if (statusElem) {
                     statusElem.innerText = 'No Face';
                     statusElem.style.color = '#f87171'; // Red
@@ -0,0 +1,126 @@
+"""Priority scheduler and PrioritySemaphore ordering, shedding and cancellation."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from app.services.scheduler import Priority, PrioritySemaphore, Scheduler, SchedulerOverloaded, current_priority
+
+def run(coro):
+    return asyncio.run(coro)
+
+def make_scheduler(capacity: int = 1, limit: int = 1, queue: int = 10, timeout: float = 5) -> Scheduler:
+    return Scheduler(
+        capacity=capacity,
+        limits={p: limit for p in Priority},
+        max_queue={p: queue for p in Priority},
+        timeouts={p: timeout for p in Priority},
+        enabled=True,
+    )
+
+async def _wait_as(semaphore: PrioritySemaphore, priority: Priority, name: str, order: list):
+    current_priority.set(priority)
+    async with semaphore:
+        order.append(name)
+
+def test_semaphore_wakes_higher_classes_first():
+    async def scenario():
+        semaphore, order = PrioritySemaphore(1), []
+        await semaphore.acquire()
+        tasks = [
+            asyncio.create_task(_wait_as(semaphore, priority, name, order))
+            for name, priority in [("background", Priority.BACKGROUND), ("onboarding", Priority.ONBOARDING),
+                                   ("live", Priority.LIVE_TURN), ("start", Priority.SESSION_START)]
+        ]
+        await asyncio.sleep(0)
+        semaphore.release()
+        await asyncio.gather(*tasks)
+        return order, semaphore._value
+
+    order, value = run(scenario())
+    assert order == ["live", "start", "onboarding", "background"]
+    assert value == 1
+
+def test_semaphore_keeps_permit_when_release_follows_cancel():
+    async def scenario():
+        semaphore, order = PrioritySemaphore(1), []
+        await semaphore.acquire()
+        cancelled = asyncio.create_task(_wait_as(semaphore, Priority.LIVE_TURN, "cancelled", order))
+        waiting = asyncio.create_task(_wait_as(semaphore, Priority.BACKGROUND, "waiting", order))
+        await asyncio.sleep(0)
+        # Cancel and release before the cancelled waiter gets to run its cleanup.
+        cancelled.cancel()
+        semaphore.release()
+        await asyncio.gather(cancelled, waiting, return_exceptions=True)
+        return order, semaphore._value, semaphore._waiters
+
+    order, value, waiters = run(scenario())
+    assert order == ["waiting"]
+    assert value == 1
+    assert waiters == []
+
+def test_semaphore_grants_free_permit_behind_cancelled_entry():
+    async def scenario():
+        semaphore = PrioritySemaphore(1)
+        await semaphore.acquire()
+        cancelled = asyncio.create_task(semaphore.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        semaphore.release()  # the cancelled entry is still queued until its task runs
+        await asyncio.wait_for(semaphore.acquire(), timeout=1)
+        await asyncio.gather(cancelled, return_exceptions=True)
+        return semaphore._value
+
+    assert run(scenario()) == 0
+
+def test_slot_serves_higher_class_first():
+    async def scenario():
+        scheduler, order = make_scheduler(), []
+
+        async def job(priority: Priority, name: str):
+            async with scheduler.slot(priority):
+                assert current_priority.get() == priority
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        first = asyncio.create_task(job(Priority.BACKGROUND, "first"))
+        await asyncio.sleep(0)
+        rest = [asyncio.create_task(job(p, p.name)) for p in (Priority.BACKGROUND, Priority.ONBOARDING, Priority.LIVE_TURN)]
+        await asyncio.gather(first, *rest)
+        return order
+
+    assert run(scenario()) == ["first", "LIVE_TURN", "ONBOARDING", "BACKGROUND"]
+
+def test_slot_sheds_when_queue_is_full():
+    async def scenario():
+        scheduler = make_scheduler(queue=1)
+        async with scheduler.slot(Priority.ONBOARDING):
+            queued = asyncio.create_task(scheduler.slot(Priority.ONBOARDING).__aenter__())
+            await asyncio.sleep(0)
+            with pytest.raises(SchedulerOverloaded):
+                async with scheduler.slot(Priority.ONBOARDING):
+                    pass
+        await queued
+        return scheduler.stats()["classes"]["onboarding"]
+
+    stats = run(scenario())
+    assert stats["shed"] == 1
+    assert stats["admitted"] == 2
+
+def test_slot_expires_after_timeout():
+    async def scenario():
+        scheduler = make_scheduler()
+        async with scheduler.slot(Priority.BACKGROUND):
+            with pytest.raises(SchedulerOverloaded):
+                async with scheduler.slot(Priority.BACKGROUND, timeout=0.01):
+                    pass
+        stats = scheduler.stats()["classes"]["background"]
+        # The expired waiter left nothing behind: the next request runs at once.
+        async with scheduler.slot(Priority.BACKGROUND) as waited:
+            return stats, waited
+
+    stats, waited = run(scenario())
+    assert stats["expired"] == 1
+    assert stats["queued"] == 0
+    assert waited == 0.0
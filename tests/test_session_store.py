@@ -0,0 +1,122 @@
+"""Two worker processes sharing one SqlSessionStore.
+
+Each worker is a separate spawned interpreter with SESSION_STORE=sql pointed at the
+same SQLite file, like two uvicorn workers behind a load balancer. A session started
+in one worker is answered in the other and read back from both.
+"""
+import multiprocessing
+import os
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic")
+
+PERSONA = {
+    "agent_id": "test",
+    "system_prompt": "You are a friendly interviewer.",
+    "initial_greeting": "Hello",
+    "topics_to_evaluate": ["Python"],
+}
+
+def _worker(database_url: str, conn):
+    os.environ.update({
+        "SESSION_STORE": "sql",
+        "DATABASE_URL": database_url,
+        "LLM_BACKEND": "fake",
+        "ASR_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": "0",
+        "PIPELINED_EVALUATION": "0",
+        "PREFETCH_OPENING_QUESTION": "0",
+    })
+    import asyncio
+    from app.models.schemas import AgentPersona
+    from app.services import interview_engine
+
+    async def handle(command, *args):
+        if command == "start":
+            return await interview_engine.start_session(AgentPersona.model_validate(PERSONA), 30)
+        if command == "answer":
+            result = await interview_engine.process_transcript(*args)
+            return result["next_question"].question_text
+        if command == "read":
+            session = await interview_engine.get_session(*args)
+            return {
+                "answers": [turn["answer"] for turn in session.history],
+                "scored": [turn["evaluation"] is not None for turn in session.history],
+                "current_question": session.current_question.question_text,
+                "memory_restored": session._memory is not None,
+                "memory": session.memory.render(),
+            }
+        if command == "exists":
+            return await interview_engine.get_session(*args) is not None
+        if command == "purge":
+            return await interview_engine.store.purge_expired(*args)
+        if command == "end":
+            return (await interview_engine.end_session(*args, face_missing_seconds=7)).face_missing_seconds
+        raise ValueError(command)
+
+    loop = asyncio.new_event_loop()
+    while (message := conn.recv()) is not None:
+        try:
+            conn.send(("ok", loop.run_until_complete(handle(*message))))
+        except Exception as e:
+            conn.send(("error", repr(e)))
+    loop.close()
+
+class Worker:
+    def __init__(self, context, database_url: str):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker, args=(database_url, child), daemon=True)
+        self.process.start()
+
+    def call(self, *message):
+        self.conn.send(message)
+        assert self.conn.poll(60), "worker did not answer"
+        status, value = self.conn.recv()
+        assert status == "ok", value
+        return value
+
+    def stop(self):
+        self.conn.send(None)
+        self.process.join(10)
+
+@pytest.fixture
+def workers(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    database_url = f"sqlite:///{tmp_path / 'sessions.db'}"
+    pair = [Worker(context, database_url), Worker(context, database_url)]
+    yield pair
+    for worker in pair:
+        worker.stop()
+
+def test_session_started_in_one_worker_is_answered_in_another(workers):
+    first, second = workers
+    session_id = first.call("start")
+
+    next_question = second.call("answer", session_id, "I would add a queue in front of the workers.")
+    second.call("answer", session_id, "And scale consumers on lag.")
+
+    for worker in (first, second):
+        state = worker.call("read", session_id)
+        assert state["answers"] == ["I would add a queue in front of the workers.", "And scale consumers on lag."]
+        assert state["scored"] == [True, True]
+    # The prompt memory is stored with the session rather than refolded on load.
+    states = [worker.call("read", session_id) for worker in (first, second)]
+    assert all(state["memory_restored"] for state in states)
+    assert states[0]["memory"] == states[1]["memory"] and "scale consumers on lag" in states[0]["memory"]
+    assert first.call("read", session_id)["current_question"] != ""
+    assert next_question
+
+    assert first.call("end", session_id) == 7
+    assert second.call("read", session_id)["answers"][0].startswith("I would add a queue")
+
+def test_purge_removes_sessions_idle_past_retention(workers):
+    first, second = workers
+    session_id = first.call("start")
+    second.call("answer", session_id, "An answer.")
+
+    assert first.call("purge", 3600) == 0
+    assert second.call("exists", session_id)
+    assert first.call("purge", 0) == 1
+    assert not second.call("exists", session_id)